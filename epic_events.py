@@ -1,18 +1,25 @@
 import os
 import shutil
+import sys
 
 from dotenv import load_dotenv
 
+from src.cli.help_cache import serve_cached_help
+
 if not os.path.exists(".env"):
     shutil.copy(".env.example", ".env")
 
-from src.cli.main import cli
-from src.sentry.observability import init_sentry
-
-load_dotenv()
 
 def main():
     """Main entry point for Epic Events CRM application."""
+    # Cached help screens are printed before the CLI, and the whole
+    # application behind it, is even imported
+    if serve_cached_help(sys.argv[1:]):
+        return
+    from src.cli.main import cli
+    from src.sentry.observability import init_sentry
+
+    load_dotenv()
     init_sentry()
     cli()
 
@@ -0,0 +1,64 @@
+"""Index the foreign-key and filter columns queried by the managers
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-19
+
+Every index is built with CREATE INDEX CONCURRENTLY, which cannot run
+inside a transaction: the statements are issued from an autocommit
+block so production tables stay writable while the indexes build.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+SCHEMA = "epic_events"
+
+# (index name, table, columns, partial index predicate)
+INDEXES = [
+    # UserManager.list filters by role
+    ("ix_users_role_id", "users", ["role_id"], None),
+    # ClientManager.list for commercials, company joins for support
+    ("ix_client_commercial_id", "client", ["commercial_id"], None),
+    ("ix_client_company_id", "client", ["company_id"], None),
+    # ContractManager.list joins and --only-mine filter
+    ("ix_contract_client_id", "contract", ["client_id"], None),
+    ("ix_contract_commercial_id", "contract", ["commercial_id"], None),
+    # contract list --unpaid / --unsigned
+    ("ix_contract_unpaid", "contract", ["client_id"],
+     "remaining_amount > 0"),
+    ("ix_contract_unsigned", "contract", ["client_id"], "NOT is_signed"),
+    # Support-scoped joins Contract -> Event
+    ("ix_event_contract_id", "event", ["contract_id"], None),
+]
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, columns, where in INDEXES:
+            op.create_index(
+                name,
+                table,
+                columns,
+                schema=SCHEMA,
+                if_not_exists=True,
+                postgresql_concurrently=True,
+                postgresql_where=sa.text(where) if where else None,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _, _ in reversed(INDEXES):
+            op.drop_index(
+                name,
+                table_name=table,
+                schema=SCHEMA,
+                if_exists=True,
+                postgresql_concurrently=True,
+            )
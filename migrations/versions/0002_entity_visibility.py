@@ -0,0 +1,71 @@
+"""Materialize support visibility in entity_visibility
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-19
+
+Support-scoped lists and access checks used to join Event -> Contract ->
+Client -> Company on every call. The (user, entity) pairs they computed
+are now stored in entity_visibility, kept up to date by the managers;
+this revision creates the table and backfills it from the existing
+event assignments.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+SCHEMA = "epic_events"
+
+BACKFILL = f"""
+INSERT INTO {SCHEMA}.entity_visibility (user_id, entity_type, entity_id)
+SELECT e.support_contact_id, 'contract', e.contract_id
+FROM {SCHEMA}.event e
+WHERE e.support_contact_id IS NOT NULL
+UNION
+SELECT e.support_contact_id, 'client', ct.client_id
+FROM {SCHEMA}.event e
+JOIN {SCHEMA}.contract ct ON ct.id = e.contract_id
+WHERE e.support_contact_id IS NOT NULL
+UNION
+SELECT e.support_contact_id, 'company', cl.company_id
+FROM {SCHEMA}.event e
+JOIN {SCHEMA}.contract ct ON ct.id = e.contract_id
+JOIN {SCHEMA}.client cl ON cl.id = ct.client_id
+WHERE e.support_contact_id IS NOT NULL AND cl.company_id IS NOT NULL
+"""
+
+
+def upgrade() -> None:
+    op.create_table(
+        "entity_visibility",
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("entity_type", sa.String(length=16), nullable=False),
+        sa.Column("entity_id", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["user_id"], [f"{SCHEMA}.users.id"],
+                                ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("user_id", "entity_type", "entity_id"),
+        schema=SCHEMA,
+        if_not_exists=True,
+    )
+    op.create_index(
+        "ix_entity_visibility_entity",
+        "entity_visibility",
+        ["entity_type", "entity_id"],
+        schema=SCHEMA,
+        if_not_exists=True,
+    )
+    op.execute(f"DELETE FROM {SCHEMA}.entity_visibility")
+    op.execute(BACKFILL)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_entity_visibility_entity",
+                  table_name="entity_visibility",
+                  schema=SCHEMA,
+                  if_exists=True)
+    op.drop_table("entity_visibility", schema=SCHEMA, if_exists=True)
@@ -0,0 +1,33 @@
+"""Row-level security policies for client, contract, event and company
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-19
+
+The policies read the epic_events.user_id / epic_events.role settings
+attached to each transaction when ROW_LEVEL_SECURITY is enabled. They
+are only created here: db-create enforces them on the tables when the
+mode is turned on.
+"""
+from alembic import op
+
+from src.data_access.row_security import (
+    install_statements,
+    uninstall_statements,
+)
+
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    for statement in install_statements():
+        op.execute(statement)
+
+
+def downgrade() -> None:
+    for statement in uninstall_statements():
+        op.execute(statement)
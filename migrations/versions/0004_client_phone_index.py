@@ -0,0 +1,43 @@
+"""Index the client phone numbers checked for uniqueness
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-19
+
+The validation schemas look phone numbers up on every client payload,
+and whole batches with a phone IN (SELECT unnest(:phones)) semi-join;
+both were sequential scans of the client table. Built CONCURRENTLY,
+like 0001.
+"""
+from alembic import op
+
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+SCHEMA = "epic_events"
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_client_phone",
+            "client",
+            ["phone"],
+            schema=SCHEMA,
+            if_not_exists=True,
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_client_phone",
+            table_name="client",
+            schema=SCHEMA,
+            if_exists=True,
+            postgresql_concurrently=True,
+        )
@@ -0,0 +1,99 @@
+"""
+Memoized canonicalization and validation of phone numbers and emails.
+
+Parsing a number with phonenumbers or an address with email_validator
+costs tens of microseconds, and imports or batch updates see the same
+values over and over. The results are pure functions of their input,
+so they are kept in bounded LRU caches (functools.lru_cache, which is
+thread-safe) shared by the validators and DataService.
+"""
+from functools import lru_cache
+
+import phonenumbers
+from email_validator import EmailNotValidError, validate_email
+
+# Entries kept by each cache, a few megabytes at most
+CACHE_SIZE = 65_536
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def phone_is_valid(phone: str) -> bool:
+    """Validate phone number using phonenumbers library."""
+    if not phone:
+        return False
+
+    normalized = phone.strip()
+    if normalized.startswith("00"):
+        normalized = "+" + normalized[2:]
+    elif normalized.startswith("0"):
+        normalized = "+33" + normalized[1:]
+    elif not normalized.startswith("+"):
+        normalized = "+" + normalized
+
+    try:
+        parsed = phonenumbers.parse(normalized)
+    except phonenumbers.NumberParseException:
+        return False
+    return phonenumbers.is_valid_number(parsed)
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def canonical_phone(phone: str) -> str | None:
+    """
+    International form of a phone number, None when it is not valid.
+
+    "00" becomes "+", a French mobile ("06", "07") gets the "+33"
+    prefix, and any other number is assumed to start with its country
+    code.
+    """
+    phone = phone.strip()
+    if not phone:
+        return None
+    if phone.startswith("00"):
+        phone = f"+{phone[2:]}"
+    elif phone[:2] in ("06", "07"):
+        phone = f"+33{phone[1:]}"
+    elif not phone.startswith("+"):
+        phone = f"+{phone}"
+    return phone if phone_is_valid(phone) else None
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def email_is_valid(email: str) -> bool:
+    """Validate an email address."""
+    try:
+        validate_email(email, check_deliverability=False)
+        return True
+    except EmailNotValidError:
+        return False
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def canonical_email(email: str) -> str | None:
+    """Lower-case form of an email address, None when it is not valid."""
+    email = email.strip().lower()
+    return email if email_is_valid(email) else None
+
+
+_CACHED = {
+    "phone validity": phone_is_valid,
+    "phone canonical form": canonical_phone,
+    "email validity": email_is_valid,
+    "email canonical form": canonical_email,
+}
+
+
+def cache_stats() -> list[dict]:
+    """Lookups, hits and hit rate of each cache since the start."""
+    stats = []
+    for name, function in _CACHED.items():
+        info = function.cache_info()
+        lookups = info.hits + info.misses
+        stats.append({
+            "name": name,
+            "lookups": lookups,
+            "hits": info.hits,
+            "size": info.currsize,
+            "hit_rate": info.hits / lookups if lookups else 0.0,
+        })
+    return stats
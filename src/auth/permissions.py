@@ -47,6 +47,7 @@ DEFAULT_ROLE_PERMISSIONS: dict[str, list[str]] = {
 }
 
 ROLE_ID_TO_NAME: dict[int, str] = {4: "management", 5: "commercial", 6: "support"}
+ROLE_NAME_TO_ID: dict[str, int] = {name: role_id for role_id, name in ROLE_ID_TO_NAME.items()}
 
 # Role constants for robust comparison
 class UserRoles:
@@ -180,9 +181,9 @@ def login_required(func):
             raise PermissionError("Authentication required")
         try:
             verify_access_token(token)
-            return func(*args, **kwargs)
         except Exception:
             raise PermissionError("Authentication required")
+        return func(*args, **kwargs)
     return wrapper
 
 def require_permission(permission: str):
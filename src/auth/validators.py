@@ -1,7 +1,9 @@
-import phonenumbers
-from email_validator import EmailNotValidError, validate_email
-from sqlalchemy import select
+from collections.abc import Iterable, Mapping
+from contextlib import nullcontext
 
+from sqlalchemy import ARRAY, String, and_, bindparam, func, literal, select, union_all
+
+from src.auth.normalization import email_is_valid, phone_is_valid
 from src.auth.settings import (
     PASSWORD_MAX_LENGTH as pwd_max_lgt,
     PASSWORD_MIN_LENGTH as pwd_min_lgt,
@@ -10,38 +12,40 @@ from src.auth.settings import (
     USERNAME_MAX_LENGTH as username_max_lgt,
     USERNAME_MIN_LENGTH as username_min_lgt,
 )
-from src.auth.decorators import in_session
 from src.crm.models import User, Client
 from src.data_access.config import Session
 
-session = Session()
-
 __all__ = ["is_valid_email", "is_valid_username", "is_valid_password",
            "is_valid_role_id", "is_valid_phone", "is_email_globally_unique",
-           "is_phone_globally_unique", "is_username_globally_unique"]
+           "is_phone_globally_unique", "is_username_globally_unique",
+           "find_duplicates", "duplicate_field", "find_taken_values",
+           "find_batch_duplicates"]
+
+# Columns whose values must be unique across users and clients, by
+# payload field. The email is shared by both tables, which no unique
+# constraint can enforce.
+UNIQUE_COLUMNS = {
+    "username": (User.username,),
+    "email": (User.email, Client.email),
+    "phone": (Client.phone,),
+}
 
 
 def is_valid_email(value: str) -> bool:
-    """Validate an email address."""
-    try:
-        validate_email(value, check_deliverability=False)
-        return True
-    except EmailNotValidError:
-        return False
+    """Validate an email address (memoized)."""
+    return email_is_valid(value)
 
 def _validate_username_length(username: str) -> bool:
     """Validate that a username is between 5 and 64 characters long."""
     return  username_min_lgt <= len(username) <= username_max_lgt
 
-@in_session(session)
-def _validate_username_uniqueness(username: str) -> bool:
-    """Validate that a username is not already in the database."""
-    return not session.query(User).filter(User.username == username)
-
-def is_valid_username(username: str) -> bool:
-    """Validate that a username is valid and not already in use."""
+def is_valid_username(username: str, check_unique: bool = True) -> bool:
+    """
+    Validate that a username is valid and, unless check_unique is False,
+    not already in use.
+    """
     return _validate_username_length(username) and \
-                _validate_username_uniqueness(username)
+                (not check_unique or is_username_globally_unique(username))
 
 def _validate_password_length(password: str) -> bool:
     """Validate that a password is between min and max characters long."""
@@ -69,63 +73,131 @@ def is_valid_role_id(role_id: int) -> bool:
     return role_id_min <= int(role_id) <= role_id_max
 
 def is_valid_phone(phone: str) -> bool:
-    """Validate phone number using phonenumbers library."""
-    if not phone:
-        return False
-
-    normalized = phone.strip()
-    if normalized.startswith("00"):
-        normalized = "+" + normalized[2:]
-    elif normalized.startswith("0"):
-        normalized = "+33" + normalized[1:]
-    elif not normalized.startswith("+"):
-        normalized = "+" + normalized
-
-    try:
-        parsed = phonenumbers.parse(normalized)
-        return phonenumbers.is_valid_number(parsed)
-    except Exception as e:
-        print(e)
-        return False
-    
+    """Validate phone number using phonenumbers library (memoized)."""
+    return phone_is_valid(phone)
+
 
 # Global uniqueness validators across all entities
-@in_session(session)
-def is_email_globally_unique(email: str, exclude_user_id: int = None, exclude_client_id: int = None) -> bool:
-    """Validate that an email is not already used by any User or Client."""
-    # Check Users table
-    user_query = select(User).filter(User.email == email)
-    if exclude_user_id:
-        user_query = user_query.filter(User.id != exclude_user_id)
-    if session.scalar(user_query):
-        return False
+def find_duplicates(values: dict,
+                    exclude_user_id: int = None,
+                    exclude_client_id: int = None) -> set[str]:
+    """
+    Fields of a payload whose value is already taken.
 
-    # Check Clients table
-    client_query = select(Client).filter(Client.email == email)
-    if exclude_client_id:
-        client_query = client_query.filter(Client.id != exclude_client_id)
-    if session.scalar(client_query):
-        return False
+    Every (field, column) pair of UNIQUE_COLUMNS becomes an EXISTS probe
+    on its unique index and the probes are sent as a single UNION ALL,
+    so a whole payload costs one round trip. Empty values are ignored.
 
-    return True
+    Args:
+        values: Normalized values by field (username, email, phone).
+        exclude_user_id: User whose own values do not count, on update.
+        exclude_client_id: Same for a client.
+    """
+    excluded = {User: exclude_user_id, Client: exclude_client_id}
+    probes = []
+    for field, value in values.items():
+        if not value:
+            continue
+        for column in UNIQUE_COLUMNS[field]:
+            entity = column.class_
+            clause = column == value
+            if excluded[entity]:
+                clause = and_(clause, entity.id != excluded[entity])
+            probes.append(select(literal(field)).where(
+                select(entity.id).where(clause).exists()
+            ))
+    if not probes:
+        return set()
+    statement = probes[0] if len(probes) == 1 else union_all(*probes)
+    with Session() as session:
+        return set(session.scalars(statement))
+
+
+def duplicate_field(error) -> str | None:
+    """
+    Payload field of the unique index an IntegrityError violated, e.g.
+    when a concurrent insert took a value after find_duplicates(). None
+    for any other integrity error.
+    """
+    diag = getattr(getattr(error, "orig", None), "diag", None)
+    index = getattr(diag, "constraint_name", None) or ""
+    for field, columns in UNIQUE_COLUMNS.items():
+        for column in columns:
+            if index.endswith(f"_{column.table.name}_{column.key}"):
+                return field
+    return None
+
+
+# Bulk uniqueness validators, for batches of rows
+def find_taken_values(values: Mapping[str, Iterable[str]],
+                      session=None) -> dict[str, set[str]]:
+    """
+    Values of a batch already used in the database, by field.
+
+    A single statement is sent whatever the size of the batch: a UNION
+    ALL with, for each unique column, a `column IN (SELECT unnest(:array))`
+    semi-join. The planner probes the column index for small batches and
+    hashes the array for large ones, where `column = ANY(:array)` would
+    compare every row of the table with every value of the array.
+
+    Args:
+        values: Normalized values by field (username, email, phone).
+        session: Session to query in, a new one by default.
+    """
+    wanted = {field: {value for value in field_values if value}
+              for field, field_values in values.items()}
+    probes = [
+        select(literal(field), column).where(column.in_(select(func.unnest(
+            bindparam(None, list(field_values), type_=ARRAY(String))
+        ))))
+        for field, field_values in wanted.items() if field_values
+        for column in UNIQUE_COLUMNS[field]
+    ]
+
+    taken = {field: set() for field in values}
+    if not probes:
+        return taken
+    with Session() if session is None else nullcontext(session) as session:
+        statement = probes[0] if len(probes) == 1 else union_all(*probes)
+        for field, value in session.execute(statement):
+            taken[field].add(value)
+    return taken
+
+
+def find_batch_duplicates(rows: Iterable[Mapping],
+                          fields: Iterable[str] = tuple(UNIQUE_COLUMNS),
+                          ) -> dict[str, dict[str, list[int]]]:
+    """
+    Values repeated inside a batch, in memory: for each field, the
+    repeated values mapped to the 1-based indexes of their rows.
+    """
+    fields = tuple(fields)
+    seen = {field: {} for field in fields}
+    for index, row in enumerate(rows, start=1):
+        for field in fields:
+            value = row.get(field)
+            if value:
+                seen[field].setdefault(value, []).append(index)
+    return {
+        field: {value: indexes for value, indexes in values.items()
+                if len(indexes) > 1}
+        for field, values in seen.items()
+    }
+
+
+def is_email_globally_unique(email: str, exclude_user_id: int = None, exclude_client_id: int = None) -> bool:
+    """Validate that an email is not already used by any User or Client."""
+    return not find_duplicates({"email": email},
+                               exclude_user_id, exclude_client_id)
 
 
 def is_phone_globally_unique(phone: str, exclude_client_id: int = None) -> bool:
     """Validate that a phone number is not already used by any Client."""
-    if not phone:
-        return True  # Empty phone is allowed
-
-    with Session() as session:
-        query = select(Client).filter(Client.phone == phone)
-        if exclude_client_id:
-            query = query.filter(Client.id != exclude_client_id)
-        return not session.scalar(query)
+    return not find_duplicates({"phone": phone},
+                               exclude_client_id=exclude_client_id)
 
 
 def is_username_globally_unique(username: str, exclude_user_id: int = None) -> bool:
     """Validate that a username is not already used by any User."""
-    with Session() as session:
-        query = select(User).filter(User.username == username)
-        if exclude_user_id:
-            query = query.filter(User.id != exclude_user_id)
-        return not session.scalar(query)
+    return not find_duplicates({"username": username},
+                               exclude_user_id=exclude_user_id)
@@ -1,6 +1,7 @@
 import click
 
 from src.cli.help import attach_help, epic_help, render_help_with_logo
+from src.cli.utils import IdRanges
 from src.crm.controllers.main_controller import main_controller
 
 
@@ -38,9 +39,19 @@ def client_create(full_name, email, phone, company_id, first_contact_date, last_
 @epic_help
 @client.command("list")
 @click.option("--only-mine", is_flag=True, help="Show only your clients", default=False)
-def client_list(only_mine):
+@click.option("--names",
+              is_flag=True,
+              help="Show commercial and company names instead of their IDs",
+              default=False)
+@click.option("--where",
+              help="Filter expression, e.g. \"company_id=3 and full_name~dupont\"",
+              required=False)
+@click.option("--sort",
+              help="Sort fields, '-' prefix for descending, e.g. \"-last_contact_date\"",
+              required=False)
+def client_list(only_mine, names, where, sort):
     """List clients."""
-    main_controller.list_clients(only_mine)
+    main_controller.list_clients(only_mine, names, where, sort)
 
 
 @epic_help
@@ -75,7 +86,18 @@ def client_update(client_id, full_name, email, phone, company_id, first_contact_
 
 @epic_help
 @client.command("delete")
-@click.argument("client_id", type=int)
-def client_delete(client_id):
-    """Delete a client."""
-    main_controller.delete_client(client_id)
+@click.argument("client_id", type=int, required=False)
+@click.option("--ids", type=IdRanges(),
+              help="Delete several clients, e.g. \"1-500,512\"",
+              required=False)
+@click.option("--where",
+              help="Delete the clients matching a filter expression",
+              required=False)
+@click.option("-y", "--yes", "assume_yes", is_flag=True,
+              help="Delete without asking for confirmation")
+def client_delete(client_id, ids, where, assume_yes):
+    """Delete a client, or many with --ids/--where."""
+    if client_id is None and not ids and not where:
+        raise click.UsageError("Give a CLIENT_ID, --ids or --where.")
+    main_controller.delete_client(client_id, ids=ids, where=where,
+                                  assume_yes=assume_yes)
@@ -1,6 +1,7 @@
 import click
 
 from src.cli.help import attach_help, epic_help, render_help_with_logo
+from src.cli.utils import IdRanges
 from src.crm.controllers.main_controller import main_controller
 
 
@@ -25,8 +26,14 @@ def company_create(name):
 
 @epic_help
 @company.command("list")
-def company_list():
-    main_controller.list_companies()
+@click.option("--where",
+              help="Filter expression, e.g. \"name~events\"",
+              required=False)
+@click.option("--sort",
+              help="Sort fields, '-' prefix for descending, e.g. \"name\"",
+              required=False)
+def company_list(where, sort):
+    main_controller.list_companies(where, sort)
 
 
 @epic_help
@@ -46,6 +53,18 @@ def company_update(company_id, name):
 
 @epic_help
 @company.command("delete")
-@click.argument("company_id", type=int)
-def company_delete(company_id):
-    main_controller.delete_company(company_id)
+@click.argument("company_id", type=int, required=False)
+@click.option("--ids", type=IdRanges(),
+              help="Delete several companies, e.g. \"1-500,512\"",
+              required=False)
+@click.option("--where",
+              help="Delete the companies matching a filter expression",
+              required=False)
+@click.option("-y", "--yes", "assume_yes", is_flag=True,
+              help="Delete without asking for confirmation")
+def company_delete(company_id, ids, where, assume_yes):
+    """Delete a company, or many with --ids/--where."""
+    if company_id is None and not ids and not where:
+        raise click.UsageError("Give a COMPANY_ID, --ids or --where.")
+    main_controller.delete_company(company_id, ids=ids, where=where,
+                                   assume_yes=assume_yes)
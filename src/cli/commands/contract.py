@@ -1,6 +1,7 @@
 import click
 
 from src.cli.help import attach_help, epic_help, render_help_with_logo
+from src.cli.utils import IdRanges
 from src.crm.controllers.main_controller import main_controller
 
 
@@ -53,9 +54,20 @@ def contract_create(client_id,
              is_flag=True,
              help="Filter to contracts not fully paid",
              default=False)
-def contract_list(only_mine, unsigned, unpaid):
+@click.option("--names",
+              is_flag=True,
+              help="Show client and commercial names instead of their IDs",
+              default=False)
+@click.option("--where",
+              help="Filter expression, e.g. \"total_amount>5000 and is_signed\"",
+              required=False)
+@click.option("--sort",
+              help="Sort fields, '-' prefix for descending, e.g. \"-total_amount\"",
+              required=False)
+def contract_list(only_mine, unsigned, unpaid, names, where, sort):
     """List contracts with optional filters (combinable)."""
-    main_controller.list_contracts(only_mine, unsigned, unpaid)
+    main_controller.list_contracts(only_mine, unsigned, unpaid, names,
+                                   where, sort)
 
 
 @epic_help
@@ -67,16 +79,22 @@ def contract_view(contract_id):
 
 @epic_help
 @contract.command("update")
-@click.argument("contract_id", type=int)
+@click.argument("contract_id", type=int, required=False)
+@click.option("--ids", type=IdRanges(),
+              help="Update several contracts, e.g. \"1-500,512\"",
+              required=False)
+@click.option("--where",
+              help="Update the contracts matching a filter expression",
+              required=False)
 @click.option("--client-id", help="Client ID", required=False)
 @click.option("--commercial-id", help="Commercial ID", required=False)
 @click.option("--total-amount", help="Total amount", required=False)
 @click.option("--remaining-amount", help="Remaining amount", required=False)
 @click.option("--is-signed", type=click.BOOL, help="Is signed", required=False)
 @click.option("--is-fully-paid", type=click.BOOL, help="Is fully paid", required=False)
-def contract_update(contract_id, client_id, commercial_id, total_amount, remaining_amount, is_signed, is_fully_paid):
-    main_controller.update_contract(
-        contract_id,
+def contract_update(contract_id, ids, where, client_id, commercial_id, total_amount, remaining_amount, is_signed, is_fully_paid):
+    """Update one contract, or many with --ids/--where."""
+    values = dict(
         client_id=client_id,
         commercial_id=commercial_id,
         total_amount=total_amount,
@@ -84,10 +102,30 @@ def contract_update(contract_id, client_id, commercial_id, total_amount, remaini
         is_signed=is_signed,
         is_fully_paid=is_fully_paid,
     )
+    if ids or where:
+        if contract_id is not None:
+            ids = sorted({*(ids or []), contract_id})
+        main_controller.bulk_update_contracts(ids=ids, where=where, **values)
+    elif contract_id is None:
+        raise click.UsageError("Give a CONTRACT_ID, --ids or --where.")
+    else:
+        main_controller.update_contract(contract_id, **values)
 
 
 @epic_help
 @contract.command("delete")
-@click.argument("contract_id", type=int)
-def contract_delete(contract_id):
-    main_controller.delete_contract(contract_id)
+@click.argument("contract_id", type=int, required=False)
+@click.option("--ids", type=IdRanges(),
+              help="Delete several contracts, e.g. \"1-500,512\"",
+              required=False)
+@click.option("--where",
+              help="Delete the contracts matching a filter expression",
+              required=False)
+@click.option("-y", "--yes", "assume_yes", is_flag=True,
+              help="Delete without asking for confirmation")
+def contract_delete(contract_id, ids, where, assume_yes):
+    """Delete a contract, or many with --ids/--where."""
+    if contract_id is None and not ids and not where:
+        raise click.UsageError("Give a CONTRACT_ID, --ids or --where.")
+    main_controller.delete_contract(contract_id, ids=ids, where=where,
+                                    assume_yes=assume_yes)
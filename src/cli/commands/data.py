@@ -0,0 +1,54 @@
+import click
+
+from src.cli.help import epic_help
+from src.crm.controllers.main_controller import main_controller
+from src.data_access.exporter import EXPORT_FORMATS
+from src.data_access.importer import MODELS
+
+EXPORTABLE = ["company", "client", "contract", "event", "user"]
+
+
+@epic_help
+@click.command("import")
+@click.argument("entity", type=click.Choice(sorted(MODELS)))
+@click.argument("path", type=click.Path(exists=True, dir_okay=False))
+@click.option("-f", "--format", "fmt", type=click.Choice(["csv", "jsonl"]),
+              help="File format, guessed from the extension by default",
+              required=False)
+@click.option("-r", "--rejects", "reject_path",
+              type=click.Path(dir_okay=False, writable=True),
+              help="Reject file, <file>.rejects.<ext> by default",
+              required=False)
+def import_cmd(entity, path, fmt, reject_path):
+    """Bulk load a CSV (with a header line) or JSON Lines file."""
+    main_controller.import_entities(entity, path, fmt=fmt,
+                                    reject_path=reject_path)
+
+
+@epic_help
+@click.command("export")
+@click.argument("entity", type=click.Choice(EXPORTABLE))
+@click.option("-f", "--format", "fmt", type=click.Choice(EXPORT_FORMATS),
+              default="csv", show_default=True,
+              help="Output format")
+@click.option("-o", "--output", "path",
+              type=click.Path(dir_okay=False, writable=True),
+              help="Output file, the standard output by default",
+              required=False)
+@click.option("-z", "--gzip", "compress", is_flag=True, default=False,
+              help="Compress the output with gzip")
+@click.option("--only-mine", is_flag=True, default=False,
+              help="Only the rows managed by or assigned to you")
+@click.option("--names", is_flag=True, default=False,
+              help="Add the names of the linked rows next to their IDs")
+@click.option("--where",
+              help="Filter expression, e.g. \"is_signed and total_amount>5000\"",
+              required=False)
+@click.option("--sort",
+              help="Sort fields, '-' prefix for descending, e.g. \"-id\"",
+              required=False)
+def export_cmd(entity, fmt, path, compress, only_mine, names, where, sort):
+    """Stream a list (as seen by your role) to CSV or JSON Lines."""
+    main_controller.export_entities(entity, path, fmt=fmt, compress=compress,
+                                    only_mine=only_mine, names=names,
+                                    where=where, sort=sort)
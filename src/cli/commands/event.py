@@ -1,6 +1,7 @@
 import click
 
 from src.cli.help import attach_help, epic_help, render_help_with_logo
+from src.cli.utils import IdRanges
 from src.crm.controllers.main_controller import main_controller
 
 
@@ -52,9 +53,19 @@ def event_create(contract_id,
 @click.option("--unassigned", is_flag=True,
               help="Show only unassigned events (management only)",
               default=False)
-def event_list(only_mine, unassigned):
+@click.option("--names",
+              is_flag=True,
+              help="Show support usernames instead of their IDs",
+              default=False)
+@click.option("--where",
+              help="Filter expression, e.g. \"start_date>=2025-12-01 and participant_count>100\"",
+              required=False)
+@click.option("--sort",
+              help="Sort fields, '-' prefix for descending, e.g. \"-start_date\"",
+              required=False)
+def event_list(only_mine, unassigned, names, where, sort):
     """List events with optional restriction (`--only-mine`) or unassigned filter."""
-    main_controller.list_events(only_mine, unassigned)
+    main_controller.list_events(only_mine, unassigned, names, where, sort)
 
 
 @epic_help
@@ -66,7 +77,13 @@ def event_view(event_id):
 
 @epic_help
 @event.command("update")
-@click.argument("event_id", type=int)
+@click.argument("event_id", type=int, required=False)
+@click.option("--ids", type=IdRanges(),
+              help="Update several events, e.g. \"1-500,512\"",
+              required=False)
+@click.option("--where",
+              help="Update the events matching a filter expression",
+              required=False)
 @click.option("-c", "--contract-id", type=int, help="Contract ID", required=False)
 @click.option("-t", "--title", type=str, help="Event title", required=False)
 @click.option("-a", "--full-address", type=str, help="Full address", required=False)
@@ -79,6 +96,8 @@ def event_view(event_id):
 @click.option("--participant-count", type=int, help="Participant count", required=False)
 @click.option("--notes", type=str, help="Notes", required=False)
 def event_update(event_id,
+                 ids,
+                 where,
                  contract_id,
                  title,
                  full_address,
@@ -87,8 +106,8 @@ def event_update(event_id,
                  end_date,
                  participant_count,
                  notes):
-    main_controller.update_event(
-        event_id,
+    """Update one event, or many with --ids/--where."""
+    values = dict(
         contract_id=contract_id,
         title=title,
         full_address=full_address,
@@ -98,6 +117,14 @@ def event_update(event_id,
         participant_count=participant_count,
         notes=notes
     )
+    if ids or where:
+        if event_id is not None:
+            ids = sorted({*(ids or []), event_id})
+        main_controller.bulk_update_events(ids=ids, where=where, **values)
+    elif event_id is None:
+        raise click.UsageError("Give an EVENT_ID, --ids or --where.")
+    else:
+        main_controller.update_event(event_id, **values)
 
 
 @epic_help
@@ -110,6 +137,18 @@ def assign_support(event_id, support_id):
 
 @epic_help
 @event.command("delete")
-@click.argument("event_id", type=int)
-def event_delete(event_id):
-    main_controller.delete_event(event_id)
+@click.argument("event_id", type=int, required=False)
+@click.option("--ids", type=IdRanges(),
+              help="Delete several events, e.g. \"1-500,512\"",
+              required=False)
+@click.option("--where",
+              help="Delete the events matching a filter expression",
+              required=False)
+@click.option("-y", "--yes", "assume_yes", is_flag=True,
+              help="Delete without asking for confirmation")
+def event_delete(event_id, ids, where, assume_yes):
+    """Delete an event, or many with --ids/--where."""
+    if event_id is None and not ids and not where:
+        raise click.UsageError("Give an EVENT_ID, --ids or --where.")
+    main_controller.delete_event(event_id, ids=ids, where=where,
+                                 assume_yes=assume_yes)
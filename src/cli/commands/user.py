@@ -1,6 +1,7 @@
 import click
 
 from src.cli.help import attach_help, epic_help, render_help_with_logo
+from src.cli.utils import IdRanges
 from src.crm.controllers.main_controller import main_controller
 
 
@@ -37,8 +38,22 @@ def user_create(username, full_name, email, role_id):
 @click.option("-M","--management", help="Management users", is_flag=True, required=False)
 @click.option("-C","--commercial", help="Commercial users", is_flag=True, required=False)
 @click.option("-S","--support", help="Support users", is_flag=True, required=False)
-def user_list(management=False, commercial=False, support=False):
-    main_controller.list_users(management, commercial, support)
+@click.option("--where",
+              help="Filter expression, e.g. \"is_active and username~dupont\"",
+              required=False)
+@click.option("--sort",
+              help="Sort fields, '-' prefix for descending, e.g. \"-last_login\"",
+              required=False)
+def user_list(management=False, commercial=False, support=False,
+              where=None, sort=None):
+    main_controller.list_users(management, commercial, support, where, sort)
+
+@epic_help
+@user.command("count")
+def user_count():
+    """Show the number of users per role."""
+    main_controller.count_users()
+
 
 @epic_help
 @user.command("view")
@@ -66,9 +81,21 @@ def user_update(user_id, username, full_name, email, role_id):
 
 @epic_help
 @user.command("delete")
-@click.argument("user_id", type=int)
-def user_delete(user_id):
-    main_controller.delete_user(user_id)
+@click.argument("user_id", type=int, required=False)
+@click.option("--ids", type=IdRanges(),
+              help="Delete several users, e.g. \"1-500,512\"",
+              required=False)
+@click.option("--where",
+              help="Delete the users matching a filter expression",
+              required=False)
+@click.option("-y", "--yes", "assume_yes", is_flag=True,
+              help="Delete without asking for confirmation")
+def user_delete(user_id, ids, where, assume_yes):
+    """Delete a user, or many with --ids/--where."""
+    if user_id is None and not ids and not where:
+        raise click.UsageError("Give a USER_ID, --ids or --where.")
+    main_controller.delete_user(user_id, ids=ids, where=where,
+                                assume_yes=assume_yes)
 
 
 @epic_help
@@ -1,5 +1,3 @@
-from pathlib import Path
-
 import click
 from rich import box
 from rich.console import Console
@@ -8,28 +6,13 @@ from rich.panel import Panel
 from rich.table import Table
 from rich.text import Text
 
+from src.cli.help_cache import store_help
 from src.crm.views.config import epic_style, logo_style
-from src.crm.views.views import clear_console
+from src.crm.views.views import clear_console, logo_text, view
 
-LOGO_PATH = Path("src/crm/views/logo.txt")
 console = Console()
 
 
-@clear_console
-def build_logo_text() -> Text:
-    text = LOGO_PATH.read_text(encoding="utf-8")
-    t = Text(text, no_wrap=True)
-    t.stylize(epic_style, 0, 145)
-    t.stylize(logo_style, 145, 147)
-    t.stylize(epic_style, 147, 176)
-    t.stylize(logo_style, 176, 191)
-    t.stylize(epic_style, 191, 194)
-    t.stylize(logo_style, 194, 221)
-    t.stylize(epic_style, 221, 225)
-    t.stylize(logo_style, 225, -1)
-    return t
-
-
 def _format_usage_line(line: str, styled_text: Text) -> None:
     """Format a usage line with specific styling 
     for command and options."""
@@ -130,16 +113,19 @@ def format_help_with_styles(help_text: str) -> Text:
 
     return styled_text
 
+
+def _command_path(ctx: click.Context) -> list[str]:
+    """Names of the commands leading to ctx, without the root group."""
+    names = []
+    while ctx.parent is not None:
+        if ctx.command.name != "help":
+            names.append(ctx.command.name)
+        ctx = ctx.parent
+    return names[::-1]
+
+
 @clear_console
 def render_help_with_logo(ctx: click.Context) -> None:
-    raw_logo = LOGO_PATH.read_text(encoding="utf-8")
-    max_logo_width = max((len(line) for line in raw_logo.splitlines()), default=40)
-    logo = build_logo_text()
-    grid = Table.grid(padding=(0, 2))
-    grid.add_column(no_wrap=True, width=max_logo_width + 2)
-    grid.add_column(ratio=1)
-    left = Padding(logo, (0, 1))
-
     # Create help text manually to avoid rich-click conflicts
     help_lines = []
     help_lines.append(f"Usage: {ctx.command.name} [OPTIONS]")
@@ -167,6 +153,10 @@ def render_help_with_logo(ctx: click.Context) -> None:
     help_content = format_help_with_styles(help_text) if help_text else Text(
         "No help available"
     )
+    if view.plain:
+        _print_and_store(ctx, help_content)
+        return
+
     right = Panel(help_content,
                   box=box.ROUNDED,
                   border_style=epic_style,
@@ -174,8 +164,25 @@ def render_help_with_logo(ctx: click.Context) -> None:
                   title=Text("HELP",
                   style=epic_style),
                   title_align="left")
-    grid.add_row(left, right)
-    console.print(grid)
+    logo = logo_text()
+    max_logo_width = max((len(line) for line in logo.plain.splitlines()),
+                         default=40)
+    grid = Table.grid(padding=(0, 2))
+    grid.add_column(no_wrap=True, width=max_logo_width + 2)
+    grid.add_column(ratio=1)
+    grid.add_row(Padding(logo, (0, 1)), right)
+    _print_and_store(ctx, grid)
+
+
+def _print_and_store(ctx: click.Context, renderable) -> None:
+    # The rendered screen is cached for epic_events.py to serve it
+    # without importing the CLI next time
+    with console.capture() as capture:
+        console.print(renderable)
+    screen = capture.get()
+    console.file.write(screen)
+    console.file.flush()
+    store_help(_command_path(ctx), view.plain, screen)
 
 def attach_help(group: click.Group) -> None:
     @group.command("help")
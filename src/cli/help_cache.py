@@ -0,0 +1,177 @@
+"""
+On-disk cache of the rendered help screens.
+
+Rendering a help screen imports the whole CLI (controllers, models,
+SQLAlchemy, ...) before laying out the logo grid. The ANSI output of
+every rendered screen is therefore stored, keyed by a hash of the files
+defining the command tree and the help layout, the command path and the
+terminal (width, colors, plain mode), and epic_events.py serves it
+before importing anything else.
+
+The screens are written raw to the terminal, so they are only read
+from a per-user directory, private to its owner: a directory owned by
+anyone else is ignored.
+
+This module only imports the standard library: importing src.settings
+would already load the views.
+"""
+import hashlib
+import os
+import stat
+import sys
+import tempfile
+from functools import lru_cache
+from importlib import metadata
+from pathlib import Path
+
+
+def _default_cache_dir() -> Path:
+    """$XDG_CACHE_HOME/epic_events/help, or ~/.cache/epic_events/help."""
+    cache_home = os.environ.get("XDG_CACHE_HOME", "")
+    if not os.path.isabs(cache_home):
+        cache_home = Path.home() / ".cache"
+    return Path(cache_home) / "epic_events" / "help"
+
+
+# Directory of the cached screens, in the user cache directory by default
+CACHE_DIR = Path(os.environ.get("HELP_CACHE_DIR") or _default_cache_dir())
+
+_SRC = Path(__file__).resolve().parent.parent
+# Files whose content shapes the help screens
+_SOURCES = ("cli/**/*.py", "crm/views/views.py", "crm/views/config.py",
+            "crm/views/records.py", "crm/views/logo.txt")
+# Distributions rendering the help screens
+_PACKAGES = ("click", "rich", "rich-click")
+# Environment variables changing the way Rich renders
+_TERMINAL_VARIABLES = ("COLUMNS", "TERM", "COLORTERM", "NO_COLOR",
+                       "FORCE_COLOR", "TTY_COMPATIBLE")
+
+HELP_FLAGS = {"-h", "--help"}
+PLAIN_FLAG = "--plain"
+# What Console.clear() writes on a terminal
+_CLEAR_SCREEN = "\033[2J\033[H"
+
+
+@lru_cache(maxsize=1)
+def _sources_digest() -> str:
+    digest = hashlib.sha256()
+    for pattern in _SOURCES:
+        for path in sorted(_SRC.glob(pattern)):
+            digest.update(str(path.relative_to(_SRC)).encode())
+            digest.update(path.read_bytes())
+    for package in _PACKAGES:
+        try:
+            version = metadata.version(package)
+        except metadata.PackageNotFoundError:
+            version = ""
+        digest.update(f"{package}=={version}".encode())
+    return digest.hexdigest()
+
+
+def _is_private(directory: Path) -> bool:
+    """
+    Whether a directory (not a symlink to one) belongs to the current
+    user, who alone can write in it.
+    """
+    try:
+        info = os.lstat(directory)
+    except OSError:
+        return False
+    if not stat.S_ISDIR(info.st_mode):
+        return False
+    if hasattr(os, "getuid"):
+        return (info.st_uid == os.getuid()
+                and not info.st_mode & (stat.S_IWGRP | stat.S_IWOTH))
+    return True
+
+
+def _terminal_width() -> int:
+    """The console width, found the way Rich finds it."""
+    width = None
+    for descriptor in (0, 1, 2):
+        try:
+            width = os.get_terminal_size(descriptor).columns
+        except (AttributeError, ValueError, OSError):
+            continue
+        break
+    columns = os.environ.get("COLUMNS", "")
+    if columns.isdigit():
+        width = int(columns)
+    return width or 80
+
+
+def is_plain(args) -> bool:
+    """Whether the views run in plain mode (see MainView.plain)."""
+    return PLAIN_FLAG in args or not sys.stdout.isatty()
+
+
+def cache_key(command_path: list[str], plain: bool) -> str:
+    """Name of the cached screen of a command path."""
+    terminal = [str(_terminal_width()), str(sys.stdout.isatty()),
+                str(plain)]
+    terminal += [os.environ.get(name, "") for name in _TERMINAL_VARIABLES]
+    return hashlib.sha256("\0".join(
+        [_sources_digest(), " ".join(command_path), *terminal]
+    ).encode()).hexdigest()
+
+
+def requested_path(args: list[str]) -> list[str] | None:
+    """
+    Command path whose help the arguments ask for, None when they are
+    not a bare help request (`epic_events`, `help [command]`, or
+    `[command ...] -h`).
+    """
+    args = list(args)
+    while args and args[0] == PLAIN_FLAG:
+        args.pop(0)
+    if not args:
+        return []
+    if args[0] == "help":
+        return args[1:] if len(args) <= 2 else None
+    *names, flag = args
+    if flag in HELP_FLAGS and not any(name.startswith("-") for name in names):
+        return names
+    return None
+
+
+def serve_cached_help(args: list[str]) -> bool:
+    """Print the cached screen answering the arguments, if there is one."""
+    command_path = requested_path(args)
+    if command_path is None:
+        return False
+    plain = is_plain(args)
+    if not _is_private(CACHE_DIR):
+        return False
+    try:
+        screen = (CACHE_DIR / cache_key(command_path, plain)).read_text(
+            encoding="utf-8"
+        )
+    except (OSError, UnicodeDecodeError):
+        return False
+    if not plain:
+        sys.stdout.write(_CLEAR_SCREEN)
+    sys.stdout.write(screen)
+    sys.stdout.flush()
+    return True
+
+
+def store_help(command_path: list[str], plain: bool, screen: str) -> None:
+    """
+    Cache a rendered screen, silently giving up when it cannot or when
+    the cache directory is not private.
+    """
+    try:
+        CACHE_DIR.mkdir(mode=0o700, parents=True, exist_ok=True)
+        if not _is_private(CACHE_DIR):
+            return
+        descriptor, temporary = tempfile.mkstemp(dir=CACHE_DIR,
+                                                 suffix=".tmp")
+        try:
+            with os.fdopen(descriptor, "w", encoding="utf-8") as file:
+                file.write(screen)
+            os.replace(temporary, CACHE_DIR / cache_key(command_path, plain))
+        except OSError:
+            os.unlink(temporary)
+            raise
+    except OSError:
+        pass
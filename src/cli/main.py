@@ -5,17 +5,43 @@ from src.cli.commands.auth import login, logout, refresh_cmd
 from src.cli.commands.client import client
 from src.cli.commands.company import company
 from src.cli.commands.contract import contract
+from src.cli.commands.data import export_cmd, import_cmd
 from src.cli.commands.database import db_create, manager_create
 from src.cli.commands.event import event
 from src.cli.commands.user import user
 from src.cli.help import attach_help, epic_help, render_help_with_logo
+from src.cli.utils import explain_queries
+from src.crm.views.records import OUTPUT_FORMATS
+from src.crm.views.views import view
+
+
+def _plain_callback(ctx, param, value):
+    # Eager, so that --help output is plain too
+    if value:
+        view.use_plain()
 
 
 @epic_help
 @click.group(invoke_without_command=True)
+@click.option("--explain", is_flag=True, default=False,
+              help="Print the plans of the SQL issued by the command")
+@click.option("--analyze", is_flag=True, default=False,
+              help="With --explain, run EXPLAIN (ANALYZE, BUFFERS)")
+@click.option("--plain", is_flag=True, is_eager=True, expose_value=False,
+              callback=_plain_callback,
+              help="Never clear the screen nor draw the logo "
+                   "(default when stdout is not a terminal)")
+@click.option("--output", "output_format", type=click.Choice(OUTPUT_FORMATS),
+              help="Print lists and details as JSON Lines, CSV or TSV "
+                   "records instead of tables, messages going to stderr")
 @click.pass_context
-def cli(ctx: click.Context):
+def cli(ctx: click.Context, explain: bool, analyze: bool,
+        output_format: str | None):
     """Epic Events CRM - Secure event management system with role-based permissions."""
+    if output_format:
+        view.use_records(output_format)
+    if explain or analyze:
+        ctx.with_resource(explain_queries(analyze=analyze))
     if ctx.invoked_subcommand is None:
         render_help_with_logo(ctx)
 
@@ -27,6 +53,8 @@ cli.add_command(logout)
 cli.add_command(refresh_cmd, name="refresh")
 cli.add_command(db_create, name="db-create")
 cli.add_command(manager_create, name="manager-create")
+cli.add_command(import_cmd, name="import")
+cli.add_command(export_cmd, name="export")
 
 # Add command groups
 cli.add_command(user)
@@ -1,8 +1,13 @@
+from contextlib import contextmanager
+
+import click
 import sentry_sdk
 from rich.console import Console
 
 from src.auth.jwt.token_storage import get_access_token
+from src.auth.normalization import cache_stats
 from src.crm.views.views import MainView
+from src.data_access.query_plans import capture_statements, explain_statements
 
 view = MainView()
 
@@ -11,6 +16,38 @@ print = console.print
 
 
 
+class IdRanges(click.ParamType):
+    """
+    Comma separated ids and inclusive id ranges, e.g. "1-500,512,600-610",
+    converted to a sorted list of unique ids.
+    """
+    name = "ids"
+    max_ids = 100_000
+
+    def convert(self, value, param, ctx):
+        if isinstance(value, list):
+            return value
+        ids = set()
+        for part in value.split(","):
+            part = part.strip()
+            if not part:
+                continue
+            start, dash, end = part.partition("-")
+            try:
+                first = int(start)
+                last = int(end) if dash else first
+            except ValueError:
+                self.fail(f"{part!r} is not an id or an id range", param, ctx)
+            if first > last:
+                self.fail(f"{part!r} is an empty range", param, ctx)
+            if last - first + len(ids) >= self.max_ids:
+                self.fail(f"more than {self.max_ids} ids selected", param, ctx)
+            ids.update(range(first, last + 1))
+        if not ids:
+            self.fail("no id given", param, ctx)
+        return sorted(ids)
+
+
 def get_required_token():
     """Get the required access token, showing an error if not available."""
     token = get_access_token()
@@ -34,3 +71,15 @@ def run_safely(title, func, *args, **kwargs):
         show_error(str(e), title)
         return
 
+
+@contextmanager
+def explain_queries(analyze: bool = False):
+    """
+    Capture the SQL issued by the wrapped command and print the plans
+    once it has run, with EXPLAIN (ANALYZE, BUFFERS) when analyze is set,
+    followed by the hit rates of the normalization caches.
+    """
+    with capture_statements() as captured:
+        yield
+    view.display_query_plans(explain_statements(captured, analyze))
+    view.display_cache_stats(cache_stats())
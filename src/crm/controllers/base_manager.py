@@ -1,10 +1,37 @@
 from abc import ABC, abstractmethod
+from collections.abc import Iterator
 from typing import Any
 
-from sqlalchemy import select
+from sqlalchemy import (
+    ARRAY,
+    Integer,
+    Select,
+    and_,
+    any_,
+    bindparam,
+    delete,
+    insert,
+    select,
+    update,
+)
+from sqlalchemy.engine import Row
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import aliased
+from sqlalchemy.sql.elements import ColumnElement
 
 from src.auth.decorators import login_required, in_session
+from src.crm.controllers.filters import apply_filters, compile_filter
+from src.crm.controllers.schemas import COMPILED_SCHEMAS
+from src.crm.models import EntityVisibility, Event
+from src.crm.registry import HIDDEN_COLUMNS, metadata_for
 from src.data_access.config import Session
+from src.data_access.row_security import enforced_by_policy
+from src.data_access.visibility import (
+    affected_users,
+    affected_users_where,
+    refresh_visibility,
+    visible_clause,
+)
 from src.exceptions import InvalidIdError
 
 session = Session()
@@ -49,16 +76,368 @@ class EntityManager(Manager):
         update: Update an instance of the entity.
         delete: Delete an instance of the entity.
     """
+    # Foreign keys that list views can swap for a readable name, mapped
+    # to (target model, target attribute, label of the resolved column).
+    display_names: dict[str, tuple[Any, str, str]] = {}
+    # Columns whose change moves rows in or out of the support visibility
+    visibility_columns: set[str] = set()
+    # Rows deleted per transaction by bulk_delete(), keeps row locks short
+    bulk_chunk_size: int = 1000
+    # Rows fetched per round trip by stream()
+    stream_batch_size: int = 500
+
     def __init__(self, entity: Any):
         self.entity = entity
         self.name = entity.__name__.lower()
+        self.metadata = metadata_for(entity)
+
+    def _with_display_names(self, stmt: Select) -> Select:
+        """
+        Turn a select on the entity into a flat projection carrying the
+        display names of its foreign keys.
+
+        Every name comes from an outer join on an aliased target, so the
+        list is still fetched in a single query whatever the number of
+        rows.
+        """
+        columns = list(self.entity.__table__.columns)
+        targets = []
+        for fk_field, (target, attribute, label) in self.display_names.items():
+            target_alias = aliased(target)
+            columns.append(getattr(target_alias, attribute).label(label))
+            targets.append((target_alias, getattr(self.entity, fk_field)))
+
+        stmt = stmt.with_only_columns(*columns)
+        for target_alias, fk_column in targets:
+            stmt = stmt.outerjoin_from(self.entity,
+                                       target_alias,
+                                       target_alias.id == fk_column)
+        return stmt
+
+    def display_fields(self, fields: list[str]) -> list[str]:
+        """Swap foreign-key fields for the label of their display name."""
+        labels = {fk: label for fk, (_, _, label) in self.display_names.items()}
+        return [labels.get(field, field) for field in fields]
+
+    def _apply_filters(self,
+                       stmt: Select,
+                       where: str | None = None,
+                       sort: str | None = None) -> Select:
+        """Compile the --where/--sort options of a list into the statement."""
+        return apply_filters(stmt, self.entity, where, sort)
+
+    def _visible_to(self, stmt: Select, user_id: int) -> Select:
+        """Restrict a select on the entity to what a support user can see."""
+        return stmt.join(EntityVisibility,
+                         visible_clause(self.entity, user_id))
+
+    def list_query(self,
+                   where: str | None = None,
+                   sort: str | None = None) -> Select:
+        """Build the unscoped list statement of the entity."""
+        return self._apply_filters(select(self.entity), where, sort)
+
+    def export_query(self, resolve_names: bool = False, **scope) -> Select:
+        """
+        The list statement of the entity, built by list_query() with the
+        given scope, projected on the columns that can leave the
+        database, plus the display names of the foreign keys.
+        """
+        stmt = self.list_query(**scope)
+        if resolve_names:
+            stmt = self._with_display_names(stmt)
+        return stmt.with_only_columns(*(
+            column for column in stmt.selected_columns
+            if column.key not in HIDDEN_COLUMNS
+        ))
+
+    def list(self,
+             where: str | None = None,
+             sort: str | None = None,
+             resolve_names: bool = False) -> list:
+        with Session() as session:
+            stmt = self.list_query(where, sort)
+            return self._fetch_list(session, stmt, resolve_names)
+
+    def ownership_clause(self,
+                         user_id: int | None,
+                         user_role: str | None) -> ColumnElement | None:
+        """
+        Rows of the entity a user may modify, as a WHERE clause.
+        None when the role has no ownership restriction.
+        """
+        return None
+
+    def _ids_clause(self, ids) -> ColumnElement:
+        """id = ANY(:ids), one array parameter whatever the number of ids."""
+        return self.entity.id == any_(
+            bindparam(None, list(ids), type_=ARRAY(Integer))
+        )
+
+    def bulk_update(self,
+                    values: dict,
+                    ids=None,
+                    where: str | None = None,
+                    user_id: int | None = None,
+                    user_role: str | None = None) -> "list[int]":
+        """
+        Update every row selected by ids and/or a --where filter with a
+        single UPDATE ... RETURNING id.
+
+        Rows the user does not own are left out by the ownership clause
+        folded into the WHERE clause, so they are simply not returned.
+
+        Args:
+            values: Column values to set. None values are ignored.
+            ids: Ids of the rows to update.
+            where: Filter expression, see src.crm.controllers.filters.
+            user_id: Id of the user running the update.
+            user_role: Role of that user, read from the token by default.
+
+        Returns:
+            The ids of the updated rows.
+
+        Raises:
+            ValueError: If no values or no row selection is given.
+        """
+        values = {key: value for key, value in values.items()
+                  if value is not None}
+        if not values:
+            raise ValueError("No value to update.")
+        if not ids and not where:
+            raise ValueError("Select the rows to update with ids or a filter.")
+
+        criteria = []
+        if ids:
+            criteria.append(self._ids_clause(ids))
+        if where:
+            criteria.append(compile_filter(self.entity, where))
+        ownership = self.ownership_clause(user_id, user_role)
+        if ownership is not None:
+            criteria.append(ownership)
+
+        stmt = (update(self.entity)
+                .where(*criteria)
+                .values(values)
+                .returning(self.entity.id))
+        touches_visibility = bool(self.visibility_columns & values.keys())
+
+        with Session() as session:
+            users = set()
+            if touches_visibility:
+                users = affected_users_where(session, self.entity,
+                                             and_(*criteria))
+            updated = session.scalars(
+                stmt, execution_options={"synchronize_session": False}
+            ).all()
+            if touches_visibility and updated:
+                users |= affected_users_where(session, self.entity,
+                                              self._ids_clause(updated))
+                refresh_visibility(session, users)
+            session.commit()
+        return updated
+
+    def prepare_rows(self,
+                     session,
+                     rows: "list[dict]",
+                     user_id: int | None = None,
+                     user_role: str | None = None) -> "list[dict]":
+        """
+        Apply the business rules of create() to a batch of rows, with
+        one query per rule rather than one per row. Raises ValueError or
+        PermissionError naming the first offending row.
+        """
+        return rows
+
+    def validate_rows(self, session, rows: "list[dict]") -> "list[dict]":
+        """
+        Normalize a batch of rows through the validation schema of the
+        entity, column at a time, the unique fields being checked with a
+        single query. Raises ValueError listing every offending row.
+        """
+        schema = COMPILED_SCHEMAS.get(self.name)
+        if schema is None:
+            return rows
+        rows, errors = schema.validate_batch(rows, session)
+        if errors:
+            raise ValueError("\n".join(
+                f"Row {index}: {'; '.join(messages)}."
+                for index, messages in sorted(errors.items())
+            ))
+        return rows
+
+    def _check_columns(self, rows: "list[dict]") -> None:
+        columns = set(self.entity.__table__.c.keys())
+        for index, row in enumerate(rows, start=1):
+            unknown = row.keys() - columns
+            if unknown:
+                raise ValueError(
+                    f"Row {index}: unknown {self.name} field(s) "
+                    f"{', '.join(sorted(unknown))}."
+                )
+
+    def bulk_create(self,
+                    rows,
+                    user_id: int | None = None,
+                    user_role: str | None = None) -> "list[Row]":
+        """
+        Insert a batch of rows in a single transaction.
+
+        Rows go through validate_rows() and prepare_rows() then through
+        multi-row INSERT ... VALUES (...), (...) RETURNING statements (one
+        per set of given fields), so the server defaults such as
+        created_at come back without a refresh.
+
+        Args:
+            rows: Iterable of dicts of column values.
+            user_id: Id of the user creating the rows.
+            user_role: Role of that user, read from the token by default.
+
+        Returns:
+            The created rows, in input order, as lightweight Row objects
+            holding every column but the secret ones.
+        """
+        rows = [dict(row) for row in rows]
+        if not rows:
+            return []
+        returned = [column for column in self.entity.__table__.c
+                    if column.key not in HIDDEN_COLUMNS]
+        stmt = (insert(self.entity)
+                .returning(*returned, sort_by_parameter_order=True))
+
+        with Session() as session:
+            rows = self.validate_rows(session, rows)
+            rows = self.prepare_rows(session, rows, user_id, user_role)
+            self._check_columns(rows)
+
+            # An executemany shares the field list of its first row
+            batches: dict[tuple[str, ...], list[int]] = {}
+            for index, row in enumerate(rows):
+                batches.setdefault(tuple(sorted(row)), []).append(index)
+
+            created: list = [None] * len(rows)
+            with enforced_by_policy(
+                f"You are not allowed to create some of these {self.name}s."
+            ):
+                for indexes in batches.values():
+                    result = session.execute(
+                        stmt, [rows[index] for index in indexes]
+                    )
+                    for index, row in zip(indexes, result):
+                        created[index] = row
+
+            if self.entity is Event:
+                new_ids = [row.id for row in created]
+                refresh_visibility(session, affected_users_where(
+                    session, self.entity, self._ids_clause(new_ids)
+                ))
+            session.commit()
+        return created
+
+    def selection_ids(self,
+                      ids=None,
+                      where: str | None = None,
+                      user_id: int | None = None,
+                      user_role: str | None = None) -> "list[int]":
+        """
+        Ids of the existing rows selected by ids and/or a --where filter
+        that the user may modify, in a single query.
+        """
+        if not ids and not where:
+            raise ValueError("Select the rows with ids or a filter.")
+        stmt = select(self.entity.id).order_by(self.entity.id)
+        if ids:
+            stmt = stmt.where(self._ids_clause(ids))
+        if where:
+            stmt = stmt.where(compile_filter(self.entity, where))
+        ownership = self.ownership_clause(user_id, user_role)
+        if ownership is not None:
+            stmt = stmt.where(ownership)
+        with Session() as session:
+            return list(session.scalars(stmt))
+
+    def bulk_delete(self,
+                    ids,
+                    user_id: int | None = None,
+                    user_role: str | None = None) -> "list[int]":
+        """
+        Delete rows by id with set-based DELETE ... WHERE id = ANY(:ids)
+        statements, one transaction per chunk of bulk_chunk_size ids.
+
+        Dependent rows are handled by the ON DELETE rules of the foreign
+        keys (events cascade with their contract, clients lose their
+        company), nothing is loaded in the session. Rows the user does
+        not own are left out by the ownership clause.
+
+        Returns:
+            The ids of the deleted rows.
+
+        Raises:
+            ValueError: If a chunk is still referenced by rows that
+            restrict the delete. The previous chunks stay deleted.
+        """
+        ids = sorted(set(ids))
+        ownership = self.ownership_clause(user_id, user_role)
+        deleted = []
+        for start in range(0, len(ids), self.bulk_chunk_size):
+            criteria = [self._ids_clause(ids[start:start + self.bulk_chunk_size])]
+            if ownership is not None:
+                criteria.append(ownership)
+            stmt = (delete(self.entity)
+                    .where(*criteria)
+                    .returning(self.entity.id))
+            with Session() as session:
+                users = affected_users_where(session, self.entity,
+                                             and_(*criteria))
+                try:
+                    chunk = session.scalars(
+                        stmt, execution_options={"synchronize_session": False}
+                    ).all()
+                except IntegrityError as exc:
+                    session.rollback()
+                    raise ValueError(
+                        f"Some {self.name}s are still referenced by other "
+                        f"records and cannot be deleted "
+                        f"({len(deleted)} deleted before the failure)."
+                    ) from exc
+                refresh_visibility(session, users)
+                session.commit()
+            deleted.extend(chunk)
+        return deleted
+
+    def stream(self, stmt: Select, resolve_names: bool = False) -> Iterator:
+        """
+        Yield the rows of a list statement while they are fetched.
+
+        The rows come from a server-side cursor, stream_batch_size at a
+        time (yield_per), and the session stays open until the iterator
+        is exhausted or closed: memory does not grow with the number of
+        rows and the first ones are available before the last is read.
+        """
+        resolve_names = resolve_names and bool(self.display_names)
+        if resolve_names:
+            stmt = self._with_display_names(stmt)
+        stmt = stmt.execution_options(yield_per=self.stream_batch_size)
+        with Session() as session:
+            result = session.execute(stmt)
+            yield from (result if resolve_names else result.scalars())
+
+    def _fetch_list(self, session, stmt: Select, resolve_names: bool = False):
+        """Run a list statement, resolving display names when asked."""
+        if resolve_names and self.display_names:
+            return session.execute(self._with_display_names(stmt)).all()
+        return session.scalars(stmt).all()
 
     @in_session(session)
     def create(self, data: dict):
         new_instance = self.entity(**data)
         session.add(new_instance)
+        session.flush()
+        # No visibility row points to a new row yet, only the support
+        # assigned to a new event gains some
+        if isinstance(new_instance, Event):
+            refresh_visibility(session, affected_users(session, new_instance))
         session.commit()
-        session.refresh(new_instance)
         return new_instance
 
     @in_session(session=session)
@@ -95,12 +474,7 @@ class EntityManager(Manager):
         if not entity:
             return None, []
 
-        # Get all column names from the entity
-        from sqlalchemy import inspect
-        mapper = inspect(self.entity)
-        fields = [column.name for column in mapper.columns]
-
-        return entity, fields
+        return entity, list(self.metadata.columns)
 
     @in_session(session=session)
     def get_by_id(self, id: int):
@@ -136,20 +510,22 @@ class EntityManager(Manager):
         """
         try:
             entity = self.get_by_id(id)
+            session.add(entity)
+            users = affected_users(session, entity)
             for key, value in data.items():
                 setattr(entity, key, value)
-            session.add(entity)
+            session.flush()
+            refresh_visibility(session, users | affected_users(session, entity))
             session.commit()
-            session.refresh(entity)
             return entity
         except InvalidIdError as e:
             print(e)
             return
 
-    @in_session(session)
     def delete(self, id: int) -> bool:
         """
-        Delete the instance from the database and commit
+        Delete the instance from the database and commit, through
+        bulk_delete() so the ON DELETE rules handle the dependent rows.
 
         Argument:
             - id: int. Required. The id of the instance
@@ -159,12 +535,8 @@ class EntityManager(Manager):
             - bool.
             Usage : is_deleted = manager.delete(instance_)
         """
-        try:
-            entity = self.get_by_id(id)
-            session.delete(entity)
-            session.commit()
-            return True
-        except InvalidIdError:
+        if not self.bulk_delete([id]):
             raise InvalidIdError(
                 "Incorrect ID.\nImpossible to delete instance of Nonetype"
             )
+        return True
@@ -0,0 +1,59 @@
+"""
+Parsing microbenchmark of DataService.normalized_date.
+
+    python -m src.crm.controllers.benchmark [values]
+
+Parses a mix of the accepted date formats with the former strptime()
+loop and with parse_datetime(), and checks that both agree.
+"""
+import sys
+import time
+from datetime import datetime
+
+from src.crm.controllers.dates import as_aware, parse_datetime
+
+# The formats normalized_date() used to try in turn
+STRPTIME_FORMATS = (
+    "%d/%m/%Y", "%d/%m/%Y %H:%M", "%d/%m/%Y %H:%M:%S",
+    "%Y-%m-%d", "%Y-%m-%d %H:%M", "%Y-%m-%d %H:%M:%S",
+    "%d-%m-%Y", "%d-%m-%Y %H:%M", "%d-%m-%Y %H:%M:%S",
+)
+
+SAMPLES = (
+    "21/12/2025", "21/12/2025 14:30", "1/2/2026 08:05:09",
+    "2025-12-21", "2025-12-21 14:30", "2025-12-21 14:30:00",
+    "21-12-2025", "21-12-2025 14:30:00", "31/02/2025", "not a date",
+)
+
+
+def parse_with_strptime(value: str) -> datetime | None:
+    value = value.strip()
+    for date_format in STRPTIME_FORMATS:
+        try:
+            return as_aware(datetime.strptime(value, date_format))
+        except ValueError:
+            continue
+    return None
+
+
+def _timed(label: str, count: int, func) -> list:
+    started = time.perf_counter()
+    result = func()
+    seconds = time.perf_counter() - started
+    print(f"{label:<20} {seconds:8.3f} s  {count / seconds:>12,.0f} values/s")
+    return result
+
+
+def run(count: int = 200_000) -> None:
+    values = [SAMPLES[index % len(SAMPLES)] for index in range(count)]
+    print(f"{count:,} values, {len(SAMPLES)} formats")
+    legacy = _timed("strptime loop", count,
+                    lambda: [parse_with_strptime(value) for value in values])
+    parsed = _timed("parse_datetime", count,
+                    lambda: [parse_datetime(value) for value in values])
+    if legacy != parsed:
+        raise SystemExit("The parsers disagree.")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000)
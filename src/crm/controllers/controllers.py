@@ -1,14 +1,16 @@
 from abc import ABC, abstractmethod
 
-from sqlalchemy import inspect
+from sqlalchemy.exc import IntegrityError
 
 from src.auth.decorators import in_session
 from src.auth.jwt.token_storage import get_user_info_from_token
 from src.auth.permissions import login_required
-from src.auth.validators import is_valid_email, is_valid_username
+from src.auth.validators import duplicate_field, is_valid_email, is_valid_username
 from src.crm.controllers.managers import manager_repertory
+from src.crm.controllers.schemas import DUPLICATE_MESSAGES
 from src.crm.controllers.services import DataService
 from src.crm.models import Client, Company, Contract, Event, User
+from src.crm.registry import metadata_for
 from src.crm.views.helper_view import HelperView
 from src.crm.views.views import view
 from src.data_access.config import Session
@@ -63,54 +65,21 @@ class EntityController(Controller):
     """
     def __init__(self, entity: type, fields: list[str] | None=None):
         self.entity = entity
-        self.fields = fields
-        if not self.fields:
-            self.fields = self._get_required_fields()
-        self.entity_name = entity.__name__.lower()
+        self.metadata = metadata_for(entity)
+        self.required_fields = list(self.metadata.required_fields)
+        self.fields = fields or self.required_fields
+        self.entity_name = self.metadata.name
         self.manager = get_manager_for(self.entity_name)
-        self.required_fields = self._get_required_fields()
-
-    def _get_required_fields(self):
-        """
-        Gets the list of required fields for an entity by inspecting the model.
-        Returns fields that are nullable=False, excluding auto-generated fields.
-        """
-        mapper = inspect(self.entity)
-        required_fields = []
-
-        for column in mapper.columns:
-            # Skip auto-generated fields (primary keys with autoincrement,
-            # timestamps with server_default)
-            # But include user-input fields that are nullable=False
-            if (column.nullable is False
-            and not (column.primary_key and column.autoincrement)
-            and not column.server_default
-            and column.name not in ['id',
-                                    'created_at',
-                                    'updated_at',
-                                    'commercial_id']):
-                required_fields.append(column.name)
-        return required_fields
 
     def _validate_entity_data(self, service: DataService, data: dict) -> dict | None:
         """
         Validate entity data using appropriate DataService validator.
         Returns validated data or None if validation fails.
         """
-        match self.entity_name:
-            case "user":
-                return service.validate_and_normalize_user_data(data)
-            case "client":
-                return service.validate_and_normalize_client_data(data)
-            case "company":
-                return service.validate_and_normalize_company_data(data)
-            case "contract":
-                return service.validate_and_normalize_contract_data(data)
-            case "event":
-                return service.validate_and_normalize_event_data(data)
-            case _:
-                # For entities without specialized validation, return as-is
-                return data
+        if self.metadata.validator is None:
+            # For entities without specialized validation, return as-is
+            return data
+        return getattr(service, self.metadata.validator)(data)
 
     def _validate_entity_data_for_update(self, service: DataService, data: dict, entity_id: int) -> dict | None:
         """
@@ -118,20 +87,12 @@ class EntityController(Controller):
         Excludes current entity ID from uniqueness checks.
         Returns validated data or None if validation fails.
         """
-        match self.entity_name:
-            case "user":
-                return service.validate_and_normalize_user_data(data, exclude_user_id=entity_id)
-            case "client":
-                return service.validate_and_normalize_client_data(data, exclude_client_id=entity_id)
-            case "company":
-                return service.validate_and_normalize_company_data(data)
-            case "contract":
-                return service.validate_and_normalize_contract_data(data)
-            case "event":
-                return service.validate_and_normalize_event_data(data)
-            case _:
-                # For entities without specialized validation, return as-is
-                return data
+        if self.metadata.validator is None:
+            return data
+        validate = getattr(service, self.metadata.validator)
+        if self.metadata.exclude_argument is None:
+            return validate(data)
+        return validate(data, **{self.metadata.exclude_argument: entity_id})
 
     @in_session(session)
     def create(self, *args, **kwargs):
@@ -194,6 +155,13 @@ class EntityController(Controller):
                 new_obj = self.manager.create(validated_data)
             view.success_message(f"{self.entity_name} created successfully.")
             return new_obj
+        except IntegrityError as e:
+            field = duplicate_field(e)
+            view.error_message(
+                DUPLICATE_MESSAGES[field] if field
+                else f"Error while creating {self.entity_name}: {e}"
+            )
+            return
         except Exception as e:
             view.error_message(
                 f"Error while creating {self.entity_name}: {e}"
@@ -204,15 +172,11 @@ class EntityController(Controller):
     @login_required
     def get_list(self, fields: list[str]=None, **kwargs):
         if not fields:
-            fields = self._get_required_fields()
-        if not fields:
-            fields = self.fields
+            fields = self.required_fields or self.fields
 
-        elements = self.manager.list(**kwargs)
-        if not elements:
+        elements = self.manager.stream(self.manager.list_query(**kwargs))
+        if not view.display_list(elements, fields):
             view.wrong_message(f"No {self.entity_name}s found.")
-            return
-        view.display_list(elements, fields)
 
     @in_session(session)
     def view(self, id: int, fields: list[str]=None):
@@ -248,7 +212,8 @@ class EntityController(Controller):
         return entity
 
     @in_session(session)
-    def delete(self, id:int, fields: list[str]=None) -> bool:
+    def delete(self, id:int, fields: list[str]=None,
+               assume_yes: bool = False) -> bool:
 
         entity = self.manager.get_instance(id)
         if not entity:
@@ -267,17 +232,64 @@ class EntityController(Controller):
                 )
                 return False
 
-        sure = view.sure_to_delete(entity).strip().lower()
+        sure = "yes" if assume_yes else view.sure_to_delete(entity).strip().lower()
         if sure in ["yes", "y"]:
-            session = Session()
-            session.delete(entity)
-            session.commit()
+            user_info = get_user_info_from_token()
+            try:
+                deleted = self.manager.bulk_delete(
+                    [id], user_id=user_info['user_id'] if user_info else None
+                )
+            except ValueError as exc:
+                view.error_message(str(exc))
+                return False
+            if not deleted:
+                raise PermissionError(
+                    f"You are not allowed to delete this {self.entity_name}."
+                )
             view.success_message(f"{self.entity_name} deleted successfully.")
             return True
         else:
             view.wrong_message(f"{self.entity_name} not found")
             return False
 
+    def bulk_delete(self,
+                    ids: list[int] | None = None,
+                    where: str | None = None,
+                    assume_yes: bool = False) -> list[int]:
+        """
+        Delete every row selected by ids and/or a --where filter after a
+        single confirmation (skipped with assume_yes).
+        """
+        user_info = get_user_info_from_token()
+        user_id = user_info['user_id'] if user_info else None
+        try:
+            selected = self.manager.selection_ids(ids, where, user_id)
+        except ValueError as exc:
+            view.error_message(str(exc))
+            return []
+        if not selected:
+            view.wrong_message(f"No {self.entity_name} to delete.")
+            return []
+        if ids and len(selected) < len(ids):
+            view.wrong_message(
+                f"{len(ids) - len(selected)} {self.entity_name}(s) "
+                "skipped: not found, filtered out or not yours."
+            )
+
+        if not assume_yes:
+            sure = view.sure_to_bulk_delete(self.entity_name, len(selected))
+            if sure.strip().lower() not in ["yes", "y"]:
+                view.wrong_message(f"No {self.entity_name} deleted.")
+                return []
+
+        try:
+            deleted = self.manager.bulk_delete(selected, user_id=user_id)
+        except ValueError as exc:
+            view.error_message(str(exc))
+            return []
+        view.success_message(f"{len(deleted)} {self.entity_name}(s) deleted.")
+        return deleted
+
 
 class ClientController(EntityController):
     def __init__(self):
@@ -343,12 +355,19 @@ class UserController(EntityController):
             email = normalized
         return email
 
-    def get_list(self, management=False, commercial=False, support=False):
+    def get_list(self,
+                 management=False,
+                 commercial=False,
+                 support=False,
+                 where=None,
+                 sort=None):
         super().get_list(
             ["id", "username", "role_id"],
             management=management,
             commercial=commercial,
-            support=support
+            support=support,
+            where=where,
+            sort=sort
         )
 
 
@@ -0,0 +1,86 @@
+"""
+Parsing of the dates typed in the CLI or read from imported rows.
+
+Accepted inputs, with an optional time (HH:MM or HH:MM:SS, after a
+space or a "T"):
+
+    21/12/2025    21-12-2025    2025-12-21
+
+A single precompiled regex is chosen from the separator found at the
+position the year or the day ends, instead of trying each strptime()
+format until one does not raise. Any other ISO 8601 form, e.g. with a
+UTC offset or fractional seconds, goes through datetime.fromisoformat().
+
+Every result is timezone-aware, like the DateTime(timezone=True)
+columns it is stored in: a date without an offset is read in the
+TIME_ZONE setting, or in the local time zone of the machine.
+"""
+import re
+from datetime import datetime, tzinfo
+from zoneinfo import ZoneInfo
+
+from src.settings import TIME_ZONE
+
+_TIME = r"(?:[ T](\d{1,2}):(\d{1,2})(?::(\d{1,2}))?)?"
+_DAY_FIRST = {
+    separator: re.compile(
+        rf"(\d{{1,2}}){separator}(\d{{1,2}}){separator}(\d{{4}}){_TIME}"
+    )
+    for separator in "/-"
+}
+_YEAR_FIRST = re.compile(rf"(\d{{4}})-(\d{{1,2}})-(\d{{1,2}}){_TIME}")
+
+ZONE: tzinfo | None = ZoneInfo(TIME_ZONE) if TIME_ZONE else None
+
+
+def as_aware(value: datetime) -> datetime:
+    """
+    A datetime with its time zone, TIME_ZONE or the local one if naive.
+    Any other value is returned as is.
+    """
+    if not isinstance(value, datetime) or value.tzinfo is not None:
+        return value
+    if ZONE is not None:
+        return value.replace(tzinfo=ZONE)
+    return value.astimezone()
+
+
+def database_zone() -> str:
+    """
+    The zone naive dates are read in, as a PostgreSQL TimeZone value:
+    the TIME_ZONE name, or else the current UTC offset of the machine,
+    in the POSIX form whose sign is inverted.
+    """
+    name = getattr(ZONE, "key", None)
+    if name:
+        return name
+    offset = int(as_aware(datetime.now()).utcoffset().total_seconds()) // 60
+    east, west = ("+", "-") if offset >= 0 else ("-", "+")
+    hours, minutes = divmod(abs(offset), 60)
+    return f"<{east}{hours:02}{minutes:02}>{west}{hours:02}:{minutes:02}"
+
+
+def parse_datetime(value: str) -> datetime | None:
+    """Timezone-aware datetime of a date string, None if it is not one."""
+    value = value.strip()
+    if len(value) < 8:
+        return None
+    if value[4] == "-" and value[:4].isdigit():
+        match = _YEAR_FIRST.fullmatch(value)
+        order = (0, 1, 2)
+    else:
+        pattern = _DAY_FIRST.get(value[2]) or _DAY_FIRST.get(value[1])
+        match = pattern.fullmatch(value) if pattern else None
+        order = (2, 1, 0)
+
+    try:
+        if match is None:
+            return as_aware(datetime.fromisoformat(value))
+        groups = match.groups()
+        return as_aware(datetime(
+            int(groups[order[0]]), int(groups[order[1]]),
+            int(groups[order[2]]),
+            *(int(part) for part in groups[3:] if part is not None)
+        ))
+    except ValueError:
+        return None
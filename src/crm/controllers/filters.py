@@ -0,0 +1,270 @@
+"""
+A small filter and sort language for the list commands.
+
+Expressions are validated against the mapped columns of the entity and
+compiled into SQLAlchemy clauses, so filtering and ordering always run
+in PostgreSQL.
+
+Filter grammar (`--where`):
+
+    expression := term ("or" term)*
+    term       := factor ("and" factor)*
+    factor     := "not" factor | "(" expression ")" | comparison
+    comparison := field [operator value]
+    operator   := "=" | "==" | "!=" | "<" | "<=" | ">" | ">=" | "~"
+
+A bare field must be a boolean column (`is_signed`, `not is_signed`).
+`~` is a case-insensitive "contains" match of text fields, in which `%`
+and `_` are plain characters; `null` compares with IS NULL.
+
+Sort syntax (`--sort`): comma separated fields, prefixed by `-` for a
+descending order, e.g. `-start_date,id`.
+"""
+import re
+from datetime import datetime
+from decimal import Decimal, InvalidOperation
+
+from sqlalchemy import Select, String, and_, inspect, not_, or_
+from sqlalchemy.sql.elements import ColumnElement
+
+from src.crm.controllers.dates import parse_datetime
+from src.crm.registry import HIDDEN_COLUMNS, metadata_for
+from src.exceptions import InvalidFilterError
+
+_TOKEN_RE = re.compile(r"""
+    \s*(?:
+        (?P<string>'[^']*'|"[^"]*")
+      | (?P<number>-?\d+(?:\.\d+)?(?![\w/:-]))
+      | (?P<operator>==|!=|<=|>=|=|<|>|~)
+      | (?P<paren>[()])
+      | (?P<word>[\w./:+-]+)
+    )""", re.VERBOSE)
+
+_KEYWORDS = {"and", "or", "not"}
+_LITERALS = {"true": True, "false": False, "null": None}
+
+
+def _tokenize(expression: str) -> list[tuple[str, str]]:
+    tokens = []
+    position = 0
+    expression = expression.rstrip()
+    while position < len(expression):
+        match = _TOKEN_RE.match(expression, position)
+        if not match or match.end() == position:
+            raise InvalidFilterError(
+                f"Unexpected character at position {position}: "
+                f"{expression[position:]!r}"
+            )
+        kind = match.lastgroup
+        value = match.group(kind)
+        if kind == "word" and value.lower() in _KEYWORDS:
+            kind, value = "keyword", value.lower()
+        tokens.append((kind, value))
+        position = match.end()
+    return tokens
+
+
+def _filterable_columns(entity) -> dict:
+    metadata = metadata_for(entity)
+    if metadata is not None:
+        return metadata.visible_columns
+    return {
+        column.key: column for column in inspect(entity).columns
+        if column.key not in HIDDEN_COLUMNS
+    }
+
+
+def _column(entity, columns: dict, name: str):
+    if name not in columns:
+        raise InvalidFilterError(
+            f"Unknown field '{name}'. "
+            f"Available fields: {', '.join(sorted(columns))}"
+        )
+    return getattr(entity, name)
+
+
+def _coerce(column, raw: str, quoted: bool):
+    """Convert a literal to the Python type of the column it is compared to."""
+    try:
+        python_type = column.type.python_type
+    except NotImplementedError:
+        python_type = str
+    if not quoted and raw.lower() in _LITERALS:
+        value = _LITERALS[raw.lower()]
+        if value is None or python_type is bool:
+            return value
+
+    try:
+        if python_type is bool:
+            raise ValueError
+        if python_type is int:
+            return int(raw)
+        if python_type is Decimal:
+            return Decimal(raw)
+        if python_type is datetime:
+            # Same formats and time zone as the prompts; naive values
+            # are read in TIME_ZONE, not in the server's zone.
+            value = parse_datetime(raw)
+            if value is None:
+                raise ValueError
+            return value
+        if python_type is str:
+            return raw
+    except (ValueError, InvalidOperation):
+        pass
+    raise InvalidFilterError(
+        f"Invalid value {raw!r} for field '{column.key}'"
+    )
+
+
+class _Parser:
+    """Recursive descent parser compiling a filter into a SQL clause."""
+
+    def __init__(self, entity, expression: str):
+        self.entity = entity
+        self.columns = _filterable_columns(entity)
+        self.tokens = _tokenize(expression)
+        self.position = 0
+
+    def _peek(self) -> tuple[str, str] | None:
+        if self.position < len(self.tokens):
+            return self.tokens[self.position]
+        return None
+
+    def _next(self) -> tuple[str, str]:
+        token = self._peek()
+        if token is None:
+            raise InvalidFilterError("Unexpected end of filter expression")
+        self.position += 1
+        return token
+
+    def _accept_keyword(self, keyword: str) -> bool:
+        if self._peek() == ("keyword", keyword):
+            self.position += 1
+            return True
+        return False
+
+    def parse(self) -> ColumnElement:
+        clause = self._expression()
+        if self._peek() is not None:
+            raise InvalidFilterError(
+                f"Unexpected token {self._peek()[1]!r}"
+            )
+        return clause
+
+    def _expression(self) -> ColumnElement:
+        clauses = [self._term()]
+        while self._accept_keyword("or"):
+            clauses.append(self._term())
+        return clauses[0] if len(clauses) == 1 else or_(*clauses)
+
+    def _term(self) -> ColumnElement:
+        clauses = [self._factor()]
+        while self._accept_keyword("and"):
+            clauses.append(self._factor())
+        return clauses[0] if len(clauses) == 1 else and_(*clauses)
+
+    def _factor(self) -> ColumnElement:
+        if self._accept_keyword("not"):
+            return not_(self._factor())
+        if self._peek() == ("paren", "("):
+            self.position += 1
+            clause = self._expression()
+            if self._next() != ("paren", ")"):
+                raise InvalidFilterError("Missing closing parenthesis")
+            return clause
+        return self._comparison()
+
+    def _comparison(self) -> ColumnElement:
+        kind, name = self._next()
+        if kind != "word":
+            raise InvalidFilterError(f"Expected a field name, got {name!r}")
+        column = _column(self.entity, self.columns, name)
+
+        token = self._peek()
+        if token is None or token[0] != "operator":
+            if column.type.python_type is not bool:
+                raise InvalidFilterError(
+                    f"Field '{name}' is not a boolean, "
+                    "compare it with an operator"
+                )
+            # Plain boolean clauses (`col`, `NOT col`) match the predicates
+            # of the partial indexes, IS TRUE / IS FALSE would not.
+            return column.is_(True) if column.nullable else column.expression
+
+        operator = self._next()[1]
+        kind, raw = self._next()
+        if kind not in {"word", "number", "string"}:
+            raise InvalidFilterError(f"Expected a value after '{operator}'")
+        quoted = kind == "string"
+        if quoted:
+            raw = raw[1:-1]
+
+        if operator == "~":
+            if not isinstance(column.type, String):
+                raise InvalidFilterError(
+                    f"Operator '~' only applies to text fields, "
+                    f"'{name}' is not one"
+                )
+            return column.icontains(raw, autoescape=True)
+
+        value = _coerce(column, raw, quoted)
+        if value is None:
+            match operator:
+                case "=" | "==":
+                    return column.is_(value)
+                case "!=":
+                    return column.is_not(value)
+            raise InvalidFilterError(
+                f"Operator '{operator}' cannot compare with {raw}"
+            )
+
+        if isinstance(value, bool) and operator not in {"=", "==", "!="}:
+            raise InvalidFilterError(
+                f"Operator '{operator}' cannot compare with {raw}"
+            )
+
+        match operator:
+            case "=" | "==":
+                return column == value
+            case "!=":
+                return column != value
+            case "<":
+                return column < value
+            case "<=":
+                return column <= value
+            case ">":
+                return column > value
+            case ">=":
+                return column >= value
+
+
+def compile_filter(entity, expression: str) -> ColumnElement:
+    """Compile a --where expression into a SQL clause on the entity."""
+    return _Parser(entity, expression).parse()
+
+
+def compile_sort(entity, spec: str) -> list:
+    """Compile a --sort specification into ORDER BY clauses."""
+    columns = _filterable_columns(entity)
+    clauses = []
+    for item in spec.split(","):
+        item = item.strip()
+        if not item:
+            continue
+        descending = item.startswith("-")
+        column = _column(entity, columns, item.lstrip("+-"))
+        clauses.append(column.desc() if descending else column.asc())
+    return clauses
+
+
+def apply_filters(stmt: Select,
+                  entity,
+                  where: str | None = None,
+                  sort: str | None = None) -> Select:
+    """Push the --where and --sort options of a list command into SQL."""
+    if where:
+        stmt = stmt.where(compile_filter(entity, where))
+    if sort:
+        stmt = stmt.order_by(*compile_sort(entity, sort))
+    return stmt
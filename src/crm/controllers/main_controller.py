@@ -2,8 +2,13 @@ from collections.abc import Callable
 from functools import wraps
 
 from src.auth.hashing import hash_password
-from src.auth.jwt.token_storage import get_user_info_from_token
-from src.auth.permissions import login_required, require_permission
+from src.auth.jwt.token_storage import get_access_token, get_user_info_from_token
+from src.auth.permissions import (
+    get_user_role_name_from_token,
+    has_permission,
+    login_required,
+    require_permission,
+)
 from src.crm.controllers.auth_controller import AuthController
 from src.crm.controllers.controllers import (
     client_controller,
@@ -14,12 +19,26 @@ from src.crm.controllers.controllers import (
 )
 from src.crm.controllers.services import DataService
 from src.crm.views.views import view
+from src.data_access.exporter import export_statement
+from src.data_access.importer import import_file
+from src.exceptions import InvalidFilterError
+
+# Any of these permissions allows importing a file of the entity
+IMPORT_PERMISSIONS: dict[str, tuple[str, ...]] = {
+    "company": ("company:create",),
+    "client": ("client:create",),
+    "contract": ("contract:create",),
+    "event": ("event:create:own_client", "event:create:signed_contract"),
+}
 
 auth_controller = AuthController()
 
 
 def handle_permission_errors(func):
-    """Decorator to handle PermissionError exceptions and display them via view."""
+    """
+    Decorator to handle PermissionError (and invalid --where/--sort
+    expressions) exceptions and display them via view.
+    """
     @wraps(func)
     def wrapper(self, *args, **kwargs):
         try:
@@ -27,6 +46,9 @@ def handle_permission_errors(func):
         except PermissionError as e:
             self.view.error_message(str(e))
             return
+        except InvalidFilterError as e:
+            self.view.error_message(str(e))
+            return
     return wrapper
 
 class MainController:
@@ -39,6 +61,113 @@ class MainController:
         self.company_c = company_controller
         self.view = view
 
+    def _bulk_update(self, controller, ids, where, values: dict):
+        """Update a selection of rows in one statement and report it."""
+        user_info = get_user_info_from_token()
+        if not user_info:
+            self.view.error_message(
+                f"You must be logged in to update {controller.entity_name}s."
+            )
+            return
+        try:
+            updated = controller.manager.bulk_update(
+                values, ids=ids, where=where, user_id=user_info['user_id']
+            )
+        except ValueError as exc:
+            self.view.error_message(str(exc))
+            return
+
+        if not updated:
+            self.view.wrong_message(f"No {controller.entity_name} updated.")
+            return updated
+        self.view.success_message(
+            f"{len(updated)} {controller.entity_name}(s) updated."
+        )
+        if ids and len(updated) < len(ids):
+            self.view.wrong_message(
+                f"{len(ids) - len(updated)} {controller.entity_name}(s) "
+                "skipped: not found, filtered out or not yours."
+            )
+        return updated
+
+    def _delete(self, controller, entity_id, ids, where, assume_yes):
+        """Delete one row by id, or a selection through bulk_delete."""
+        if ids or where:
+            if entity_id is not None:
+                ids = sorted({*(ids or []), entity_id})
+            return controller.bulk_delete(ids, where, assume_yes)
+        return controller.delete(entity_id, assume_yes=assume_yes)
+
+    @handle_permission_errors
+    @login_required
+    def import_entities(self,
+                        entity: str,
+                        path: str,
+                        fmt: str | None = None,
+                        reject_path: str | None = None):
+        """Load a CSV or JSON Lines file of an entity through COPY."""
+        access_token = get_access_token()
+        if not any(has_permission(access_token, permission)
+                   for permission in IMPORT_PERMISSIONS.get(entity, ())):
+            raise PermissionError("Permission denied")
+
+        user_info = get_user_info_from_token()
+        try:
+            report = import_file(entity, path,
+                                 user_id=user_info['user_id'],
+                                 user_role=get_user_role_name_from_token(),
+                                 fmt=fmt,
+                                 reject_path=reject_path)
+        except (ValueError, OSError) as exc:
+            self.view.error_message(str(exc))
+            return
+        self.view.display_import_report(entity, report)
+        return report
+
+    @handle_permission_errors
+    @login_required
+    def export_entities(self,
+                        entity: str,
+                        path: str | None = None,
+                        fmt: str = "csv",
+                        compress: bool = False,
+                        only_mine: bool = False,
+                        names: bool = False,
+                        where: str | None = None,
+                        sort: str | None = None):
+        """Stream the list of an entity to a file or stdout through COPY."""
+        if not has_permission(get_access_token(), f"{entity}:list"):
+            raise PermissionError("Permission denied")
+
+        controller = {
+            "user": self.user_c,
+            "client": self.client_c,
+            "contract": self.contract_c,
+            "event": self.event_c,
+            "company": self.company_c,
+        }[entity]
+        # Same scope as the list command of the entity
+        scope = {"where": where, "sort": sort}
+        if entity != "user":
+            scope["user_id"] = get_user_info_from_token()['user_id']
+        if entity in {"client", "contract", "event"}:
+            scope["filtered"] = only_mine
+
+        statement = controller.manager.export_query(resolve_names=names,
+                                                    **scope)
+        try:
+            report = export_statement(statement, path, fmt=fmt,
+                                      compress=compress)
+        except BrokenPipeError:
+            # The reader of the standard output stopped early
+            return
+        except (ValueError, OSError) as exc:
+            self.view.error_message(str(exc))
+            return
+        if path:
+            self.view.display_export_report(entity, report)
+        return report
+
     def ask(self, attrib: str):
         """Helper method to prompt user for input during manager creation."""
         return self.view.get_input(
@@ -186,8 +315,25 @@ class MainController:
     @handle_permission_errors
     @login_required
     @require_permission("user:list")
-    def list_users(self, management=False, commercial=False, support=False):
-        self.user_c.get_list(management=management, commercial=commercial, support=support)
+    def list_users(self,
+                   management=False,
+                   commercial=False,
+                   support=False,
+                   where: str | None = None,
+                   sort: str | None = None):
+        self.user_c.get_list(management=management,
+                             commercial=commercial,
+                             support=support,
+                             where=where,
+                             sort=sort)
+
+    @handle_permission_errors
+    @login_required
+    @require_permission("user:list")
+    def count_users(self):
+        """Display the headcount per role."""
+        counts = self.user_c.manager.count_by_role()
+        self.view.display_role_counts(counts)
 
     @handle_permission_errors
     @login_required
@@ -198,8 +344,9 @@ class MainController:
     @handle_permission_errors
     @login_required
     @require_permission("user:delete")
-    def delete_user(self, user_id: int):
-        self.user_c.delete(user_id)
+    def delete_user(self, user_id: int | None = None,
+                    ids=None, where=None, assume_yes: bool = False):
+        self._delete(self.user_c, user_id, ids, where, assume_yes)
 
     @handle_permission_errors
     @login_required
@@ -246,18 +393,31 @@ class MainController:
     @handle_permission_errors
     @login_required
     @require_permission("client:list")
-    def list_clients(self, only_mine: bool = False):
+    def list_clients(self,
+                     only_mine: bool = False,
+                     names: bool = False,
+                     where: str | None = None,
+                     sort: str | None = None):
         user_info = get_user_info_from_token()
         if not user_info:
             self.view.error_message("You must be logged in to list clients.")
             return
 
-        clients = self.client_c.manager.list(user_info['user_id'], filtered=only_mine)
-        if not clients:
+        manager = self.client_c.manager
+        clients = manager.stream(
+            manager.list_query(user_info['user_id'], filtered=only_mine,
+                               where=where, sort=sort),
+            resolve_names=names,
+        )
+        if names:
+            fields = manager.display_fields(
+                self.view.ENTITY_FIELDS["client"]["list"]
+            )
+            shown = self.view.display_list(clients, fields, title="CLIENTS")
+        else:
+            shown = self.view.display_clients(clients)
+        if not shown:
             self.view.wrong_message("No clients found.")
-            return
-
-        self.view.display_clients(clients)
 
     @handle_permission_errors
     @login_required
@@ -268,8 +428,9 @@ class MainController:
     @handle_permission_errors
     @login_required
     @require_permission("client:delete")
-    def delete_client(self, client_id: int):
-        self.client_c.delete(client_id)
+    def delete_client(self, client_id: int | None = None,
+                      ids=None, where=None, assume_yes: bool = False):
+        self._delete(self.client_c, client_id, ids, where, assume_yes)
 
     @handle_permission_errors
     @login_required
@@ -291,28 +452,39 @@ class MainController:
             self.view.error_message(str(exc))
             return
 
+    @handle_permission_errors
+    @login_required
+    @require_permission("contract:update:own")
+    def bulk_update_contracts(self, ids=None, where=None, **kwargs):
+        return self._bulk_update(self.contract_c, ids, where, kwargs)
+
     @handle_permission_errors
     @login_required
     @require_permission("contract:list")
     def list_contracts(self,
                        only_mine: bool = False,
                        unsigned: bool = False,
-                       unpaid: bool = False):
+                       unpaid: bool = False,
+                       names: bool = False,
+                       where: str | None = None,
+                       sort: str | None = None):
         user_info = get_user_info_from_token()
         if not user_info:
             self.view.error_message("You must be logged in to list contracts.")
             return
 
-        contracts = self.contract_c.manager.list(user_info['user_id'],
-                                                filtered=only_mine,
-                                                unsigned=unsigned,
-                                                unpaid=unpaid)
-        if not contracts:
-            self.view.wrong_message("No contracts found.")
-            return
-
+        manager = self.contract_c.manager
+        contracts = manager.stream(
+            manager.list_query(user_info['user_id'], filtered=only_mine,
+                               unsigned=unsigned, unpaid=unpaid,
+                               where=where, sort=sort),
+            resolve_names=names,
+        )
         fields = self.contract_c.fields or self.contract_c._get_list_fields()
-        self.view.display_list(contracts, fields)
+        if names:
+            fields = manager.display_fields(fields)
+        if not self.view.display_list(contracts, fields, title="CONTRACTS"):
+            self.view.wrong_message("No contracts found.")
 
     @handle_permission_errors
     @login_required
@@ -323,8 +495,9 @@ class MainController:
     @handle_permission_errors
     @login_required
     @require_permission("contract:delete")
-    def delete_contract(self, contract_id: int):
-        self.contract_c.delete(contract_id)
+    def delete_contract(self, contract_id: int | None = None,
+                        ids=None, where=None, assume_yes: bool = False):
+        self._delete(self.contract_c, contract_id, ids, where, assume_yes)
 
     @handle_permission_errors
     @login_required
@@ -342,24 +515,38 @@ class MainController:
             return
         return self.event_c.manager.update(event_id, kwargs, user_info)
 
+    @handle_permission_errors
+    @login_required
+    @require_permission("event:update:assigned")
+    def bulk_update_events(self, ids=None, where=None, **kwargs):
+        return self._bulk_update(self.event_c, ids, where, kwargs)
+
     @handle_permission_errors
     @login_required
     @require_permission("event:list")
-    def list_events(self, only_mine: bool = False, unassigned_only: bool = False):
+    def list_events(self,
+                    only_mine: bool = False,
+                    unassigned_only: bool = False,
+                    names: bool = False,
+                    where: str | None = None,
+                    sort: str | None = None):
         user_info = get_user_info_from_token()
         if not user_info:
             self.view.error_message("You must be logged in to list events.")
             return
 
-        events = self.event_c.manager.list(user_info['user_id'],
-                                           filtered=only_mine,
-                                           unassigned_only=unassigned_only)
-        if not events:
-            self.view.wrong_message("No events found.")
-            return
-
+        manager = self.event_c.manager
+        events = manager.stream(
+            manager.list_query(user_info['user_id'], filtered=only_mine,
+                               unassigned_only=unassigned_only,
+                               where=where, sort=sort),
+            resolve_names=names,
+        )
         fields = self.event_c.fields or self.event_c._get_list_fields()
-        self.view.display_list(events, fields)
+        if names:
+            fields = manager.display_fields(fields)
+        if not self.view.display_list(events, fields, title="EVENTS"):
+            self.view.wrong_message("No events found.")
 
     @handle_permission_errors
     @login_required
@@ -370,8 +557,9 @@ class MainController:
     @handle_permission_errors
     @login_required
     @require_permission("event:delete")
-    def delete_event(self, event_id: int):
-        self.event_c.delete(event_id)
+    def delete_event(self, event_id: int | None = None,
+                     ids=None, where=None, assume_yes: bool = False):
+        self._delete(self.event_c, event_id, ids, where, assume_yes)
 
     @handle_permission_errors
     @login_required
@@ -394,19 +582,22 @@ class MainController:
     @handle_permission_errors
     @login_required
     @require_permission("company:list")
-    def list_companies(self):
+    def list_companies(self,
+                       where: str | None = None,
+                       sort: str | None = None):
         user_info = get_user_info_from_token()
         if not user_info:
             self.view.error_message("You must be logged in to list companies.")
             return
 
-        companies = self.company_c.manager.list(user_id=user_info['user_id'])
-        if not companies:
-            self.view.wrong_message("No companies found.")
-            return
-
+        manager = self.company_c.manager
+        companies = manager.stream(
+            manager.list_query(user_id=user_info['user_id'],
+                               where=where, sort=sort)
+        )
         fields = self.company_c.fields or self.company_c._get_list_fields()
-        self.view.display_list(companies, fields)
+        if not self.view.display_list(companies, fields, title="COMPANIES"):
+            self.view.wrong_message("No companies found.")
 
     @handle_permission_errors
     @login_required
@@ -417,8 +608,9 @@ class MainController:
     @handle_permission_errors
     @login_required
     @require_permission("company:delete")
-    def delete_company(self, company_id: int):
-        self.company_c.delete(company_id)
+    def delete_company(self, company_id: int | None = None,
+                       ids=None, where=None, assume_yes: bool = False):
+        self._delete(self.company_c, company_id, ids, where, assume_yes)
 
     def login(self, username: str, password: str):
         self.auth_c.login(username, password)
@@ -1,15 +1,24 @@
-from sqlalchemy import select
+from sqlalchemy import Select, func, not_, select
 
 from src.auth.hashing import hash_password
 from src.auth.jwt.token_storage import get_user_info_from_token
 from src.auth.permissions import (
-    ROLE_ID_TO_NAME,
+    ROLE_NAME_TO_ID,
     UserRoles,
     get_user_role_name_from_token,
 )
 from src.crm.controllers.base_manager import EntityManager
 from src.crm.models import Client, Company, Contract, Event, Role, User
 from src.data_access.config import Session
+from src.data_access.row_security import (
+    enforced_by_policy,
+    policies_enforced,
+)
+from src.data_access.visibility import (
+    affected_users,
+    is_visible_query,
+    refresh_visibility,
+)
 from src.auth.decorators import in_session
 
 session = Session()
@@ -28,6 +37,19 @@ class UserManager(EntityManager):
                 print(f"Password validation failed: {str(e)}")
         return super().create(data)
 
+    def prepare_rows(self, session, rows, user_id=None, user_role=None):
+        """Hash the passwords of the new users."""
+        for index, row in enumerate(rows, start=1):
+            password = row.pop("password", None)
+            if password:
+                try:
+                    row["password_hash"] = hash_password(password)
+                except ValueError as e:
+                    raise ValueError(
+                        f"Row {index}: password validation failed: {str(e)}"
+                    )
+        return rows
+
     def update(self, id: int, data: dict) -> User | None:
         password = data.get("password")
         if password:
@@ -38,31 +60,52 @@ class UserManager(EntityManager):
                 raise ValueError(f"Password validation failed: {str(e)}")
         return super().update(id, data)
 
+    def list_query(self,
+                   management: bool = False,
+                   commercial: bool = False,
+                   support: bool = False,
+                   where: str | None = None,
+                   sort: str | None = None) -> Select:
+        """Build the user list statement, role flags filtered in SQL."""
+        flags = {
+            UserRoles.MANAGEMENT: management,
+            UserRoles.COMMERCIAL: commercial,
+            UserRoles.SUPPORT: support,
+        }
+        role_ids = [ROLE_NAME_TO_ID[name] for name, wanted in flags.items()
+                    if wanted]
+        stmt = select(self.entity)
+        if role_ids:
+            stmt = stmt.where(self.entity.role_id.in_(role_ids))
+            if not sort:
+                stmt = stmt.order_by(self.entity.role_id, self.entity.id)
+        return self._apply_filters(stmt, where, sort)
+
+    def count_by_role(self) -> list[tuple[str, int]]:
+        """
+        Headcount per role, computed by a single GROUP BY query.
+
+        Returns:
+            (role name, number of users) pairs, roles without users
+            included with a count of 0.
+        """
+        with Session() as session:
+            stmt = (select(Role.name, func.count(self.entity.id))
+                    .outerjoin(self.entity, self.entity.role_id == Role.id)
+                    .group_by(Role.id, Role.name)
+                    .order_by(Role.id))
+            return session.execute(stmt).all()
+
     def list(self,
             management: bool = False,
             commercial: bool = False,
-            support: bool = False) -> list[User]:
-        users = super().get_list()
-        filtered_users = []
-
-        name_to_id = {name: role_id for role_id, name in ROLE_ID_TO_NAME.items()}
-
-        if management:
-            management_role_id = name_to_id.get(UserRoles.MANAGEMENT)
-            if management_role_id:
-                filtered_users.extend([user for user in users if user.role_id == management_role_id])
-        if commercial:
-            commercial_role_id = name_to_id.get(UserRoles.COMMERCIAL)
-            if commercial_role_id:
-                filtered_users.extend([user for user in users if user.role_id == commercial_role_id])
-        if support:
-            support_role_id = name_to_id.get(UserRoles.SUPPORT)
-            if support_role_id:
-                filtered_users.extend([user for user in users if user.role_id == support_role_id])
-
-        if any([management, commercial, support]):
-            return filtered_users
-        return users
+            support: bool = False,
+            where: str | None = None,
+            sort: str | None = None) -> list[User]:
+        with Session() as session:
+            stmt = self.list_query(management, commercial, support,
+                                   where, sort)
+            return self._fetch_list(session, stmt)
 
     def reset_password(self, user_id: int, new_password: str) -> User | None:
         """
@@ -93,12 +136,17 @@ class UserManager(EntityManager):
                 user.password_hash = hash_password(new_password)
                 session.add(user)
                 session.commit()
-                session.refresh(user)
                 return user
             except ValueError as e:
                 raise ValueError(f"Password validation failed: {str(e)}")
 
 class ClientManager(EntityManager):
+    display_names = {
+        "commercial_id": (User, "username", "commercial_name"),
+        "company_id": (Company, "name", "company_name"),
+    }
+    visibility_columns = {"company_id"}
+
     def __init__(self):
         super().__init__(Client)
 
@@ -106,34 +154,54 @@ class ClientManager(EntityManager):
         data['commercial_id'] = user_id
         return super().create(data)
 
-    def list(self, user_id: int, filtered: bool = False) -> list[Client]:
-        user_role = get_user_role_name_from_token()
+    def prepare_rows(self, session, rows, user_id=None, user_role=None):
+        """New clients belong to the commercial creating them."""
+        if user_id is None:
+            raise ValueError("Clients need the id of their commercial.")
+        for row in rows:
+            row['commercial_id'] = user_id
+        return rows
+
+    def list_query(self,
+                   user_id: int,
+                   filtered: bool = False,
+                   user_role: str | None = None,
+                   where: str | None = None,
+                   sort: str | None = None) -> Select:
+        """Build the client list statement scoped to the given role."""
+        user_role = user_role or get_user_role_name_from_token()
+        stmt = select(self.entity)
+
+        if filtered and user_role == UserRoles.COMMERCIAL:
+            stmt = stmt.where(self.entity.commercial_id == user_id)
+
+        # Support can filter clients to only view those linked
+        # to their assigned events
+        elif filtered and user_role == UserRoles.SUPPORT:
+            stmt = self._visible_to(stmt, user_id)
+        return self._apply_filters(stmt, where, sort)
 
+    def list(self,
+             user_id: int,
+             filtered: bool = False,
+             resolve_names: bool = False,
+             where: str | None = None,
+             sort: str | None = None) -> list[Client]:
         with Session() as session:
-            stmt = select(self.entity)
-
-            if filtered and user_role == UserRoles.COMMERCIAL:
-                stmt = stmt.where(self.entity.commercial_id == user_id)
+            stmt = self.list_query(user_id, filtered, where=where, sort=sort)
+            return self._fetch_list(session, stmt, resolve_names)
 
-            # Support can filter clients to only view those linked 
-            # to their assigned events
-            elif filtered and user_role == UserRoles.SUPPORT:
-                stmt = (stmt.join(Contract)
-                        .join(Event)
-                        .where(Event.support_contact_id == user_id))
-
-            return session.scalars(stmt).all()
+    def ownership_clause(self, user_id, user_role=None):
+        """Commercials only modify their own clients."""
+        user_role = user_role or get_user_role_name_from_token()
+        if user_role == UserRoles.COMMERCIAL:
+            return self.entity.commercial_id == user_id
+        return None
 
     @in_session(session)
     def view(self, id: int, session=None) -> Client | None:
-        fields = [
-            "id", "full_name", "email", 
-            "phone", "company_id", 
-            "first_contact_date", 
-            "last_contact_date"
-        ]
         client = self.get_instance(id)
-        return client, fields
+        return client, list(self.metadata.detail_fields)
 
     @in_session(session)
     def update(self,
@@ -146,24 +214,37 @@ class ClientManager(EntityManager):
                 return None
 
             # Only business logic validation: commercials
-            # can only update own clients
+            # can only update own clients (enforced by the client_update
+            # policy in row-level security mode)
             user_role = get_user_role_name_from_token()
-            if (user_role == UserRoles.COMMERCIAL
+            if (not policies_enforced()
+                    and user_role == UserRoles.COMMERCIAL
                     and client.commercial_id != current_user['user_id']):
                 raise PermissionError(
                     "Commercial users can only update their own clients."
                 )
 
+            session.add(client)
+            users = affected_users(session, client)
             for key, value in data.items():
                 if value is not None:
                     setattr(client, key, value)
-            session.add(client)
+            with enforced_by_policy(
+                "Commercial users can only update their own clients."
+            ):
+                session.flush()
+            refresh_visibility(session, users)
             session.commit()
-            session.refresh(client)
             return client
 
 
 class ContractManager(EntityManager):
+    display_names = {
+        "client_id": (Client, "full_name", "client_name"),
+        "commercial_id": (User, "username", "commercial_name"),
+    }
+    visibility_columns = {"client_id"}
+
     def __init__(self):
         super().__init__(Contract)
 
@@ -225,60 +306,115 @@ class ContractManager(EntityManager):
 
         return super().create(data)
 
-    def list(
+    def prepare_rows(self, session, rows, user_id=None, user_role=None):
+        """
+        create() rules for a batch: the clients are loaded in one query,
+        the commercial of each contract is the one of its client.
+        """
+        user_role = user_role or get_user_role_name_from_token()
+        for row in rows:
+            for bool_field in self.BOOL_FIELDS & row.keys():
+                row[bool_field] = self._coerce_boolean(row[bool_field], bool_field)
+
+        client_ids = {row.get("client_id") for row in rows}
+        commercials = dict(session.execute(
+            select(Client.id, Client.commercial_id)
+            .where(Client.id.in_(client_ids - {None}))
+        ).all())
+        for index, row in enumerate(rows, start=1):
+            if row.get("client_id") not in commercials:
+                raise ValueError(f"Row {index}: client not found.")
+            commercial_id = commercials[row["client_id"]]
+            if not commercial_id:
+                raise ValueError(
+                    f"Row {index}: client must have an assigned commercial "
+                    "before creating a contract."
+                )
+            if (user_role == UserRoles.COMMERCIAL
+                    and commercial_id != user_id):
+                raise PermissionError(
+                    f"Row {index}: you can only create contracts for your "
+                    "own clients."
+                )
+            row['commercial_id'] = commercial_id
+        return rows
+
+    def list_query(
         self,
         user_id: int,
         filtered: bool = False,
         unsigned: bool = False,
         unpaid: bool = False,
-    ) -> list[Contract]:
-        user_role = get_user_role_name_from_token()
+        user_role: str | None = None,
+        where: str | None = None,
+        sort: str | None = None,
+    ) -> Select:
+        """Build the contract list statement scoped to the given role."""
+        user_role = user_role or get_user_role_name_from_token()
+        stmt = select(self.entity)
 
-        with Session() as session:
-            stmt = select(self.entity)
+        if filtered:
+            stmt = stmt.join(Client).where(Client.commercial_id == user_id)
 
-            if filtered:
-                stmt = stmt.join(Client).where(Client.commercial_id == user_id)
+        # Support can only view contracts linked to their assigned events
+        elif user_role == UserRoles.SUPPORT:
+            stmt = self._visible_to(stmt, user_id)
 
-            # Support can only view contracts linked to their assigned events
-            elif user_role == UserRoles.SUPPORT:
-                from src.crm.models import Event
-                stmt = (stmt.join(Event)
-                        .where(Event.support_contact_id == user_id))
+        if unsigned:
+            stmt = stmt.where(not_(self.entity.is_signed))
+        if unpaid:
+            stmt = stmt.where(self.entity.remaining_amount > 0)
+        return self._apply_filters(stmt, where, sort)
 
-            if unsigned:
-                stmt = stmt.where(not self.entity.is_signed)
-            if unpaid:
-                stmt = stmt.where(self.entity.remaining_amount > 0)
-            return session.scalars(stmt).all()
+    def list(
+        self,
+        user_id: int,
+        filtered: bool = False,
+        unsigned: bool = False,
+        unpaid: bool = False,
+        resolve_names: bool = False,
+        where: str | None = None,
+        sort: str | None = None,
+    ) -> list[Contract]:
+        with Session() as session:
+            stmt = self.list_query(user_id, filtered, unsigned, unpaid,
+                                   where=where, sort=sort)
+            return self._fetch_list(session, stmt, resolve_names)
+
+    def ownership_clause(self, user_id, user_role=None):
+        """Commercials only modify the contracts of their own clients."""
+        user_role = user_role or get_user_role_name_from_token()
+        if user_role == UserRoles.COMMERCIAL:
+            return self.entity.client_id.in_(
+                select(Client.id).where(Client.commercial_id == user_id)
+            )
+        return None
+
+    def assigned_contract_query(self, contract_id: int, user_id: int) -> Select:
+        """EXISTS check: is the contract linked to an event of this support?"""
+        return is_visible_query(self.name, contract_id, user_id)
 
     @in_session(session)
-    def view(self, id: int, session=None) -> tuple[Contract | None, list[str]]:
+    def view(self, id: int, session=None) -> "tuple[Contract | None, list[str]]":
         """
         Get contract instance with support access control.
         Returns tuple of (contract, fields) for consistency with EntityManager.view().
         """
-        fields = [
-            "id", "client_id", "commercial_id",
-            "total_amount", "remaining_amount",
-            "is_signed", "is_fully_paid",
-            "created_at", "updated_at"
-        ]
+        fields = list(self.metadata.detail_fields)
         contract = self.get_instance(id)
         if not contract:
             return None, []
 
-        # Support can only view contracts linked to their assigned events
+        # Support can only view contracts linked to their assigned events,
+        # the contract_read policy already filtered them out in row-level
+        # security mode
         user_role = get_user_role_name_from_token()
-        if user_role == UserRoles.SUPPORT:
+        if user_role == UserRoles.SUPPORT and not policies_enforced():
             current_user_info = get_user_info_from_token()
 
-            assigned_contract_exists = session.query(
-                session.query(Contract).join(Event)
-                .filter(Contract.id == id)
-                .filter(Event.support_contact_id == current_user_info['user_id'])
-                .exists()
-            ).scalar()
+            assigned_contract_exists = session.scalar(
+                self.assigned_contract_query(id, current_user_info['user_id'])
+            )
 
             if not assigned_contract_exists:
                 raise PermissionError(
@@ -298,16 +434,15 @@ class ContractManager(EntityManager):
 
         # Support access control for non-view operations
         user_role = get_user_role_name_from_token()
-        if user_role == UserRoles.SUPPORT:
+        if user_role == UserRoles.SUPPORT and not policies_enforced():
             # Support users should not be able to get contracts directly
             # except through view() which has proper checks
             with Session() as session:
-                assigned_contract_exists = session.query(
-                    session.query(Contract).join(Event)
-                    .filter(Contract.id == id)
-                    .filter(Event.support_contact_id == get_user_info_from_token()['user_id'])
-                    .exists()
-                ).scalar()
+                assigned_contract_exists = session.scalar(
+                    self.assigned_contract_query(
+                        id, get_user_info_from_token()['user_id']
+                    )
+                )
 
                 if not assigned_contract_exists:
                     raise PermissionError(
@@ -323,23 +458,35 @@ class ContractManager(EntityManager):
                 return None
 
             user_role = get_user_role_name_from_token()
-            if user_role == UserRoles.COMMERCIAL and contract.client.commercial_id != user_id:
+            if (not policies_enforced()
+                    and user_role == UserRoles.COMMERCIAL
+                    and contract.client.commercial_id != user_id):
                  raise PermissionError("You can only update contracts for your own clients.")
 
             for bool_field in self.BOOL_FIELDS:
                 if bool_field in data:
                     data[bool_field] = self._coerce_boolean(data[bool_field], bool_field)
 
+            users = affected_users(session, contract)
             # Filter None values to avoid overwriting existing fields
             for key, value in data.items():
                 if value is not None:
                     setattr(contract, key, value)
             session.add(contract)
+            with enforced_by_policy(
+                "You can only update contracts for your own clients."
+            ):
+                session.flush()
+            refresh_visibility(session, users)
             session.commit()
-            session.refresh(contract)
             return contract
 
 class EventManager(EntityManager):
+    display_names = {
+        "support_contact_id": (User, "username", "support_name"),
+    }
+    visibility_columns = {"support_contact_id", "contract_id"}
+
     def __init__(self):
         super().__init__(Event)
 
@@ -368,52 +515,106 @@ class EventManager(EntityManager):
 
         return super().create(data)
 
+    def prepare_rows(self, session, rows, user_id=None, user_role=None):
+        """create() rules for a batch, the contracts loaded in one query."""
+        user_role = user_role or get_user_role_name_from_token()
+        contract_ids = {row.get("contract_id") for row in rows}
+        contracts = {
+            contract.id: contract for contract in session.execute(
+                select(Contract.id, Contract.is_signed, Client.commercial_id)
+                .join(Client, Client.id == Contract.client_id)
+                .where(Contract.id.in_(contract_ids - {None}))
+            )
+        }
+        for index, row in enumerate(rows, start=1):
+            contract = contracts.get(row.get("contract_id"))
+            if contract is None:
+                raise ValueError(f"Row {index}: contract not found.")
+            if not contract.is_signed:
+                raise PermissionError(
+                    f"Row {index}: cannot create an event for an unsigned "
+                    "contract."
+                )
+            if (user_role == UserRoles.COMMERCIAL
+                    and contract.commercial_id != user_id):
+                raise PermissionError(
+                    f"Row {index}: you can only create events for your own "
+                    "clients' contracts."
+                )
+        return rows
+
+    def list_query(self,
+                   user_id: int,
+                   filtered: bool = False,
+                   unassigned_only: bool = False,
+                   user_role: str | None = None,
+                   where: str | None = None,
+                   sort: str | None = None) -> Select:
+        """Build the event list statement scoped to the given role."""
+        user_role = user_role or get_user_role_name_from_token()
+        stmt = select(self.entity)
+
+        if filtered:
+            if user_role == UserRoles.SUPPORT:
+                stmt = stmt.where(self.entity.support_contact_id == user_id)
+            # Other specific filters can be added here
+
+        # Support can only view events assigned to them (by default)
+        elif user_role == UserRoles.SUPPORT:
+            stmt = stmt.where(self.entity.support_contact_id == user_id)
+
+        if unassigned_only:
+            stmt = stmt.where(self.entity.support_contact_id.is_(None))
+        return self._apply_filters(stmt, where, sort)
+
     def list(self,
             user_id: int,
             filtered: bool = False,
-            unassigned_only: bool = False) -> list[Event]:
-        user_role = get_user_role_name_from_token()
-
+            unassigned_only: bool = False,
+            resolve_names: bool = False,
+            where: str | None = None,
+            sort: str | None = None) -> list[Event]:
         with Session() as session:
-            stmt = select(self.entity)
-
-            if filtered:
-                if user_role == UserRoles.SUPPORT:
-                    stmt = stmt.where(self.entity.support_contact_id == user_id)
-                # Other specific filters can be added here
+            stmt = self.list_query(user_id, filtered, unassigned_only,
+                                   where=where, sort=sort)
+            return self._fetch_list(session, stmt, resolve_names)
 
-            # Support can only view events assigned to them (by default)
-            elif user_role == UserRoles.SUPPORT:
-                stmt = stmt.where(self.entity.support_contact_id == user_id)
-
-            if unassigned_only:
-                stmt = stmt.where(self.entity.support_contact_id.is_(None))
-
-            return session.scalars(stmt).all()
+    def ownership_clause(self, user_id, user_role=None):
+        """Support users only modify the events assigned to them."""
+        user_role = user_role or get_user_role_name_from_token()
+        if user_role == UserRoles.SUPPORT:
+            return self.entity.support_contact_id == user_id
+        return None
 
     def update(self, id: int, data: dict, current_user: dict) -> Event | None:
         with Session() as session:
-            event = self.get_instance(id, session)
+            event = session.get(self.entity, id)
             if not event:
                 return None
 
             # Business logic validation: support can only modify their assigned events
             user_role = get_user_role_name_from_token()
-            if (user_role == UserRoles.SUPPORT
+            if (not policies_enforced()
+                    and user_role == UserRoles.SUPPORT
                     and event.support_contact_id != current_user['user_id']):
                 raise PermissionError("Support users can only update events they are assigned to.")
 
+            users = affected_users(session, event)
             for key, value in data.items():
                 if value is not None:
                     setattr(event, key, value)
             session.add(event)
+            with enforced_by_policy(
+                "Support users can only update events they are assigned to."
+            ):
+                session.flush()
+            refresh_visibility(session, users | affected_users(session, event))
             session.commit()
-            session.refresh(event)
             return event
 
     def assign_support(self, event_id: int, support_id: int) -> Event | None:
         with Session() as session:
-            event = self.get_instance(event_id, session)
+            event = session.get(self.entity, event_id)
             if not event:
                 return None
 
@@ -428,10 +629,12 @@ class EventManager(EntityManager):
             if user_role_name != UserRoles.SUPPORT:
                 raise ValueError("User must have support role to be assigned to events.")
 
+            users = affected_users(session, event)
             event.support_contact_id = support_id
             session.add(event)
+            session.flush()
+            refresh_visibility(session, users | {support_id})
             session.commit()
-            session.refresh(event)
             return event
 
 class RoleManager(EntityManager):
@@ -442,22 +645,27 @@ class CompanyManager(EntityManager):
     def __init__(self):
         super().__init__(Company)
 
-    def list(self, user_id: int = None, **kwargs) -> list[Company]:
-        user_role = get_user_role_name_from_token()
+    def list_query(self,
+                   user_id: int = None,
+                   user_role: str | None = None,
+                   where: str | None = None,
+                   sort: str | None = None) -> Select:
+        """Build the company list statement scoped to the given role."""
+        user_role = user_role or get_user_role_name_from_token()
+        stmt = select(self.entity)
 
         # Support can only view companies linked to their assigned events
         if user_role == UserRoles.SUPPORT and user_id:
-            with Session() as session:
-                from src.crm.models import Client, Contract, Event
-                stmt = (select(self.entity)
-                        .join(Client)
-                        .join(Contract)
-                        .join(Event)
-                        .where(Event.support_contact_id == user_id))
-                return session.scalars(stmt).all()
-
-        # For other roles, use base method
-        return super().list(**kwargs)
+            stmt = self._visible_to(stmt, user_id)
+        return self._apply_filters(stmt, where, sort)
+
+    def list(self,
+             user_id: int = None,
+             where: str | None = None,
+             sort: str | None = None) -> list[Company]:
+        with Session() as session:
+            stmt = self.list_query(user_id, where=where, sort=sort)
+            return self._fetch_list(session, stmt)
 
 user_manager = UserManager()
 client_manager = ClientManager()
@@ -0,0 +1,310 @@
+"""
+Declarative validation schemas of the CRM entities.
+
+A schema lists the fields of an entity with the converter normalizing
+them, an optional check of the converted value, the rules involving
+several fields and the fields that must be unique. compile_schema()
+turns it into flat closures, one per field, used two ways:
+
+- validate(): one payload at a time, for the CLI commands,
+- validate_batch(): column at a time over a batch of rows, for
+  bulk_create(), with the unique fields checked by a single query.
+
+Both collect every error instead of stopping at the first one, and
+leave the reporting to the caller. Fields absent from a payload are
+not validated, fields the schema does not know are kept as they are.
+"""
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+from src.auth.normalization import canonical_email, canonical_phone
+from src.auth.validators import (
+    find_batch_duplicates,
+    find_duplicates,
+    find_taken_values,
+    is_valid_role_id,
+    is_valid_username,
+)
+from src.crm.controllers.dates import as_aware, parse_datetime
+
+# Error reported for an invalid or taken value of the unique fields
+DUPLICATE_MESSAGES = {
+    "username": "Invalid or duplicate username",
+    "email": "Invalid or duplicate email",
+    "phone": "Invalid or duplicate phone number",
+}
+
+# Characters removed from free texts, single quotes are doubled
+_FREE_TEXT = str.maketrans({**dict.fromkeys("/\\|$\"`^"), "'": "''"})
+
+
+#########################################################
+#                   Converters
+#########################################################
+# Each returns the normalized value, or None (or raises ValueError or
+# TypeError) when the value is not valid. An empty normalized value is
+# only accepted for the optional fields.
+
+def free_text(value: str | None) -> str | None:
+    """
+    Normalize a free text, such as a full name or an address, removing
+    dangerous characters and doubling single quotes.
+    """
+    if not value:
+        return None
+    return value.translate(_FREE_TEXT)
+
+
+def username(value: str) -> str | None:
+    value = value.strip().lower()
+    return value if is_valid_username(value, check_unique=False) else None
+
+
+def role_id(value: int | str) -> int | None:
+    value = int(value)
+    return value if is_valid_role_id(value) else None
+
+
+def date(value) -> Any:
+    if isinstance(value, str):
+        return parse_datetime(value)
+    return as_aware(value)
+
+
+#########################################################
+#                   Declarations
+#########################################################
+
+@dataclass(frozen=True)
+class Field:
+    """
+    A validated field.
+
+    Attributes:
+        name: Key of the field in the payloads.
+        convert: Converter of the raw value.
+        error: Message reported when the conversion fails.
+        check: Predicate the converted value must satisfy.
+        check_error: Message reported when the check fails.
+        optional: The column is nullable: None and blank values are
+            stored as None, without validation, and a value converted
+            to an empty string is kept.
+    """
+    name: str
+    convert: Callable[[Any], Any]
+    error: str
+    check: Callable[[Any], bool] | None = None
+    check_error: str | None = None
+    optional: bool = False
+
+
+@dataclass(frozen=True)
+class Rule:
+    """A check of several converted fields, run when all are given."""
+    fields: tuple[str, ...]
+    check: Callable[..., bool]
+    error: str
+
+
+@dataclass(frozen=True)
+class Schema:
+    """
+    Attributes:
+        fields: The validated fields, in reporting order.
+        rules: The checks involving several fields.
+        unique: Fields whose values must not be used yet.
+        exclude_argument: find_duplicates() keyword excluding the updated
+            row from the uniqueness checks.
+    """
+    fields: tuple[Field, ...]
+    rules: tuple[Rule, ...] = ()
+    unique: tuple[str, ...] = ()
+    exclude_argument: str | None = None
+
+
+_EMAIL = Field("email", canonical_email, DUPLICATE_MESSAGES["email"])
+_FULL_NAME = Field("full_name", free_text, "Invalid full name")
+
+SCHEMAS: dict[str, Schema] = {
+    "user": Schema(
+        fields=(
+            Field("username", username, DUPLICATE_MESSAGES["username"]),
+            _EMAIL,
+            _FULL_NAME,
+            Field("role_id", role_id, "Invalid role ID"),
+        ),
+        unique=("username", "email"),
+        exclude_argument="exclude_user_id",
+    ),
+    "client": Schema(
+        fields=(
+            _EMAIL,
+            Field("phone", canonical_phone, DUPLICATE_MESSAGES["phone"],
+                  optional=True),
+            _FULL_NAME,
+            Field("first_contact_date", date,
+                  "Invalid first contact date format"),
+            Field("last_contact_date", date,
+                  "Invalid last contact date format", optional=True),
+        ),
+        unique=("email", "phone"),
+        exclude_argument="exclude_client_id",
+    ),
+    "company": Schema(
+        fields=(Field("name", free_text, "Invalid company name"),),
+    ),
+    "contract": Schema(
+        fields=(
+            Field("total_amount", float, "Invalid total amount format",
+                  check=lambda amount: amount > 0,
+                  check_error="Total amount must be positive"),
+            Field("remaining_amount", float,
+                  "Invalid remaining amount format",
+                  check=lambda amount: amount >= 0,
+                  check_error="Remaining amount cannot be negative"),
+        ),
+    ),
+    "event": Schema(
+        fields=(
+            Field("title", free_text, "Invalid event title"),
+            Field("full_address", free_text, "Invalid event address"),
+            Field("start_date", date, "Invalid start date format"),
+            Field("end_date", date, "Invalid end date format"),
+            Field("participant_count", int,
+                  "Invalid participant count format",
+                  check=lambda count: count >= 0,
+                  check_error="Participant count cannot be negative"),
+            Field("notes", free_text, "Invalid notes", optional=True),
+        ),
+        rules=(
+            Rule(("start_date", "end_date"),
+                 lambda start, end: end > start,
+                 "End date must be after start date"),
+        ),
+    ),
+}
+
+
+#########################################################
+#                   Compilation
+#########################################################
+
+def _compile_field(field: Field) -> Callable[[Any], tuple[Any, str | None]]:
+    """A closure returning (converted value, None) or (None, error)."""
+    convert, error = field.convert, field.error
+    check, check_error = field.check, field.check_error
+    optional = field.optional
+
+    def step(value):
+        if optional and (value is None
+                         or isinstance(value, str) and not value.strip()):
+            return None, None
+        try:
+            value = convert(value)
+        except (ValueError, TypeError):
+            return None, error
+        if value is None or value == "" and not optional:
+            return None, error
+        if check is not None and not check(value):
+            return None, check_error
+        return value, None
+    return step
+
+
+@dataclass(frozen=True)
+class CompiledSchema:
+    """
+    validate(data, exclude_id=None) -> (normalized data, errors)
+    validate_batch(rows, session=None) -> (normalized rows,
+        errors by 1-based row index)
+    """
+    validate: Callable[..., tuple[dict, list[str]]]
+    validate_batch: Callable[..., tuple[list[dict], dict[int, list[str]]]]
+
+
+def compile_schema(schema: Schema) -> CompiledSchema:
+    steps = tuple((field.name, _compile_field(field))
+                  for field in schema.fields)
+    rules = tuple((rule.fields, rule.check, rule.error)
+                  for rule in schema.rules)
+    unique = schema.unique
+    unique_errors = {field.name: field.error for field in schema.fields
+                     if field.name in unique}
+    exclude_argument = schema.exclude_argument
+
+    def validate(data: dict, exclude_id: int | None = None):
+        result = dict(data)
+        errors = []
+        for name, step in steps:
+            if name in data:
+                value, error = step(data[name])
+                if error:
+                    errors.append(error)
+                else:
+                    result[name] = value
+        if errors:
+            return result, errors
+
+        for names, check, error in rules:
+            if all(name in result for name in names) \
+                    and not check(*(result[name] for name in names)):
+                errors.append(error)
+
+        values = {name: result[name] for name in unique if result.get(name)}
+        if values and not errors:
+            excluded = ({exclude_argument: exclude_id}
+                        if exclude_argument and exclude_id else {})
+            taken = find_duplicates(values, **excluded)
+            errors.extend(unique_errors[name] for name in unique
+                          if name in taken)
+        return result, errors
+
+    def validate_batch(rows, session=None):
+        results = [dict(row) for row in rows]
+        errors: dict[int, list[str]] = {}
+        for name, step in steps:
+            for index, row in enumerate(results, start=1):
+                if name in row:
+                    value, error = step(row[name])
+                    if error:
+                        errors.setdefault(index, []).append(error)
+                    else:
+                        row[name] = value
+
+        for names, check, error in rules:
+            for index, row in enumerate(results, start=1):
+                if index not in errors \
+                        and all(name in row for name in names) \
+                        and not check(*(row[name] for name in names)):
+                    errors.setdefault(index, []).append(error)
+
+        if unique:
+            # Only the rows valid so far take part in the checks
+            valid = [row if index not in errors else {}
+                     for index, row in enumerate(results, start=1)]
+            repeated = find_batch_duplicates(valid, unique)
+            for name, values in repeated.items():
+                for indexes in values.values():
+                    for index in indexes[1:]:
+                        errors.setdefault(index, []).append(
+                            f"{unique_errors[name]} (see row {indexes[0]})"
+                        )
+            taken = find_taken_values(
+                {name: [row.get(name) for row in valid] for name in unique},
+                session,
+            )
+            for index, row in enumerate(valid, start=1):
+                for name in unique:
+                    if row.get(name) in taken[name]:
+                        errors.setdefault(index, []).append(
+                            unique_errors[name]
+                        )
+        return results, errors
+
+    return CompiledSchema(validate, validate_batch)
+
+
+COMPILED_SCHEMAS: dict[str, CompiledSchema] = {
+    name: compile_schema(schema) for name, schema in SCHEMAS.items()
+}
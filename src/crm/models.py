@@ -98,6 +98,10 @@ class User(Base):
 
     refresh_token_hash = Column(String(255), nullable=True)
 
+    __table_args__ = (
+        Index("ix_users_role_id", "role_id"),
+    )
+
     def __repr__(self):
         role_name = self.role.name if getattr(self, "role", None) else "Unknown"
         return f"<User {role_name} (id={self.id}): {self.username}>"
@@ -145,6 +149,13 @@ class Client(Base):
                         onupdate=func.now(),
                         nullable=False)
 
+    __table_args__ = (
+        Index("ix_client_commercial_id", "commercial_id"),
+        Index("ix_client_company_id", "company_id"),
+        # Uniqueness checks of the validation schemas
+        Index("ix_client_phone", "phone"),
+    )
+
     def __repr__(self):
         return f"<Client (id={self.id}): {self.full_name} " \
                f"commercial_id={self.commercial_id} " \
@@ -184,6 +195,13 @@ class Contract(Base):
 
     __table_args__ = (
         CheckConstraint("remaining_amount >= 0"),
+        Index("ix_contract_client_id", "client_id"),
+        Index("ix_contract_commercial_id", "commercial_id"),
+        # Partial indexes backing `contract list --unpaid / --unsigned`
+        Index("ix_contract_unpaid", "client_id",
+              postgresql_where=text("remaining_amount > 0")),
+        Index("ix_contract_unsigned", "client_id",
+              postgresql_where=text("NOT is_signed")),
     )
 
     def __repr__(self):
@@ -221,6 +239,7 @@ class Event(Base):
         CheckConstraint("participant_count >= 0", name="ck_event_participants_nonneg"),
         Index("ix_event_start_date", "start_date"),
         Index("ix_event_support", "support_contact_id"),
+        Index("ix_event_contract_id", "contract_id"),
     )
 
     def __repr__(self):
@@ -232,6 +251,32 @@ class Event(Base):
         return f"{self.title} ({self.start_date} - {self.end_date})"
 
 
+class EntityVisibility(Base):
+    """
+    Entities a support user can reach through their assigned events.
+
+    One row per (support user, contract | client | company), maintained
+    by src.data_access.visibility whenever an assignment can change, so
+    support-scoped queries are primary-key lookups instead of join
+    chains through the events.
+    """
+    __tablename__ = "entity_visibility"
+    user_id = Column(Integer,
+                     ForeignKey("users.id", ondelete="CASCADE"),
+                     primary_key=True)
+    entity_type = Column(String(16), primary_key=True)
+    entity_id = Column(Integer, primary_key=True)
+
+    __table_args__ = (
+        # Finds the users depending on an entity when it changes
+        Index("ix_entity_visibility_entity", "entity_type", "entity_id"),
+    )
+
+    def __repr__(self):
+        return f"<EntityVisibility user_id={self.user_id} " \
+               f"{self.entity_type}={self.entity_id}>"
+
+
 # Normalized permission model and association table
 
 
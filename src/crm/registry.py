@@ -0,0 +1,192 @@
+"""
+Metadata of the CRM entities, computed once at import.
+
+Controllers, managers, filters and views read the fields, column types,
+cell formatters and validator of an entity from here instead of
+inspecting the mapped class, or hard-coding its field lists, on every
+call.
+"""
+from collections.abc import Callable
+from dataclasses import dataclass
+from functools import lru_cache
+from operator import attrgetter
+
+from sqlalchemy import Boolean, Column, DateTime, inspect
+from sqlalchemy.types import TypeEngine
+
+from src.crm.models import Client, Company, Contract, Event, Role, User
+from src.crm.views.formatters import (
+    FormatterPlan,
+    format_boolean,
+    format_datetime,
+    format_text,
+    format_value,
+)
+
+# Columns that must never be exposed to filtering, sorting or exports
+HIDDEN_COLUMNS = {"password_hash", "refresh_token_hash"}
+
+# Non-nullable columns never prompted for on creation: generated by the
+# database or set from the token
+_GENERATED_FIELDS = {"id", "created_at", "updated_at", "commercial_id"}
+
+# Fields of the list and details views, every visible column when unset
+_DISPLAY_FIELDS = {
+    "user": {
+        "list": ("id", "username", "role_id"),
+        "details": (
+            "id", "username", "full_name", "email", "role_id",
+            "is_active", "created_at", "updated_at", "last_login"
+        ),
+    },
+    "client": {
+        "list": ("id", "full_name", "commercial_id"),
+        "details": (
+            "id", "full_name", "email", "phone", "company_id",
+            "commercial_id", "first_contact_date", "last_contact_date"
+        ),
+    },
+    "contract": {
+        "list": (
+            "id", "client_id", "commercial_id", "total_amount",
+            "is_signed", "is_fully_paid"
+        ),
+        "details": (
+            "id", "client_id", "commercial_id", "total_amount",
+            "remaining_amount", "is_signed", "is_fully_paid",
+            "created_at", "updated_at"
+        ),
+    },
+    "event": {
+        "list": ("id", "title", "start_date", "support_contact_id"),
+        "details": (
+            "id", "title", "contract_id", "support_contact_id",
+            "start_date", "end_date", "participant_count",
+            "full_address", "notes"
+        ),
+    },
+    "company": {
+        "list": ("id", "name"),
+        "details": ("id", "name", "created_at"),
+    },
+}
+
+# DataService method validating the data of an entity, with its keyword
+# excluding the updated row from the uniqueness checks
+_VALIDATORS = {
+    "user": ("validate_and_normalize_user_data", "exclude_user_id"),
+    "client": ("validate_and_normalize_client_data", "exclude_client_id"),
+    "company": ("validate_and_normalize_company_data", None),
+    "contract": ("validate_and_normalize_contract_data", None),
+    "event": ("validate_and_normalize_event_data", None),
+}
+
+
+def _is_required(column: Column) -> bool:
+    return (column.nullable is False
+            and not (column.primary_key and column.autoincrement)
+            and not column.server_default
+            and column.name not in _GENERATED_FIELDS)
+
+
+def column_formatter(column: Column) -> Callable[..., str]:
+    """Cell formatter of a column, chosen from its type."""
+    if isinstance(column.type, DateTime):
+        return format_datetime
+    if isinstance(column.type, Boolean):
+        return format_boolean
+    return format_text
+
+
+@dataclass(frozen=True)
+class EntityMetadata:
+    """
+    What the layers need to know about a mapped class.
+
+    Attributes:
+        name: Lower-case name of the entity, e.g. "contract".
+        model: The mapped class.
+        columns: Every mapped column by key, in table order.
+        visible_columns: The columns but the HIDDEN_COLUMNS ones.
+        column_types: SQL type of each column.
+        required_fields: Non-nullable columns the user must provide.
+        list_fields: Fields of the list views.
+        detail_fields: Fields of the details views.
+        formatters: Cell formatter of each column.
+        validator: Name of the DataService method validating the data,
+            None when the entity has none.
+        exclude_argument: Keyword of that method excluding the updated
+            row from the uniqueness checks, None when it has none.
+    """
+    name: str
+    model: type
+    columns: dict[str, Column]
+    visible_columns: dict[str, Column]
+    column_types: dict[str, TypeEngine]
+    required_fields: tuple[str, ...]
+    list_fields: tuple[str, ...]
+    detail_fields: tuple[str, ...]
+    formatters: dict[str, Callable[..., str]]
+    validator: str | None
+    exclude_argument: str | None
+
+    @classmethod
+    def build(cls, model: type) -> "EntityMetadata":
+        name = model.__name__.lower()
+        columns = {column.key: column for column in inspect(model).columns}
+        visible = {key: column for key, column in columns.items()
+                   if key not in HIDDEN_COLUMNS}
+        display = _DISPLAY_FIELDS.get(name, {})
+        validator, exclude_argument = _VALIDATORS.get(name, (None, None))
+        return cls(
+            name=name,
+            model=model,
+            columns=columns,
+            visible_columns=visible,
+            column_types={key: column.type
+                          for key, column in columns.items()},
+            required_fields=tuple(key for key, column in columns.items()
+                                  if _is_required(column)),
+            list_fields=display.get("list", tuple(visible)),
+            detail_fields=display.get("details", tuple(visible)),
+            formatters={key: column_formatter(column)
+                        for key, column in columns.items()},
+            validator=validator,
+            exclude_argument=exclude_argument,
+        )
+
+
+registry: dict[str, EntityMetadata] = {
+    metadata.name: metadata
+    for metadata in map(EntityMetadata.build,
+                        (User, Role, Client, Contract, Event, Company))
+}
+_by_model = {metadata.model: metadata for metadata in registry.values()}
+
+
+def metadata_for(model: type) -> EntityMetadata | None:
+    """Metadata of a mapped class, None for any other class."""
+    return _by_model.get(model)
+
+
+def _accessor(field: str) -> Callable:
+    def get(obj):
+        return getattr(obj, field, None)
+    return get
+
+
+@lru_cache(maxsize=64)
+def formatter_plan(cls: type, fields: tuple[str, ...]) -> FormatterPlan:
+    """
+    (accessor, formatter) of each field of the instances of cls.
+    Fields that are not columns of a registered entity, such as the
+    display-name labels of `--names` rows, are formatted from the type
+    of their value.
+    """
+    metadata = metadata_for(cls)
+    formatters = metadata.formatters if metadata is not None else {}
+    return tuple(
+        (attrgetter(field), formatters[field]) if field in formatters
+        else (_accessor(field), format_value)
+        for field in fields
+    )
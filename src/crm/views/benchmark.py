@@ -0,0 +1,101 @@
+"""
+Rendering microbenchmark of the list view.
+
+    python -m src.crm.views.benchmark [rows]
+
+Formats transient Event instances (no database involved) with the
+per-cell formatter the views used before the formatter plans, with the
+generic per-value formatter and with a compiled formatter plan, then
+times a whole list rendering written to the null device.
+"""
+import os
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+from src.crm.models import Event
+from src.crm.registry import formatter_plan
+from src.crm.views import views
+from src.crm.views.formatters import format_row, format_value
+
+FIELDS = (
+    "id", "title", "contract_id", "support_contact_id", "start_date",
+    "end_date", "participant_count", "full_address", "notes", "created_at",
+)
+
+
+# Date fields known to the per-cell formatter, matched as substrings of
+# every field name
+_LEGACY_DATE_FIELDS = [
+    "created_at", "updated_at", "last_login",
+    "first_contact_date", "last_contact_date",
+    "start_date", "end_date"
+]
+
+
+def legacy_format_field_value(obj, field):
+    """MainView._format_field_value() as it was before the plans."""
+    value = getattr(obj, field, "")
+
+    if any(datefield in field for datefield in _LEGACY_DATE_FIELDS):
+        if isinstance(value, datetime):
+            return value.strftime("%d/%m/%Y - %H:%M")
+
+    if field in ["is_signed", "is_fully_paid", "is_active"]:
+        return "Yes" if value else "No"
+
+    return str(value) if value is not None else ""
+
+
+def make_events(count: int) -> list[Event]:
+    start = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    return [
+        Event(id=index, title=f"Event {index}", contract_id=index // 3,
+              support_contact_id=index % 7 or None,
+              start_date=start + timedelta(hours=index),
+              end_date=start + timedelta(hours=index + 4),
+              participant_count=index % 300,
+              full_address=f"{index} rue de la Paix, Paris",
+              notes=None, created_at=start)
+        for index in range(count)
+    ]
+
+
+def _timed(label: str, count: int, func) -> None:
+    started = time.perf_counter()
+    func()
+    seconds = time.perf_counter() - started
+    print(f"{label:<28} {seconds:8.3f} s  {count / seconds:>12,.0f} rows/s")
+
+
+def run(count: int = 100_000) -> None:
+    events = make_events(count)
+    cells = count * len(FIELDS)
+    print(f"{count:,} rows x {len(FIELDS)} fields ({cells:,} cells)")
+
+    _timed("per-cell formatter (before)", count, lambda: [
+        [legacy_format_field_value(event, field) for field in FIELDS]
+        for event in events
+    ])
+    _timed("generic formatter", count, lambda: [
+        [format_value(getattr(event, field, None)) for field in FIELDS]
+        for event in events
+    ])
+
+    def planned():
+        plan = formatter_plan(Event, FIELDS)
+        return [format_row(plan, event) for event in events]
+    _timed("formatter plan", count, planned)
+
+    with open(os.devnull, "w") as devnull:
+        stdout, views.console.file = views.console.file, devnull
+        try:
+            _timed("list rendering", count, lambda: views.view._display_list(
+                events, list(FIELDS), title="EVENTS"
+            ))
+        finally:
+            views.console.file = stdout
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -0,0 +1,48 @@
+"""
+Cell formatters of the list and detail views.
+
+The registry compiles a formatter plan once per (class, fields) pair
+(see src.crm.registry.formatter_plan): for each field, an accessor and
+one of these formatters, chosen from the type of the mapped column.
+Rendering a cell is then two plain calls instead of name matching and
+type checks per cell.
+"""
+from collections.abc import Callable
+from datetime import datetime
+
+# Same output as strftime("%d/%m/%Y - %H:%M"), about three times faster
+DATE_FORMAT = "%02d/%02d/%d - %02d:%02d"
+
+FormatterPlan = tuple[tuple[Callable, Callable[..., str]], ...]
+
+
+def format_datetime(value) -> str:
+    if value is None:
+        return ""
+    if not isinstance(value, datetime):
+        # e.g. a string or a date set on a transient instance
+        return str(value)
+    return DATE_FORMAT % (value.day, value.month, value.year,
+                          value.hour, value.minute)
+
+
+def format_boolean(value) -> str:
+    return "Yes" if value else "No"
+
+
+def format_text(value) -> str:
+    return str(value) if value is not None else ""
+
+
+def format_value(value) -> str:
+    """Formatter of the values whose column type is unknown."""
+    if isinstance(value, bool):
+        return format_boolean(value)
+    if isinstance(value, datetime):
+        return format_datetime(value)
+    return format_text(value)
+
+
+def format_row(plan: FormatterPlan, obj) -> list[str]:
+    """The formatted cells of an object, following a plan."""
+    return [formatter(get(obj)) for get, formatter in plan]
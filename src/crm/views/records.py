@@ -0,0 +1,87 @@
+"""
+Machine-readable output of the views: one record per line on stdout.
+
+Used instead of the Rich tables when the global --output option is
+given. Rows are serialized as they come, without any console, panel or
+logo; messages go to stderr so that stdout only holds data.
+"""
+import csv
+import json
+import sys
+from collections.abc import Iterable, Mapping
+from datetime import date, datetime
+from decimal import Decimal
+
+OUTPUT_FORMATS = ("json", "csv", "tsv")
+
+
+def _json_default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    return str(value)
+
+
+def _text(value) -> str:
+    """A value as written in a CSV or TSV cell."""
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return str(value)
+
+
+class RecordWriter:
+    """Serialize rows as JSON Lines, CSV or TSV."""
+
+    def __init__(self, fmt: str, stream=None):
+        if fmt not in OUTPUT_FORMATS:
+            raise ValueError(
+                f"Unknown output format {fmt!r}. "
+                f"Available formats: {', '.join(OUTPUT_FORMATS)}"
+            )
+        self.fmt = fmt
+        self.stream = stream or sys.stdout
+
+    def write_rows(self, rows: Iterable, fields: list[str]) -> int:
+        """
+        Write the given fields of each row (object attributes or mapping
+        keys), preceded by a header line in CSV and TSV. Returns the
+        number of rows written.
+        """
+        count = 0
+        if self.fmt == "json":
+            dumps = json.JSONEncoder(default=_json_default,
+                                     ensure_ascii=False,
+                                     separators=(",", ":")).encode
+            for row in rows:
+                record = {field: _value(row, field) for field in fields}
+                self.stream.write(dumps(record) + "\n")
+                count += 1
+            return count
+
+        writer = csv.writer(self.stream,
+                            delimiter="," if self.fmt == "csv" else "\t",
+                            lineterminator="\n")
+        writer.writerow(fields)
+        for row in rows:
+            writer.writerow([_text(_value(row, field)) for field in fields])
+            count += 1
+        return count
+
+    def write_mapping(self, record: Mapping) -> None:
+        """Write a single record, e.g. a report."""
+        self.write_rows([record], list(record))
+
+    def message(self, message) -> None:
+        """Informational and error messages, kept out of stdout."""
+        print(message, file=sys.stderr)
+
+
+def _value(row, field: str):
+    if isinstance(row, Mapping):
+        return row.get(field)
+    return getattr(row, field, None)
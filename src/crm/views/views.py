@@ -1,14 +1,22 @@
-from datetime import datetime
+import sys
+from functools import lru_cache
+from itertools import chain, islice
+from pathlib import Path
 
 from rich import box
 from rich.align import Align
 from rich.console import Console
 from rich.panel import Panel
+from rich.segment import Segment
 from rich.style import Style
 from rich.table import Table
 from rich.text import Text
+from rich.tree import Tree
 
-from src.crm.views.config import epic_style, logo_style, white_style
+from src.crm.views.config import dim_style, epic_style, logo_style, white_style
+from src.crm.registry import formatter_plan, registry
+from src.crm.views.formatters import format_row
+from src.crm.views.records import RecordWriter
 
 #########################################################
 #                   Console
@@ -18,14 +26,63 @@ console = Console()
 clear = console.clear
 print = console.print
 
+LOGO_PATH = Path(__file__).with_name("logo.txt")
+
 
 def clear_console(func):
     def wrapper(*args, **kwargs):
-        console.clear()
+        # Scripted runs keep what was printed before
+        if not view.plain:
+            console.clear()
         return func(*args, **kwargs)
     return wrapper
 
 
+@lru_cache(maxsize=1)
+def logo_text() -> Text:
+    """The styled logo, read from disk and stylized once per process."""
+    try:
+        raw_logo = LOGO_PATH.read_text(encoding="utf-8")
+    except FileNotFoundError:
+        raw_logo = "EPIC EVENTS CRM"
+
+    logo = Text(raw_logo, no_wrap=True)
+    logo.stylize(epic_style, 0, 145)
+    logo.stylize(logo_style, 145, 147)
+    logo.stylize(epic_style, 147, 176)
+    logo.stylize(logo_style, 176, 191)
+    logo.stylize(epic_style, 191, 194)
+    logo.stylize(logo_style, 194, 221)
+    logo.stylize(epic_style, 222, 225)
+    logo.stylize(logo_style, 226, -1)
+    return logo
+
+
+class _StyledLines:
+    """
+    Preformatted lines rendered as one styled Segment each.
+
+    Yielding the segments directly skips the layout print() gives a
+    Text (splitting, measuring and wrapping every line), which is most
+    of the cost of a long list.
+    """
+
+    def __init__(self, lines, style: Style):
+        self.lines = lines
+        self.style = style
+
+    def __rich_console__(self, console, options):
+        newline = Segment.line()
+        for line in self.lines:
+            yield Segment(line, self.style)
+            yield newline
+
+
+def write_lines(lines, style: Style) -> None:
+    """Print preformatted lines, without wrapping nor cropping them."""
+    console.print(_StyledLines(lines, style), crop=False, end="")
+
+
 #########################################################
 #                   Layout tools
 #########################################################
@@ -79,48 +136,41 @@ def prompt(content, style="bold grey100",
 class MainView:
     """The MainView class is used to display the main view of the application."""
 
+    # Set by the global --output option: rows are then written as
+    # JSON Lines, CSV or TSV and Rich is not used at all
+    records: RecordWriter | None = None
+
+    # Rows printed at once when the list is not paged
+    LIST_CHUNK_SIZE = 200
+    # Lines of the terminal kept for the header and the pager prompt
+    PAGER_MARGIN = 8
+    # Longer values are cut in streamed lists
+    MAX_COLUMN_WIDTH = 40
+
+    # Without a terminal (or with --plain) the screen is never cleared
+    # and messages are printed without the logo and panels
+    plain: bool = not console.is_terminal
+
+    def use_records(self, fmt: str):
+        """
+        Switch to the machine-readable output. The mode is set on the
+        class, so that the views built by other modules follow it.
+        """
+        MainView.records = RecordWriter(fmt)
+        MainView.plain = True
+
+    def use_plain(self):
+        """Switch to the non-interactive output, for every view."""
+        MainView.plain = True
+
     #########################################################
     #                   Entity Field Definitions
     #########################################################
 
     ENTITY_FIELDS = {
-        "user": {
-            "list": ["id", "username", "role_id"],
-            "details": [
-                "id", "username", "full_name", "email", "role_id",
-                "is_active", "created_at", "updated_at", "last_login"
-            ]
-        },
-        "client": {
-            "list": ["id", "full_name", "commercial_id"],
-            "details": [
-                "id", "full_name", "email", "phone", "company_id",
-                "commercial_id", "first_contact_date", "last_contact_date"
-            ]
-        },
-        "contract": {
-            "list": [
-                "id", "client_id", "commercial_id", "total_amount",
-                "is_signed", "is_fully_paid"
-            ],
-            "details": [
-                "id", "client_id", "commercial_id", "total_amount",
-                "remaining_amount", "is_signed", "is_fully_paid",
-                "created_at", "updated_at"
-            ]
-        },
-        "event": {
-            "list": ["id", "title", "start_date", "support_contact_id"],
-            "details": [
-                "id", "title", "contract_id", "support_contact_id",
-                "start_date", "end_date", "participant_count",
-                "full_address", "notes"
-            ]
-        },
-        "company": {
-            "list": ["id", "name"],
-            "details": ["id", "name", "created_at"]
-        }
+        name: {"list": list(metadata.list_fields),
+               "details": list(metadata.detail_fields)}
+        for name, metadata in registry.items()
     }
 
     #########################################################
@@ -129,6 +179,12 @@ class MainView:
 
     @clear_console
     def display_message(self, message, style=epic_style, press_enter=False):
+        if self.records:
+            self.records.message(message)
+            return
+        if self.plain:
+            print(Text(message, style=style))
+            return
         self.display_logo(press_enter=False, centered=True)
         print(Panel.fit(
             Text(message, style=style, justify="center"),
@@ -170,6 +226,12 @@ class MainView:
             f"<{obj.__class__.__name__} #{obj.id}>? (yes/no): "
         )
 
+    def sure_to_bulk_delete(self, entity_name: str, count: int):
+        return console.input(
+            f"Are you sure you want to delete {count} {entity_name}(s)? "
+            f"(yes/no): "
+        )
+
     #########################################################
     #                   Input Methods
     #########################################################
@@ -316,28 +378,18 @@ class MainView:
             name = obj.__class__.__name__
         return name
 
-    def _format_field_value(self, obj, field):
-        """Format a field value for display."""
-        value = getattr(obj, field, "")
-
-        # Handle datetime fields
-        if any(datefield in field for datefield in [
-            "created_at", "updated_at", "last_login",
-            "first_contact_date", "last_contact_date",
-            "start_date", "end_date"
-        ]):
-            if isinstance(value, datetime):
-                return value.strftime("%d/%m/%Y - %H:%M")
-
-        # Handle special cases
-        if field in ["is_signed", "is_fully_paid", "is_active"]:
-            return "Yes" if value else "No"
-
-        return str(value) if value is not None else ""
-
     def _display_details(self, obj, fields=None, title=None):
         """Generic method to display object details."""
+        if self.records:
+            fields = fields or [key for key in obj.__dict__
+                                if not key.startswith("_")]
+            self.records.write_rows([obj], fields)
+            return
         display_name = title or self._get_entity_display_name(obj)
+        if not fields:
+            # Display all non-private attributes
+            fields = [key for key in obj.__dict__ if not key.startswith("_")]
+        values = format_row(formatter_plan(type(obj), tuple(fields)), obj)
 
         table = Table(
             title=Text(display_name.upper(), style=logo_style),
@@ -347,55 +399,99 @@ class MainView:
         table.add_column(style=logo_style)
         table.add_column(style="grey100")
 
-        if fields:
-            for field in fields:
-                formatted_value = self._format_field_value(obj, field)
-                table.add_row(
-                    field.replace("_", " ").capitalize(),
-                    formatted_value
-                )
-        else:
-            # Display all non-private attributes
-            for key, value in obj.__dict__.items():
-                if not key.startswith("_"):
-                    formatted_value = self._format_field_value(obj, key)
-                    table.add_row(
-                        key.replace("_", " ").capitalize(),
-                        formatted_value
-                    )
+        for field, value in zip(fields, values):
+            table.add_row(field.replace("_", " ").capitalize(), value)
 
         print(table, justify="center")
 
-    def _display_list(self, objects, fields, title=None):
-        """Generic method to display a list of objects."""
-        if not objects:
-            print("No items to display")
-            return
-
-        entity_name = title or f"{objects[0].__class__.__name__.upper()}S"
-        print(banner(
-            f"{entity_name} ({len(objects)})",
-            epic_style,
-            "center",
-            "bold gold1"
-        ))
-
-        table = Table(box=box.MINIMAL, show_header=True)
-        for field in fields:
-            table.add_column(
-                header=Text(field.replace("_", " ").title(),
-                            style=epic_style),
-                justify="center"
-            )
-
-        for obj in objects:
-            row_values = []
-            for field in fields:
-                formatted_value = self._format_field_value(obj, field)
-                row_values.append(Text(formatted_value, style=white_style))
-            table.add_row(*row_values)
-
-        print(table, justify="center")
+    def _display_list(self, objects, fields, title=None) -> int:
+        """
+        Generic method to display a list of objects.
+
+        The objects may be any iterable, e.g. a manager stream: rows are
+        printed page by page as they arrive, as lines of fixed-width
+        cells sized on the first page, instead of a Table laid out once
+        every row is known. On a terminal, the next page is only fetched
+        once the user asks for it. Returns the number of rows displayed.
+        """
+        if self.records:
+            return self.records.write_rows(objects, fields)
+        rows = iter(objects)
+        try:
+            first = next(rows, None)
+            if first is None:
+                return 0
+            rows = chain([first], rows)
+
+            entity_name = title or f"{first.__class__.__name__.upper()}S"
+            print(banner(entity_name, epic_style, "center", "bold gold1"))
+
+            headers = [field.replace("_", " ").title() for field in fields]
+            plan = formatter_plan(type(first), tuple(fields))
+            paged = console.is_terminal and sys.stdin.isatty()
+            page_size = (max(console.height - self.PAGER_MARGIN, 5)
+                         if paged else self.LIST_CHUNK_SIZE)
+            widths = None
+            count = 0
+            while True:
+                page = [format_row(plan, obj)
+                        for obj in islice(rows, page_size)]
+                if not page:
+                    break
+                if widths is None:
+                    widths = self._column_widths(headers, page)
+                    # Centers the rows as a block
+                    margin = " " * max(
+                        (console.width - sum(widths)
+                         - 3 * (len(widths) - 1)) // 2, 0
+                    )
+                    write_lines([margin + self._list_line(headers, widths)],
+                                epic_style)
+                    write_lines([margin + "─┼─".join("─" * width
+                                                     for width in widths)],
+                                dim_style)
+                write_lines((margin + self._list_line(values, widths)
+                             for values in page), white_style)
+                count += len(page)
+                if paged and len(page) == page_size:
+                    answer = console.input(
+                        Text(f"-- {count} shown -- ENTER: next page, "
+                             "q: quit ", style="dim white")
+                    )
+                    if answer.strip().lower() == "q":
+                        break
+        finally:
+            # Ends the session of a stream left before its last row
+            close = getattr(objects, "close", None)
+            if close:
+                close()
+
+        print(Text(f"{count} row(s)", style="dim white"), justify="center")
+        return count
+
+    def _column_widths(self, headers, page) -> list[int]:
+        """
+        Widths of the columns of a list, from its headers and first page,
+        narrowed until a row fits in the console.
+        """
+        widths = [
+            min(max(len(header), *(len(row[position]) for row in page)),
+                self.MAX_COLUMN_WIDTH)
+            for position, header in enumerate(headers)
+        ]
+        available = console.width - 3 * (len(widths) - 1) - 2
+        while sum(widths) > available and max(widths) > 3:
+            widths[widths.index(max(widths))] -= 1
+        return widths
+
+    @staticmethod
+    def _list_line(values, widths) -> str:
+        """One row of a list: values centered in fixed-width cells."""
+        return " │ ".join(
+            (value if len(value) <= width else value[:width - 1] + "…")
+            .center(width)
+            for value, width in zip(values, widths)
+        )
 
     #########################################################
     #                   Public Display Methods
@@ -405,8 +501,9 @@ class MainView:
     @clear_console
     def display_users(self, users):
         """Display a list of users."""
-        self._display_list(users, self.ENTITY_FIELDS["user"]["list"],
-                           "USERS")
+        return self._display_list(users,
+                                  self.ENTITY_FIELDS["user"]["list"],
+                                  "USERS")
 
     @clear_console
     def display_user(self, user):
@@ -417,8 +514,9 @@ class MainView:
     @clear_console
     def display_clients(self, clients):
         """Display a list of clients."""
-        self._display_list(clients, self.ENTITY_FIELDS["client"]["list"],
-                           "CLIENTS")
+        return self._display_list(clients,
+                                  self.ENTITY_FIELDS["client"]["list"],
+                                  "CLIENTS")
 
     @clear_console
     def display_client_details(self, client):
@@ -438,8 +536,9 @@ class MainView:
     @clear_console
     def display_contracts(self, contracts):
         """Display a list of contracts."""
-        self._display_list(contracts, self.ENTITY_FIELDS["contract"]["list"],
-                           "CONTRACTS")
+        return self._display_list(contracts,
+                                  self.ENTITY_FIELDS["contract"]["list"],
+                                  "CONTRACTS")
 
     @clear_console
     def display_contract(self, contract):
@@ -450,8 +549,9 @@ class MainView:
     @clear_console
     def display_events(self, events):
         """Display a list of events."""
-        self._display_list(events, self.ENTITY_FIELDS["event"]["list"],
-                           "EVENTS")
+        return self._display_list(events,
+                                  self.ENTITY_FIELDS["event"]["list"],
+                                  "EVENTS")
 
     @clear_console
     def display_event(self, event):
@@ -462,8 +562,9 @@ class MainView:
     @clear_console
     def display_companies(self, companies):
         """Display a list of companies."""
-        self._display_list(companies, self.ENTITY_FIELDS["company"]["list"],
-                           "COMPANIES")
+        return self._display_list(companies,
+                                  self.ENTITY_FIELDS["company"]["list"],
+                                  "COMPANIES")
 
     @clear_console
     def display_company(self, company):
@@ -477,12 +578,187 @@ class MainView:
         self._display_details(obj, fields)
 
     @clear_console
-    def display_list(self, objects, fields=None):
+    def display_list(self, objects, fields=None, title=None) -> int:
         """Public method to display a list of objects."""
-        if fields is None and objects:
-            entity_type = objects[0].__class__.__name__.lower()
+        if fields is None:
+            objects = iter(objects)
+            first = next(objects, None)
+            if first is None:
+                return 0
+            entity_type = first.__class__.__name__.lower()
             fields = self.ENTITY_FIELDS.get(entity_type, {}).get("list", [])
-        self._display_list(objects, fields)
+            objects = chain([first], objects)
+        return self._display_list(objects, fields, title)
+
+    @clear_console
+    def display_role_counts(self, counts):
+        """Display the number of users per role."""
+        if self.records:
+            self.records.write_rows(
+                ({"role": role_name, "users": count}
+                 for role_name, count in counts),
+                ["role", "users"],
+            )
+            return
+        table = Table(box=box.MINIMAL, show_header=True)
+        for header in ("Role", "Users"):
+            table.add_column(header=Text(header, style=epic_style),
+                             justify="center")
+        for role_name, count in counts:
+            table.add_row(Text(role_name.capitalize(), style=white_style),
+                          Text(str(count), style=white_style))
+        table.add_row(Text("Total", style=epic_style),
+                      Text(str(sum(count for _, count in counts)),
+                           style=epic_style))
+
+        print(banner("HEADCOUNT", epic_style, "center", "bold gold1"))
+        print(table, justify="center")
+
+    @clear_console
+    def display_import_report(self, entity: str, report: dict):
+        """Display the counters and the throughput of an import."""
+        if self.records:
+            self.records.write_mapping(report)
+            return
+        table = Table(box=box.MINIMAL, show_header=True)
+        for header in ("Rows", "Count"):
+            table.add_column(header=Text(header, style=epic_style),
+                             justify="center")
+        for label, key in (("Read", "rows"),
+                           ("Inserted", "inserted"),
+                           ("Updated", "updated"),
+                           ("Already existing", "skipped"),
+                           ("Rejected", "rejected")):
+            table.add_row(Text(label, style=white_style),
+                          Text(str(report[key]), style=white_style))
+        table.add_row(
+            Text("Throughput", style=epic_style),
+            Text(f"{report['rows_per_second']:,.0f} rows/s "
+                 f"({report['seconds']:.2f} s)", style=epic_style),
+        )
+
+        print(banner(f"{entity.upper()} IMPORT", epic_style,
+                     "center", "bold gold1"))
+        print(table, justify="center")
+        if report["reject_path"]:
+            self.wrong_message(
+                f"{report['rejected']} rejected row(s) written to "
+                f"{report['reject_path']}"
+            )
+
+    def display_export_report(self, entity: str, report: dict):
+        """Display the size and the throughput of an export."""
+        if self.records:
+            self.records.write_mapping(report)
+            return
+        table = Table(box=box.MINIMAL, show_header=False)
+        table.add_column(justify="right")
+        table.add_column(justify="left")
+        for label, value in (
+            ("File", str(report["path"])),
+            ("Rows", f"{report['rows']:,}"),
+            ("Size", f"{report['bytes'] / 1024:,.1f} KiB"),
+        ):
+            table.add_row(Text(label, style=white_style),
+                          Text(value, style=white_style))
+        table.add_row(
+            Text("Throughput", style=epic_style),
+            Text(f"{report['rows_per_second']:,.0f} rows/s "
+                 f"({report['seconds']:.2f} s)", style=epic_style),
+        )
+
+        print(banner(f"{entity.upper()} EXPORT", epic_style,
+                     "center", "bold gold1"))
+        print(table, justify="center")
+
+    def _plan_node_label(self, node) -> Text:
+        """One line summary of an EXPLAIN JSON plan node."""
+        label = Text(node["Node Type"], style=logo_style)
+        relation = node.get("Relation Name")
+        if relation:
+            label.append(f" on {relation}", style=white_style)
+        index = node.get("Index Name")
+        if index:
+            label.append(f" using {index}", style=white_style)
+        label.append(
+            f"  cost={node['Startup Cost']:.2f}..{node['Total Cost']:.2f}"
+            f" rows={node['Plan Rows']}",
+            style="grey70"
+        )
+        if "Actual Total Time" in node:
+            label.append(
+                f"  actual={node['Actual Startup Time']:.3f}.."
+                f"{node['Actual Total Time']:.3f} ms"
+                f" rows={node['Actual Rows']} loops={node['Actual Loops']}",
+                style="bold gold1"
+            )
+        if "Shared Hit Blocks" in node:
+            label.append(
+                f"  buffers hit={node['Shared Hit Blocks']}"
+                f" read={node['Shared Read Blocks']}",
+                style="grey70"
+            )
+        return label
+
+    def _plan_tree(self, node, tree=None) -> Tree:
+        """Build a Rich tree mirroring the plan node hierarchy."""
+        label = self._plan_node_label(node)
+        branch = Tree(label) if tree is None else tree.add(label)
+        for child in node.get("Plans", []):
+            self._plan_tree(child, branch)
+        return branch
+
+    def display_query_plans(self, queries):
+        """Display the plans of the statements captured by --explain."""
+        if not queries:
+            print(Text("No SQL query was issued.", style=white_style),
+                  justify="center")
+            return
+
+        print(banner(f"QUERY PLANS ({len(queries)})",
+                     epic_style, "center", "bold gold1"))
+        for position, query in enumerate(queries, 1):
+            timings = f"client {query['elapsed'] * 1000:.2f} ms"
+            if query["planning_time"] is not None:
+                timings += f" | planning {query['planning_time']:.3f} ms"
+            if query["execution_time"] is not None:
+                timings += f" | execution {query['execution_time']:.3f} ms"
+
+            print(Panel(
+                Text(query["statement"], style="grey100"),
+                title=Text(f"#{position}", style=epic_style),
+                subtitle=Text(timings, style="bold gold1"),
+                border_style="dim white",
+            ))
+            print(self._plan_tree(query["plan"]))
+            print("\n")
+
+    def display_cache_stats(self, stats):
+        """Display the hit rates of the normalization caches."""
+        stats = [entry for entry in stats if entry["lookups"]]
+        if not stats:
+            return
+        if self.records:
+            self.records.write_rows(
+                stats, ["name", "lookups", "hits", "size", "hit_rate"]
+            )
+            return
+        table = Table(box=box.MINIMAL, show_header=True)
+        for header in ("Cache", "Lookups", "Hits", "Entries", "Hit rate"):
+            table.add_column(header=Text(header, style=epic_style),
+                             justify="center")
+        for entry in stats:
+            table.add_row(
+                Text(entry["name"], style=white_style),
+                Text(f"{entry['lookups']:,}", style=white_style),
+                Text(f"{entry['hits']:,}", style=white_style),
+                Text(f"{entry['size']:,}", style=white_style),
+                Text(f"{entry['hit_rate']:.1%}", style="bold gold1"),
+            )
+
+        print(banner("NORMALIZATION CACHES", epic_style, "center",
+                     "bold gold1"))
+        print(table, justify="center")
 
     #########################################################
     #                   Login and Logo
@@ -491,6 +767,9 @@ class MainView:
     @clear_console
     def display_login(self, access_token, refresh_token, refresh_exp):
         """Display login success without showing sensitive tokens."""
+        # The success message printed before it is enough
+        if self.plain:
+            return
         self.display_logo(press_enter=False, centered=True)
         print(
             banner(
@@ -506,21 +785,9 @@ class MainView:
 
     @clear_console
     def display_logo(self, press_enter: bool = True, centered: bool = True):
-        try:
-            with open("src/crm/views/logo.txt") as file:
-                logo_text = file.read()
-        except FileNotFoundError:
-            logo_text = "EPIC EVENTS CRM"
-
-        logo = Text(logo_text)
-        logo.stylize(epic_style, 0, 145)
-        logo.stylize(logo_style, 145, 147)
-        logo.stylize(epic_style, 147, 176)
-        logo.stylize(logo_style, 176, 191)
-        logo.stylize(epic_style, 191, 194)
-        logo.stylize(logo_style, 194, 221)
-        logo.stylize(epic_style, 222, 225)
-        logo.stylize(logo_style, 226, -1)
+        if self.plain:
+            return
+        logo = logo_text()
 
         press_enter_panel = Panel.fit(
             Text("Press ENTER", style=epic_style, justify="center"),
@@ -40,6 +40,9 @@ metadata = MetaData(schema="epic_events")
 
 class Base(DeclarativeBase):
     metadata = metadata
+    # Server generated values (ids, created_at, updated_at) come back with
+    # INSERT/UPDATE ... RETURNING during the flush instead of a later SELECT
+    __mapper_args__ = {"eager_defaults": True}
 
 engine = create_engine(_build_url(), echo=False, pool_pre_ping=True)
 Session = sessionmaker(bind=engine, autoflush=False, autocommit=False, expire_on_commit=False)
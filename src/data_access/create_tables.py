@@ -8,6 +8,8 @@ from src.auth.permissions import (
 )
 from src.crm.models import PermissionModel, Role
 from src.data_access.config import Session, engine, metadata
+from src.data_access.row_security import install_row_security
+from src.data_access.visibility import rebuild_visibility
 
 
 def _ensure_permission(session: Session, name: str) -> PermissionModel:
@@ -79,17 +81,21 @@ def _ensure_schema_exists() -> None:
 
 def init_db() -> None:
     """
-    Ensure the database schema exists and seed roles.
+    Ensure the database schema exists, install the row-level security
+    policies, seed roles and rebuild the support visibility table.
 
     Always creates any missing tables (idempotent), even if data already exists.
     """
     # Ensure all tables defined on metadata exist, without altering existing ones.
     _ensure_schema_exists()
     metadata.create_all(engine)
+    with engine.begin() as conn:
+        install_row_security(conn)
 
     with Session() as session:
         try:
             _seed_roles(session)
+            rebuild_visibility(session)
             session.commit()
         except Exception as e:
             sentry_sdk.capture_exception(e)
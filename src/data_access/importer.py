@@ -0,0 +1,591 @@
+"""
+Bulk import of companies, clients, contracts and events from CSV or
+JSON Lines files.
+
+The file is streamed with COPY into a staging table whose columns are
+all text. A handful of set-based UPDATE statements then normalize the
+values and flag every invalid row with the first rule it breaks, and the
+remaining rows are merged into the real table with a single
+INSERT ... SELECT ... ON CONFLICT. Nothing goes through the ORM, so the
+cost per row stays close to the one of COPY itself.
+
+The staging table is a temporary table: like an UNLOGGED table it is
+never written to the WAL, and it is private to the session and dropped
+with the transaction, so concurrent imports cannot collide.
+
+Rejected rows are written to a reject file (same format as the source)
+holding their row number, the reason of the rejection and their
+normalized values. The whole import runs in one transaction: either
+every valid row is merged or none is.
+"""
+import csv
+import io
+import json
+import time
+from pathlib import Path
+
+import psycopg
+from sqlalchemy import Boolean, DateTime, Integer, Numeric, String, text
+
+from src.auth.permissions import UserRoles
+from src.crm.controllers.dates import database_zone
+from src.crm.models import Client, Company, Contract, Event
+from src.data_access.config import Session, metadata
+from src.data_access.row_security import enforced_by_policy
+from src.data_access.visibility import refresh_visibility
+
+SCHEMA = metadata.schema
+
+# Raw text values of the file, then the typed values of the rows that
+# passed the type checks
+STAGE = "import_stage"
+ROWS = "import_rows"
+
+# Bytes sent per COPY write when streaming a CSV file
+CHUNK_SIZE = 64 * 1024
+
+TRUE_VALUES = ("true", "t", "1", "yes", "y")
+FALSE_VALUES = ("false", "f", "0", "no", "n")
+
+# Columns filled by the import itself, never read from the file
+_MANAGED_COLUMNS = {"id", "commercial_id", "created_at", "updated_at"}
+
+# Natural keys accepted in place of a foreign key id:
+# staged column -> (id column, referenced table, key column)
+_LOOKUPS = {
+    "client": {"company_name": ("company_id", "company", "name")},
+    "contract": {"client_email": ("client_id", "client", "email")},
+    "event": {"support_username": ("support_contact_id", "users", "username")},
+}
+# Staged columns compared in lower case
+_LOWER_CASE = {"email", "client_email", "support_username"}
+
+MODELS = {
+    "company": Company,
+    "client": Client,
+    "contract": Contract,
+    "event": Event,
+}
+
+# Converts a staged date to timestamptz, NULL when it is not valid.
+# PostgreSQL 16 checks the input without raising; older servers pay for
+# an exception block, i.e. a subtransaction, per value.
+_TIMESTAMP_FUNCTION = """
+CREATE OR REPLACE FUNCTION pg_temp.import_timestamp(value text)
+RETURNS timestamptz LANGUAGE sql STABLE AS $$
+    SELECT CASE WHEN pg_input_is_valid(value, 'timestamptz')
+                THEN value::timestamptz END
+$$
+"""
+_TIMESTAMP_FUNCTION_PRE_16 = """
+CREATE OR REPLACE FUNCTION pg_temp.import_timestamp(value text)
+RETURNS timestamptz LANGUAGE plpgsql STABLE AS $$
+BEGIN
+    RETURN value::timestamptz;
+EXCEPTION WHEN data_exception THEN
+    RETURN NULL;
+END
+$$
+"""
+
+
+def importable_columns(entity: str) -> list[str]:
+    """Columns an import file of the entity may hold."""
+    model = MODELS[entity]
+    columns = [column.key for column in model.__table__.c
+               if column.key not in _MANAGED_COLUMNS]
+    return columns + list(_LOOKUPS.get(entity, {}))
+
+
+def _model_column(entity: str, name: str):
+    return MODELS[entity].__table__.c.get(name)
+
+
+def _cast(entity: str, name: str, alias: str = "s") -> str:
+    """SQL converting a staged text value to the type of its column."""
+    column = _model_column(entity, name)
+    value = f"{alias}.{name}"
+    if isinstance(column.type, Boolean):
+        return (f"CASE WHEN {value} IN {TRUE_VALUES} THEN true "
+                f"WHEN {value} IN {FALSE_VALUES} THEN false END")
+    if isinstance(column.type, DateTime):
+        return f"pg_temp.import_timestamp({value})"
+    if isinstance(column.type, Integer):
+        return f"{value}::integer"
+    if isinstance(column.type, Numeric):
+        return f"{value}::numeric"
+    return value
+
+
+def _normalize_statements(entity: str) -> list[str]:
+    """Trim every value, turn blanks into NULL and fold the case."""
+    assignments = []
+    for name in importable_columns(entity):
+        value = f"nullif(btrim({name}), '')"
+        column = _model_column(entity, name)
+        column_type = column.type if column is not None else None
+        if name in _LOWER_CASE or isinstance(column_type, Boolean):
+            value = f"lower({value})"
+        elif isinstance(column_type, DateTime):
+            # DD/MM/YYYY [HH:MI[:SS]] is the format of the CLI prompts
+            value = (f"regexp_replace({value}, "
+                     "'^(\\d{1,2})[/-](\\d{1,2})[/-](\\d{4})', "
+                     "'\\3-\\2-\\1')")
+        assignments.append(f"{name} = {value}")
+    statements = [f"UPDATE {STAGE} SET {', '.join(assignments)}"]
+
+    if entity == "client":
+        # Same rules as DataService.normalized_phone: 00 and the French
+        # mobile prefixes become international numbers
+        statements.append(f"""
+            UPDATE {STAGE} SET phone = CASE
+                WHEN left(phone, 1) = '+' THEN phone
+                WHEN left(phone, 2) = '00' THEN '+' || substr(phone, 3)
+                WHEN phone ~ '^0[67]' THEN '+33' || substr(phone, 2)
+                ELSE '+' || phone
+            END
+            WHERE phone IS NOT NULL
+        """)
+        statements.append(
+            f"UPDATE {STAGE} SET phone = regexp_replace(phone, '[ .()-]', "
+            "'', 'g') WHERE phone IS NOT NULL"
+        )
+
+    for lookup, (target, table, key) in _LOOKUPS.get(entity, {}).items():
+        statements.append(
+            f"UPDATE {STAGE} s SET {target} = t.id::text "
+            f"FROM {SCHEMA}.{table} t "
+            f"WHERE t.{key} = s.{lookup} AND s.{target} IS NULL"
+        )
+    return statements
+
+
+def _type_rules(entity: str) -> list[tuple[str, str]]:
+    """(condition, message) pairs derived from the model columns."""
+    rules = []
+    for lookup, (target, _, _) in _LOOKUPS.get(entity, {}).items():
+        rules.append((f"s.{lookup} IS NOT NULL AND s.{target} IS NULL",
+                      f"unknown {lookup}"))
+
+    for name in importable_columns(entity):
+        column = _model_column(entity, name)
+        if column is None:
+            continue
+        value = f"s.{name}"
+        if not column.nullable and column.server_default is None:
+            rules.append((f"{value} IS NULL", f"{name} is required"))
+        if isinstance(column.type, Boolean):
+            rules.append((
+                f"{value} NOT IN {TRUE_VALUES + FALSE_VALUES}",
+                f"{name} must be a boolean value",
+            ))
+        elif isinstance(column.type, DateTime):
+            rules.append((f"{value} IS NOT NULL "
+                          f"AND pg_temp.import_timestamp({value}) IS NULL",
+                          f"{name} is not a valid date"))
+        elif isinstance(column.type, Integer):
+            rules.append((f"{value} !~ '^-?\\d{{1,9}}$'",
+                          f"{name} must be an integer"))
+        elif isinstance(column.type, Numeric):
+            digits = column.type.precision - column.type.scale
+            rules.append((
+                f"{value} !~ '^-?\\d{{1,{digits}}}(\\.\\d{{1,"
+                f"{column.type.scale}}})?$'",
+                f"{name} must be an amount with at most "
+                f"{column.type.scale} decimals",
+            ))
+        elif isinstance(column.type, String) and column.type.length:
+            rules.append((f"length({value}) > {column.type.length}",
+                          f"{name} is longer than {column.type.length} "
+                          "characters"))
+    return rules
+
+
+def _typed_rows_statement(entity: str) -> str:
+    """
+    Copy the rows passing the type checks to a table of typed columns,
+    so the business rules compare with the real tables without casts
+    and can be planned as hash semi-joins.
+    """
+    values = []
+    for name in importable_columns(entity):
+        column = _model_column(entity, name)
+        if column is None:
+            continue
+        value = _cast(entity, name)
+        if column.server_default is not None:
+            value = f"coalesce({value}, {column.server_default.arg})"
+        values.append(f"{value} AS {name}")
+    return (f"CREATE TEMP TABLE {ROWS} ON COMMIT DROP AS "
+            f"SELECT s._row, NULL::text AS _error, {', '.join(values)} "
+            f"FROM {STAGE} s WHERE s._error IS NULL")
+
+
+def _entity_rules(entity: str, user_role: str) -> list[tuple[str, str]]:
+    """
+    Business rules of the managers, as conditions on the typed rows.
+    The id of the importing user is bound as :user_id.
+    """
+    commercial = user_role == UserRoles.COMMERCIAL
+    match entity:
+        case "company":
+            return []
+        case "client":
+            return [
+                ("s.email !~ '^[^@\\s]+@[^@\\s]+\\.[^@\\s]+$'",
+                 "email is not a valid address"),
+                ("s.phone !~ '^\\+\\d{8,15}$'",
+                 "phone is not a valid number"),
+                (f"s.company_id IS NOT NULL AND NOT EXISTS (SELECT 1 FROM "
+                 f"{SCHEMA}.company c WHERE c.id = s.company_id)",
+                 "company not found"),
+                (f"EXISTS (SELECT 1 FROM {SCHEMA}.users u "
+                 "WHERE u.email = s.email)",
+                 "email already used by a user"),
+                (f"EXISTS (SELECT 1 FROM {SCHEMA}.client c "
+                 "WHERE c.email = s.email AND c.commercial_id <> :user_id)",
+                 "email already used by a client of another commercial"),
+                (f"EXISTS (SELECT 1 FROM {SCHEMA}.client c "
+                 "WHERE c.phone = s.phone AND c.email <> s.email)",
+                 "phone already used by another client"),
+                (_duplicate("email"), "email duplicated in the file"),
+                (_duplicate("phone"), "phone duplicated in the file"),
+            ]
+        case "contract":
+            rules = [
+                (f"NOT EXISTS (SELECT 1 FROM {SCHEMA}.client c "
+                 "WHERE c.id = s.client_id)",
+                 "client not found"),
+                ("s.total_amount < 0",
+                 "total_amount must not be negative"),
+                ("s.remaining_amount < 0",
+                 "remaining_amount must not be negative"),
+                ("s.remaining_amount > s.total_amount",
+                 "remaining_amount must not exceed total_amount"),
+            ]
+            if commercial:
+                rules.append((
+                    f"NOT EXISTS (SELECT 1 FROM {SCHEMA}.client c "
+                    "WHERE c.id = s.client_id "
+                    "AND c.commercial_id = :user_id)",
+                    "you can only create contracts for your own clients",
+                ))
+            return rules
+        case "event":
+            rules = [
+                (f"NOT EXISTS (SELECT 1 FROM {SCHEMA}.contract ct "
+                 "WHERE ct.id = s.contract_id)",
+                 "contract not found"),
+                (f"NOT EXISTS (SELECT 1 FROM {SCHEMA}.contract ct "
+                 "WHERE ct.id = s.contract_id AND ct.is_signed)",
+                 "cannot create an event for an unsigned contract"),
+                (f"s.support_contact_id IS NOT NULL AND NOT EXISTS ("
+                 f"SELECT 1 FROM {SCHEMA}.users u JOIN {SCHEMA}.role r "
+                 "ON r.id = u.role_id "
+                 "WHERE u.id = s.support_contact_id "
+                 f"AND r.name = '{UserRoles.SUPPORT}')",
+                 "support_contact_id is not a support user"),
+                ("s.end_date <= s.start_date",
+                 "end_date must be after start_date"),
+                ("s.participant_count < 0",
+                 "participant_count must not be negative"),
+            ]
+            if commercial:
+                rules.append((
+                    f"NOT EXISTS (SELECT 1 FROM {SCHEMA}.contract ct "
+                    f"JOIN {SCHEMA}.client c ON c.id = ct.client_id "
+                    "WHERE ct.id = s.contract_id "
+                    "AND c.commercial_id = :user_id)",
+                    "you can only create events for your own clients' "
+                    "contracts",
+                ))
+            return rules
+    raise ValueError(f"Cannot import {entity}s.")
+
+
+def _duplicate(column: str) -> str:
+    """Rows repeating the value of an earlier row of the file."""
+    return (f"s.{column} IS NOT NULL AND EXISTS (SELECT 1 FROM {ROWS} d "
+            f"WHERE d.{column} = s.{column} AND d._row < s._row "
+            "AND d._error IS NULL)")
+
+
+def _merge_statement(entity: str, user_id: int) -> str:
+    """INSERT ... SELECT of the valid rows, returning (id, inserted)."""
+    model = MODELS[entity]
+    table = f"{SCHEMA}.{model.__tablename__}"
+    columns = [name for name in importable_columns(entity)
+               if _model_column(entity, name) is not None]
+    values = [f"s.{name}" for name in columns]
+    source = f"{ROWS} s"
+
+    match entity:
+        case "client":
+            columns.append("commercial_id")
+            values.append(str(int(user_id)))
+        case "contract":
+            # The commercial of a contract is the one of its client
+            columns.append("commercial_id")
+            values.append("c.commercial_id")
+            source += f" JOIN {SCHEMA}.client c ON c.id = s.client_id"
+
+    statement = (f"INSERT INTO {table} ({', '.join(columns)}) "
+                 f"SELECT {', '.join(values)} FROM {source} "
+                 "WHERE s._error IS NULL ORDER BY s._row")
+    match entity:
+        case "company":
+            statement += " ON CONFLICT (name) DO NOTHING"
+        case "client":
+            # Existing clients of the same commercial are updated, the
+            # optional values only when the file gives one. Unchanged
+            # rows are left alone (and reported as skipped) instead of
+            # writing a new version of each of them.
+            table_name = model.__tablename__
+            names = [name for name in columns
+                     if name not in {"email", "commercial_id"}]
+            current = [f"{table_name}.{name}" for name in names]
+            updates = [
+                f"coalesce(EXCLUDED.{name}, {table_name}.{name})"
+                if _model_column(entity, name).nullable
+                else f"EXCLUDED.{name}"
+                for name in names
+            ]
+            assignments = ", ".join(f"{name} = {value}"
+                                    for name, value in zip(names, updates))
+            statement += (" ON CONFLICT (email) DO UPDATE SET "
+                          f"{assignments}, updated_at = now() "
+                          f"WHERE {table_name}.commercial_id "
+                          "= EXCLUDED.commercial_id "
+                          f"AND ({', '.join(current)}) IS DISTINCT FROM "
+                          f"({', '.join(updates)})")
+    return statement + " RETURNING id, (xmax = 0) AS inserted"
+
+
+def _read_header(source, columns: list[str]) -> list[str]:
+    """Column names of a CSV header line, checked against the entity."""
+    line = source.readline().decode("utf-8-sig")
+    header = [name.strip().lower()
+              for name in next(csv.reader([line]), [])]
+    if not header or not any(header):
+        raise ValueError("The CSV file has no header line.")
+    unknown = [name for name in header if name not in columns]
+    if unknown:
+        raise ValueError(
+            f"Unknown column(s) {', '.join(unknown)}. "
+            f"Available columns: {', '.join(columns)}"
+        )
+    if len(set(header)) != len(header):
+        raise ValueError("The CSV header repeats a column.")
+    return header
+
+
+def _copy_csv(cursor, source, columns: list[str]) -> list[str]:
+    header = _read_header(source, columns)
+    with cursor.copy(f"COPY {STAGE} ({', '.join(header)}) "
+                     "FROM STDIN (FORMAT csv)") as copy:
+        while data := source.read(CHUNK_SIZE):
+            copy.write(data)
+    return header
+
+
+def _copy_jsonl(cursor, source, columns: list[str]) -> list[str]:
+    staged = ["_error", "_raw"] + columns
+    with cursor.copy(f"COPY {STAGE} ({', '.join(staged)}) "
+                     "FROM STDIN") as copy:
+        for line in io.TextIOWrapper(source, encoding="utf-8-sig"):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+                if not isinstance(record, dict):
+                    raise ValueError
+            except ValueError:
+                copy.write_row(["invalid JSON line", line.rstrip("\n")]
+                               + [None] * len(columns))
+                continue
+            unknown = sorted(record.keys() - set(columns))
+            error = (f"unknown field(s) {', '.join(unknown)}"
+                     if unknown else None)
+            copy.write_row([error, None] + [
+                _jsonl_value(record.get(name)) for name in columns
+            ])
+    return columns
+
+
+def _jsonl_value(value) -> str | None:
+    if value is None:
+        return None
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (dict, list)):
+        return json.dumps(value)
+    return str(value)
+
+
+def _write_rejects(cursor, path: Path, fmt: str, columns: list[str]) -> None:
+    """Stream the rejected rows to the reject file with COPY TO."""
+    rejected = f"FROM {STAGE} WHERE _error IS NOT NULL ORDER BY _row"
+    if fmt == "csv":
+        query = (f"COPY (SELECT _row AS row, _error AS error, "
+                 f"{', '.join(columns)} {rejected}) "
+                 "TO STDOUT (FORMAT csv, HEADER)")
+        with open(path, "wb") as output, cursor.copy(query) as copy:
+            for data in copy:
+                output.write(data)
+        return
+
+    fields = ", ".join(f"'{name}', {name}" for name in columns)
+    query = (f"COPY (SELECT json_strip_nulls(json_build_object("
+             f"'row', _row, 'error', _error, 'raw', _raw, {fields}))::text "
+             f"{rejected}) TO STDOUT")
+    with open(path, "w", encoding="utf-8") as output, \
+            cursor.copy(query) as copy:
+        for (line,) in copy.rows():
+            output.write(line + "\n")
+
+
+def _apply_rules(connection, table: str, rules, **params) -> None:
+    """Flag the rows breaking each rule, keeping the first error."""
+    for condition, message in rules:
+        connection.execute(
+            text(f"UPDATE {table} s SET _error = :message "
+                 f"WHERE s._error IS NULL AND ({condition})"),
+            {"message": message, **params},
+        )
+
+
+def reject_path_for(path: Path) -> Path:
+    """Default reject file: data.csv -> data.rejects.csv"""
+    return path.with_name(f"{path.stem}.rejects{path.suffix}")
+
+
+def import_file(entity: str,
+                path: str | Path,
+                user_id: int,
+                user_role: str,
+                fmt: str | None = None,
+                reject_path: str | Path | None = None) -> dict:
+    """
+    Import a CSV or JSON Lines file of companies, clients, contracts or
+    events.
+
+    Args:
+        entity: "company", "client", "contract" or "event".
+        path: File to import. CSV files need a header line.
+        user_id: Id of the user running the import. Imported clients
+            belong to them, commercials only import contracts and events
+            of their own clients.
+        user_role: Role of that user.
+        fmt: "csv" or "jsonl", guessed from the file extension when None.
+        reject_path: Where to write the rejected rows, next to the source
+            file by default.
+
+    Returns:
+        A report dict: rows, inserted, updated, skipped, rejected,
+        reject_path (None without rejects), seconds and rows_per_second.
+
+    Raises:
+        ValueError: For an unknown entity, format or CSV column.
+        PermissionError: When a row-level security policy refuses a row.
+    """
+    if entity not in MODELS:
+        raise ValueError(
+            f"Cannot import {entity}s. "
+            f"Importable entities: {', '.join(MODELS)}"
+        )
+    path = Path(path)
+    fmt = fmt or ("jsonl" if path.suffix.lower() in {".jsonl", ".ndjson"}
+                  else "csv")
+    if fmt not in {"csv", "jsonl"}:
+        raise ValueError(f"Unknown import format {fmt!r}.")
+    reject_path = Path(reject_path) if reject_path else reject_path_for(path)
+    columns = importable_columns(entity)
+
+    started = time.perf_counter()
+    with Session() as session:
+        connection = session.connection()
+        # Dates without an offset are read in TIME_ZONE, as in the
+        # prompts, not in the TimeZone of the server
+        connection.execute(text("SELECT set_config('TimeZone', :zone, true)"),
+                           {"zone": database_zone()})
+        connection.exec_driver_sql(
+            f"CREATE TEMP TABLE {STAGE} ("
+            "_row bigint GENERATED ALWAYS AS IDENTITY, "
+            "_error text, _raw text, "
+            f"{', '.join(f'{name} text' for name in columns)}"
+            ") ON COMMIT DROP"
+        )
+        connection.exec_driver_sql(
+            _TIMESTAMP_FUNCTION
+            if connection.dialect.server_version_info >= (16,)
+            else _TIMESTAMP_FUNCTION_PRE_16
+        )
+
+        cursor = connection.connection.driver_connection.cursor()
+        with open(path, "rb") as source:
+            try:
+                if fmt == "csv":
+                    staged = _copy_csv(cursor, source, columns)
+                else:
+                    staged = _copy_jsonl(cursor, source, columns)
+            except psycopg.DataError as exc:
+                raise ValueError(
+                    f"Malformed {fmt.upper()} file: "
+                    f"{exc.diag.message_primary} ({exc.diag.context})"
+                ) from exc
+
+        connection.exec_driver_sql(f"ANALYZE {STAGE}")
+        for statement in _normalize_statements(entity):
+            connection.exec_driver_sql(statement)
+        _apply_rules(connection, STAGE, _type_rules(entity))
+
+        connection.exec_driver_sql(_typed_rows_statement(entity))
+        connection.exec_driver_sql(f"ANALYZE {ROWS}")
+        _apply_rules(connection, ROWS, _entity_rules(entity, user_role),
+                     user_id=user_id)
+        connection.exec_driver_sql(
+            f"UPDATE {STAGE} s SET _error = r._error FROM {ROWS} r "
+            "WHERE r._row = s._row AND r._error IS NOT NULL"
+        )
+
+        rows, rejected = connection.exec_driver_sql(
+            f"SELECT count(*), count(_error) FROM {STAGE}"
+        ).one()
+        with enforced_by_policy(
+            f"You are not allowed to import some of these {entity}s."
+        ):
+            merged = connection.exec_driver_sql(
+                _merge_statement(entity, user_id)
+            ).all()
+
+        if entity == "event":
+            refresh_visibility(session, connection.exec_driver_sql(
+                f"SELECT DISTINCT support_contact_id FROM {ROWS} "
+                "WHERE _error IS NULL AND support_contact_id IS NOT NULL"
+            ).scalars())
+        elif entity == "client":
+            updated_ids = [row.id for row in merged if not row.inserted]
+            if updated_ids:
+                refresh_visibility(session, connection.execute(
+                    text(f"SELECT DISTINCT user_id FROM {SCHEMA}."
+                         "entity_visibility WHERE entity_type = 'client' "
+                         "AND entity_id = ANY(:ids)"),
+                    {"ids": updated_ids},
+                ).scalars())
+
+        if rejected:
+            _write_rejects(cursor, reject_path, fmt, staged)
+        session.commit()
+
+    seconds = time.perf_counter() - started
+    inserted = sum(1 for row in merged if row.inserted)
+    return {
+        "rows": rows,
+        "inserted": inserted,
+        "updated": len(merged) - inserted,
+        "skipped": rows - rejected - len(merged),
+        "rejected": rejected,
+        "reject_path": reject_path if rejected else None,
+        "seconds": seconds,
+        "rows_per_second": rows / seconds if seconds else 0.0,
+    }
@@ -0,0 +1,119 @@
+"""
+EXPLAIN helpers: plans of manager statements, capture and explanation of
+the statements a command sends (--explain / --analyze), and lookup of
+sequential scans in a JSON plan.
+
+The query-plan regression checks of the hot manager queries built on
+them live in tests/test_query_plans.py.
+"""
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+from sqlalchemy import Select, event
+
+from src.data_access.config import engine
+from src.data_access.row_security import apply_context
+from src.settings import ROW_LEVEL_SECURITY
+
+# Tables that must never be read with a sequential scan by a hot query
+LARGE_TABLES = {"client", "contract", "event", "entity_visibility"}
+
+
+def _explain_prefix(analyze: bool) -> str:
+    options = "ANALYZE, BUFFERS, FORMAT JSON" if analyze else "FORMAT JSON"
+    return f"EXPLAIN ({options}) "
+
+
+def explain(session, stmt: Select, analyze: bool = False) -> dict:
+    """
+    Return the root plan node of EXPLAIN (FORMAT JSON) for a statement.
+
+    With analyze=True the statement is executed and the node carries the
+    actual timings and buffer counters.
+    """
+    compiled = stmt.compile(dialect=session.bind.dialect,
+                            compile_kwargs={"render_postcompile": True})
+    result = session.connection().exec_driver_sql(
+        _explain_prefix(analyze) + compiled.string, compiled.params
+    )
+    return result.scalar()[0]["Plan"]
+
+
+@contextmanager
+def capture_statements() -> Iterator[list[dict]]:
+    """
+    Record the SELECT statements sent to the database while the block
+    runs, with their parameters and client-side duration.
+    """
+    captured = []
+
+    def before_execute(conn, cursor, statement, parameters, context,
+                       executemany):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    def after_execute(conn, cursor, statement, parameters, context,
+                      executemany):
+        elapsed = time.perf_counter() - conn.info["query_start"].pop()
+        # set_config() calls attach the row-level security context
+        if (not executemany
+                and statement.lstrip().upper().startswith(("SELECT", "WITH"))
+                and "set_config(" not in statement):
+            captured.append({
+                "statement": statement,
+                "parameters": parameters,
+                "elapsed": elapsed,
+            })
+
+    event.listen(engine, "before_cursor_execute", before_execute)
+    event.listen(engine, "after_cursor_execute", after_execute)
+    try:
+        yield captured
+    finally:
+        event.remove(engine, "before_cursor_execute", before_execute)
+        event.remove(engine, "after_cursor_execute", after_execute)
+
+
+def explain_statements(captured: list[dict],
+                       analyze: bool = False) -> list[dict]:
+    """
+    Explain statements recorded by capture_statements().
+
+    Each entry gains the root plan node and, when available, the
+    planning and execution times reported by PostgreSQL. The explain
+    transaction is rolled back, so ANALYZE leaves no trace.
+    """
+    explained = []
+    with engine.connect() as conn:
+        if ROW_LEVEL_SECURITY:
+            # Plan under the same policies as the captured statements
+            apply_context(conn)
+        for query in captured:
+            result = conn.exec_driver_sql(
+                _explain_prefix(analyze) + query["statement"],
+                query["parameters"],
+            ).scalar()[0]
+            explained.append({
+                **query,
+                "plan": result["Plan"],
+                "planning_time": result.get("Planning Time"),
+                "execution_time": result.get("Execution Time"),
+            })
+        conn.rollback()
+    return explained
+
+
+def plan_nodes(plan: dict) -> Iterator[dict]:
+    """Walk every node of a JSON plan, depth first."""
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from plan_nodes(child)
+
+
+def sequential_scans(plan: dict, tables: set[str] = LARGE_TABLES) -> list[str]:
+    """Names of the given tables read through a sequential scan."""
+    return [
+        node["Relation Name"] for node in plan_nodes(plan)
+        if node["Node Type"] == "Seq Scan"
+        and node.get("Relation Name") in tables
+    ]
@@ -0,0 +1,290 @@
+"""
+PostgreSQL row-level security for the ownership rules.
+
+The policies below mirror the checks of the managers: commercials write
+their own clients, contracts and client events only, and support users
+read the contracts and companies linked to their events and update only
+the events assigned to them. They read two transaction settings:
+
+    epic_events.user_id / epic_events.role
+
+With ROW_LEVEL_SECURITY enabled, every ORM transaction starts with the
+equivalent of SET LOCAL for both settings, taken from the verified
+access token. The managers skip the Python checks that cost extra
+queries only once policies_enforced() has verified that the database
+really applies the policies to the connected role; otherwise they keep
+them. When the settings are unset (migrations, db-create) the policies
+let everything through.
+
+The policies always exist but are only enforced on the tables while
+the mode is on (db-create applies the setting): quals using operators
+that are not leakproof, such as numeric comparisons, cannot be pushed
+below the policy quals, which makes some plans more expensive.
+"""
+from collections.abc import Iterator
+from contextlib import contextmanager
+from functools import lru_cache
+
+from sqlalchemy import event, text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm.exc import StaleDataError
+
+from src.auth.jwt.token_storage import get_stored_token
+from src.auth.jwt.verify_token import verify_access_token
+from src.auth.permissions import ROLE_ID_TO_NAME
+from src.data_access.config import Session, engine, metadata
+from src.exceptions import (
+    ExpiredTokenError,
+    InvalidTokenError,
+    TokenFileNotFoundError,
+)
+from src.settings import ROW_LEVEL_SECURITY
+
+SCHEMA = metadata.schema
+
+# Role set for a stored token that does not verify: denied everywhere
+ANONYMOUS = "anonymous"
+
+_ROLE = "coalesce(current_setting('epic_events.role', true), '')"
+_USER_ID = "nullif(current_setting('epic_events.user_id', true), '')::integer"
+
+UNRESTRICTED = f"{_ROLE} IN ('', 'management')"
+KNOWN_ROLE = f"{_ROLE} IN ('', 'management', 'commercial', 'support')"
+IS_COMMERCIAL = f"{_ROLE} = 'commercial'"
+IS_SUPPORT = f"{_ROLE} = 'support'"
+
+
+def _visible(entity_type: str) -> str:
+    return (f"EXISTS (SELECT 1 FROM {SCHEMA}.entity_visibility v "
+            f"WHERE v.user_id = {_USER_ID} "
+            f"AND v.entity_type = '{entity_type}' AND v.entity_id = id)")
+
+
+def _owns_client(client_id: str) -> str:
+    return (f"EXISTS (SELECT 1 FROM {SCHEMA}.client cl "
+            f"WHERE cl.id = {client_id} AND cl.commercial_id = {_USER_ID})")
+
+
+def _owns_contract(contract_id: str) -> str:
+    return (f"EXISTS (SELECT 1 FROM {SCHEMA}.contract ct "
+            f"JOIN {SCHEMA}.client cl ON cl.id = ct.client_id "
+            f"WHERE ct.id = {contract_id} "
+            f"AND cl.commercial_id = {_USER_ID})")
+
+
+_OWN_CLIENT = f"{UNRESTRICTED} OR ({IS_COMMERCIAL} AND commercial_id = {_USER_ID})"
+_OWN_CONTRACT = f"{UNRESTRICTED} OR ({IS_COMMERCIAL} AND {_owns_client('client_id')})"
+_ASSIGNED_EVENT = f"{UNRESTRICTED} OR ({IS_SUPPORT} AND support_contact_id = {_USER_ID})"
+
+# table -> (policy name, command, USING, WITH CHECK)
+POLICIES: dict[str, list[tuple[str, str, str | None, str | None]]] = {
+    "client": [
+        ("client_read", "SELECT", KNOWN_ROLE, None),
+        ("client_insert", "INSERT", None, _OWN_CLIENT),
+        ("client_update", "UPDATE", _OWN_CLIENT, _OWN_CLIENT),
+        ("client_delete", "DELETE", _OWN_CLIENT, None),
+    ],
+    "contract": [
+        ("contract_read", "SELECT",
+         f"{UNRESTRICTED} OR {IS_COMMERCIAL} "
+         f"OR ({IS_SUPPORT} AND {_visible('contract')})", None),
+        ("contract_insert", "INSERT", None, _OWN_CONTRACT),
+        ("contract_update", "UPDATE", _OWN_CONTRACT, _OWN_CONTRACT),
+        ("contract_delete", "DELETE", _OWN_CONTRACT, None),
+    ],
+    "event": [
+        ("event_read", "SELECT",
+         f"{UNRESTRICTED} OR {IS_COMMERCIAL} "
+         f"OR ({IS_SUPPORT} AND support_contact_id = {_USER_ID})", None),
+        ("event_insert", "INSERT", None,
+         f"{UNRESTRICTED} OR ({IS_COMMERCIAL} "
+         f"AND {_owns_contract('contract_id')})"),
+        ("event_update", "UPDATE", _ASSIGNED_EVENT, _ASSIGNED_EVENT),
+        ("event_delete", "DELETE", UNRESTRICTED, None),
+    ],
+    "company": [
+        ("company_read", "SELECT",
+         f"{UNRESTRICTED} OR {IS_COMMERCIAL} "
+         f"OR ({IS_SUPPORT} AND {_visible('company')})", None),
+        ("company_insert", "INSERT", None,
+         f"{UNRESTRICTED} OR {IS_COMMERCIAL}"),
+        ("company_update", "UPDATE", UNRESTRICTED, UNRESTRICTED),
+        ("company_delete", "DELETE", UNRESTRICTED, None),
+    ],
+}
+
+
+def install_statements() -> Iterator[str]:
+    """DDL (re)creating the policies, without enforcing them."""
+    for table, policies in POLICIES.items():
+        qualified = f"{SCHEMA}.{table}"
+        for name, command, using, check in policies:
+            yield f"DROP POLICY IF EXISTS {name} ON {qualified}"
+            statement = f"CREATE POLICY {name} ON {qualified} FOR {command}"
+            if using:
+                statement += f" USING ({using})"
+            if check:
+                statement += f" WITH CHECK ({check})"
+            yield statement
+
+
+def enforce_statements(enabled: bool) -> Iterator[str]:
+    """DDL turning the enforcement of the policies on or off."""
+    for table in POLICIES:
+        qualified = f"{SCHEMA}.{table}"
+        if enabled:
+            yield f"ALTER TABLE {qualified} ENABLE ROW LEVEL SECURITY"
+            # Also applies the policies to the owner of the table, which
+            # is the role the application connects with
+            yield f"ALTER TABLE {qualified} FORCE ROW LEVEL SECURITY"
+        else:
+            yield f"ALTER TABLE {qualified} NO FORCE ROW LEVEL SECURITY"
+            yield f"ALTER TABLE {qualified} DISABLE ROW LEVEL SECURITY"
+
+
+def uninstall_statements() -> Iterator[str]:
+    """DDL disabling row-level security and dropping the policies."""
+    yield from enforce_statements(False)
+    for table, policies in POLICIES.items():
+        for name, _, _, _ in policies:
+            yield f"DROP POLICY IF EXISTS {name} ON {SCHEMA}.{table}"
+
+
+def install_row_security(connection,
+                         enabled: bool = ROW_LEVEL_SECURITY) -> None:
+    """
+    Create the policies on an open connection and enforce them or not,
+    following the ROW_LEVEL_SECURITY setting (idempotent).
+    """
+    for statement in install_statements():
+        connection.exec_driver_sql(statement)
+    for statement in enforce_statements(enabled):
+        connection.exec_driver_sql(statement)
+
+
+_ENFORCEMENT = text(
+    "SELECT count(*) FILTER ("
+    "WHERE c.relrowsecurity AND c.relforcerowsecurity), "
+    "bool_or(r.rolsuper OR r.rolbypassrls) "
+    "FROM pg_roles r LEFT JOIN pg_class c "
+    "ON c.relnamespace = CAST(:schema AS regnamespace) "
+    "AND c.relname = ANY(:tables) "
+    "WHERE r.rolname = current_user"
+)
+
+
+def is_enforced(connection) -> bool:
+    """
+    Whether the policies apply to the role of the connection: row-level
+    security enabled and forced on every table they cover, and a role
+    that is neither a superuser nor allowed to bypass it.
+    """
+    enforced_tables, bypasses = connection.execute(
+        _ENFORCEMENT, {"schema": SCHEMA, "tables": list(POLICIES)}
+    ).one()
+    return enforced_tables == len(POLICIES) and not bypasses
+
+
+@lru_cache(maxsize=1)
+def policies_enforced() -> bool:
+    """
+    Whether the managers may leave the ownership rules to the policies,
+    checked once per process on the first call. False outside the
+    ROW_LEVEL_SECURITY mode, and also in that mode when the database
+    does not enforce them (db-create not run with the setting, or a
+    superuser connection), so that the Python checks stay in place.
+    """
+    if not ROW_LEVEL_SECURITY:
+        return False
+    with engine.connect() as connection:
+        return is_enforced(connection)
+
+
+_SET_CONTEXT = text(
+    "SELECT set_config('epic_events.user_id', :user_id, true), "
+    "set_config('epic_events.role', :role, true)"
+)
+
+
+@lru_cache(maxsize=8)
+def _token_context(access_token: str) -> tuple[str, str]:
+    try:
+        payload = verify_access_token(access_token)
+        role = ROLE_ID_TO_NAME.get(int(payload["role_id"]), ANONYMOUS)
+        return str(payload["sub"]), role
+    except (ExpiredTokenError, InvalidTokenError, KeyError, ValueError):
+        return "", ANONYMOUS
+
+
+def current_context() -> tuple[str, str]:
+    """
+    The (user_id, role) settings of the logged-in user.
+
+    Without a stored session both are empty: commands that run before
+    login (login itself, db-create, manager-create) are not restricted.
+    """
+    try:
+        stored = get_stored_token()
+    except TokenFileNotFoundError:
+        return "", ""
+    access_token = stored.get("access_token") if stored else None
+    if not access_token:
+        return "", ""
+    return _token_context(access_token)
+
+
+def apply_context(connection) -> None:
+    """Attach the current user and role to the open transaction."""
+    user_id, role = current_context()
+    connection.execute(_SET_CONTEXT, {"user_id": user_id, "role": role})
+
+
+def _set_transaction_context(session, transaction, connection) -> None:
+    apply_context(connection)
+
+
+if ROW_LEVEL_SECURITY:
+    event.listen(Session, "after_begin", _set_transaction_context)
+
+
+@contextmanager
+def unrestricted(session) -> Iterator[None]:
+    """
+    Lift the policies for maintenance statements of the current
+    transaction, e.g. recomputing the visibility rows a support user
+    is not allowed to read.
+    """
+    if not ROW_LEVEL_SECURITY:
+        yield
+        return
+    connection = session.connection()
+    role = connection.scalar(
+        text("SELECT current_setting('epic_events.role', true)")
+    )
+    connection.execute(text("SELECT set_config('epic_events.role', '', true)"))
+    try:
+        yield
+    finally:
+        connection.execute(
+            text("SELECT set_config('epic_events.role', :role, true)"),
+            {"role": role or ""},
+        )
+
+
+@contextmanager
+def enforced_by_policy(message: str) -> Iterator[None]:
+    """
+    Report a write rejected by a policy as a PermissionError.
+
+    An UPDATE or DELETE filtered out by a USING clause matches no row
+    (StaleDataError from the ORM), a row failing a WITH CHECK clause
+    raises insufficient_privilege.
+    """
+    try:
+        yield
+    except StaleDataError as exc:
+        raise PermissionError(message) from exc
+    except DBAPIError as exc:
+        if getattr(exc.orig, "sqlstate", None) == "42501":
+            raise PermissionError(message) from exc
+        raise
@@ -0,0 +1,147 @@
+"""
+Maintenance of the support visibility table.
+
+A support user may read the contracts, clients and companies linked to
+the events they are assigned to. Instead of walking Event -> Contract ->
+Client -> Company on every scoped query, those pairs are materialized in
+entity_visibility and recomputed, per support user, whenever one of the
+links can change.
+"""
+from collections.abc import Iterable
+
+from sqlalchemy import Select, and_, delete, exists, insert, literal, select, union
+from sqlalchemy.sql.elements import ColumnElement
+
+from src.crm.models import Client, Company, Contract, EntityVisibility, Event
+from src.data_access.row_security import unrestricted
+
+# Entity types a support user reaches through their events
+VISIBLE_TYPES = {
+    Contract.__tablename__,
+    Client.__tablename__,
+    Company.__tablename__,
+}
+
+_COLUMNS = ["user_id", "entity_type", "entity_id"]
+
+
+def _visible_rows(user_ids: Iterable[int] | None = None):
+    """
+    SELECT of the (user_id, entity_type, entity_id) rows derived from the
+    event assignments, for the given support users or for everyone.
+    """
+    support_id = Event.support_contact_id
+    contracts = select(support_id,
+                       literal(Contract.__tablename__),
+                       Event.contract_id)
+    clients = (select(support_id,
+                      literal(Client.__tablename__),
+                      Contract.client_id)
+               .join(Contract, Contract.id == Event.contract_id))
+    companies = (select(support_id,
+                        literal(Company.__tablename__),
+                        Client.company_id)
+                 .join(Contract, Contract.id == Event.contract_id)
+                 .join(Client, Client.id == Contract.client_id)
+                 .where(Client.company_id.is_not(None)))
+
+    scope = (support_id.is_not(None) if user_ids is None
+             else support_id.in_(list(user_ids)))
+    # UNION also removes the duplicates of users with several events
+    # on the same contract, client or company
+    return union(*(stmt.where(scope)
+                   for stmt in (contracts, clients, companies)))
+
+
+def refresh_visibility(session, user_ids: Iterable[int | None]) -> None:
+    """
+    Recompute the visibility rows of the given support users.
+
+    Runs in the caller's transaction, so the rows are committed (or
+    rolled back) together with the change that made them stale. The
+    row-level security policies are lifted meanwhile: the events and
+    contracts read here are not all visible to the current user.
+    """
+    user_ids = {user_id for user_id in user_ids if user_id is not None}
+    if not user_ids:
+        return
+    with unrestricted(session):
+        session.execute(
+            delete(EntityVisibility)
+            .where(EntityVisibility.user_id.in_(user_ids))
+        )
+        session.execute(
+            insert(EntityVisibility)
+            .from_select(_COLUMNS, _visible_rows(user_ids))
+        )
+
+
+def rebuild_visibility(session) -> None:
+    """Recompute the whole visibility table from the event assignments."""
+    with unrestricted(session):
+        session.execute(delete(EntityVisibility))
+        session.execute(
+            insert(EntityVisibility).from_select(_COLUMNS, _visible_rows())
+        )
+
+
+def affected_users(session, instance) -> set[int]:
+    """
+    Support users whose visibility depends on an instance.
+
+    Called before and after a change, the union of both sets is what
+    refresh_visibility() has to recompute.
+    """
+    if isinstance(instance, Event):
+        if instance.support_contact_id is None:
+            return set()
+        return {instance.support_contact_id}
+
+    entity_type = getattr(instance, "__tablename__", None)
+    if entity_type not in VISIBLE_TYPES or instance.id is None:
+        return set()
+    return set(session.scalars(
+        select(EntityVisibility.user_id)
+        .where(EntityVisibility.entity_type == entity_type)
+        .where(EntityVisibility.entity_id == instance.id)
+    ))
+
+
+def affected_users_where(session, entity, criteria: ColumnElement) -> set[int]:
+    """Set-based affected_users() for the rows of entity matching criteria."""
+    if entity is Event:
+        return set(session.scalars(
+            select(Event.support_contact_id)
+            .where(criteria)
+            .where(Event.support_contact_id.is_not(None))
+            .distinct()
+        ))
+    if entity.__tablename__ not in VISIBLE_TYPES:
+        return set()
+    return set(session.scalars(
+        select(EntityVisibility.user_id)
+        .where(EntityVisibility.entity_type == entity.__tablename__)
+        .where(EntityVisibility.entity_id.in_(
+            select(entity.id).where(criteria)
+        ))
+        .distinct()
+    ))
+
+
+def visible_clause(entity, user_id: int) -> ColumnElement:
+    """Join condition keeping the rows of entity visible to a support."""
+    return and_(EntityVisibility.user_id == user_id,
+                EntityVisibility.entity_type == entity.__tablename__,
+                EntityVisibility.entity_id == entity.id)
+
+
+def is_visible_query(entity_type: str,
+                     entity_id: int,
+                     user_id: int) -> Select:
+    """EXISTS check on the visibility primary key."""
+    return select(
+        exists()
+        .where(EntityVisibility.user_id == user_id)
+        .where(EntityVisibility.entity_type == entity_type)
+        .where(EntityVisibility.entity_id == entity_id)
+    )
@@ -37,4 +37,7 @@ class ExpiredTokenError(EpicEventsError):
     alert = "EXPIRED TOKEN"
 
 class TokenFileNotFoundError(EpicEventsError):
-    alert = "TOKEN FILE NOT FOUND"
\ No newline at end of file
+    alert = "TOKEN FILE NOT FOUND"
+
+class InvalidFilterError(EpicEventsError):
+    alert = "INVALID FILTER"
@@ -41,6 +41,19 @@ SENTRY_TRACES_SAMPLE_RATE=os.environ.get("SENTRY_TRACES_SAMPLE_RATE", 9.0)
 # not in a file.
 TEMP_FILE_PATH=os.environ.get("TEMP_FILE_PATH", None)
 
+# Optional PostgreSQL row-level security mode. When enabled, the
+# current user and role are attached to every transaction and the
+# ownership rules are enforced by the policies of the database instead
+# of extra checks in the managers. The checks are kept when the database
+# does not apply the policies to the connected role, e.g. a superuser.
+ROW_LEVEL_SECURITY = os.environ.get(
+    "ROW_LEVEL_SECURITY", "false"
+).lower() in {"1", "true", "yes", "on"}
+
+# IANA time zone (e.g. "Europe/Paris") of the dates typed without a UTC
+# offset. The local time zone of the machine when unset.
+TIME_ZONE = os.environ.get("TIME_ZONE") or None
+
 # Token lifetimes
 ACCESS_TOKEN_LIFETIME_MINUTES = os.environ.get(
     "ACCESS_TOKEN_LIFETIME_MINUTES", 30
@@ -0,0 +1,32 @@
+"""
+Shared configuration of the test suite.
+
+Importing the application builds the SQLAlchemy engine, which needs the
+database settings without opening any connection: placeholder values
+are given when neither the environment nor the .env file has them, so
+the unit tests run without a database. The tests that need one ask for
+the `database` fixture and are skipped when it cannot be reached.
+"""
+import os
+
+import pytest
+from dotenv import load_dotenv
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+
+load_dotenv()
+os.environ.setdefault("POSTGRES_PASSWORD", "test")
+os.environ.setdefault("SECRET_KEY", "test-secret-key")
+
+
+@pytest.fixture(scope="session")
+def database():
+    """The engine of the configured database."""
+    from src.data_access.config import engine
+
+    try:
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+    except DBAPIError as error:
+        pytest.skip(f"No database reachable: {error.orig}")
+    return engine
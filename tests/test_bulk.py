@@ -0,0 +1,201 @@
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import delete, select
+from sqlalchemy.exc import IntegrityError
+
+from src.auth.permissions import UserRoles
+from src.crm.controllers.managers import (
+    ClientManager,
+    CompanyManager,
+    ContractManager,
+)
+from src.crm.models import Client, Company, Contract, Role, User
+from src.data_access.config import Session
+
+PREFIX = "bulk-test"
+
+
+@pytest.fixture
+def commercials(database):
+    """
+    Two commercials with two clients and a contract per client,
+    committed as the bulk statements run in their own transactions, and
+    deleted after the test.
+    """
+    with Session() as session:
+        role_id = session.scalar(
+            select(Role.id).where(Role.name == UserRoles.COMMERCIAL)
+        )
+        if role_id is None:
+            pytest.skip("Roles are missing, run db-create first.")
+        users = [
+            User(username=f"{PREFIX}-{name}", full_name=name,
+                 email=f"{PREFIX}-{name}@example.invalid",
+                 password_hash="x", role_id=role_id)
+            for name in ("alpha", "bravo")
+        ]
+        session.add_all(users)
+        session.flush()
+        for user in users:
+            for number in (1, 2):
+                client = Client(
+                    full_name=f"{user.full_name} {number}",
+                    email=f"{PREFIX}-{user.id}-{number}@example.invalid",
+                    commercial_id=user.id,
+                    first_contact_date=datetime.now(timezone.utc),
+                )
+                session.add(client)
+                session.flush()
+                session.add(Contract(client_id=client.id,
+                                     commercial_id=user.id,
+                                     total_amount=100, remaining_amount=100))
+        session.commit()
+        user_ids = [user.id for user in users]
+
+    yield user_ids
+
+    with Session() as session:
+        session.execute(delete(Contract)
+                        .where(Contract.commercial_id.in_(user_ids)))
+        session.execute(delete(Client)
+                        .where(Client.commercial_id.in_(user_ids)))
+        session.execute(delete(User).where(User.id.in_(user_ids)))
+        session.commit()
+
+
+def ids_of(entity, column, value) -> list[int]:
+    with Session() as session:
+        return list(session.scalars(
+            select(entity.id).where(column == value).order_by(entity.id)
+        ))
+
+
+@pytest.mark.integration
+def test_bulk_update_leaves_out_other_commercials_clients(commercials):
+    alpha, bravo = commercials
+    own = ids_of(Client, Client.commercial_id, alpha)
+    others = ids_of(Client, Client.commercial_id, bravo)
+
+    updated = ClientManager().bulk_update(
+        {"full_name": "Renamed", "phone": None}, ids=own + others,
+        user_id=alpha, user_role=UserRoles.COMMERCIAL,
+    )
+
+    assert sorted(updated) == own
+    with Session() as session:
+        names = dict(session.execute(
+            select(Client.id, Client.full_name)
+            .where(Client.id.in_(own + others))
+        ).all())
+    assert {names[id] for id in own} == {"Renamed"}
+    assert "Renamed" not in {names[id] for id in others}
+
+
+@pytest.mark.integration
+def test_bulk_update_of_contracts_follows_their_client(commercials):
+    alpha, bravo = commercials
+    contracts = ids_of(Contract, Contract.commercial_id, alpha) \
+        + ids_of(Contract, Contract.commercial_id, bravo)
+
+    assert sorted(ContractManager().bulk_update(
+        {"remaining_amount": 0}, ids=contracts, where="is_signed = false",
+        user_id=bravo, user_role=UserRoles.COMMERCIAL,
+    )) == ids_of(Contract, Contract.commercial_id, bravo)
+    assert sorted(ContractManager().bulk_update(
+        {"remaining_amount": 50}, ids=contracts,
+        user_id=alpha, user_role=UserRoles.MANAGEMENT,
+    )) == sorted(contracts)
+
+
+def test_bulk_update_needs_values_and_a_selection():
+    with pytest.raises(ValueError, match="No value"):
+        ClientManager().bulk_update({"full_name": None}, ids=[1])
+    with pytest.raises(ValueError, match="Select the rows"):
+        ClientManager().bulk_update({"full_name": "x"})
+
+
+@pytest.mark.integration
+def test_bulk_delete_leaves_out_rows_of_other_commercials(commercials):
+    alpha, bravo = commercials
+    contracts = ContractManager()
+    contracts.bulk_chunk_size = 1
+    own = ids_of(Contract, Contract.commercial_id, alpha)
+    others = ids_of(Contract, Contract.commercial_id, bravo)
+
+    assert contracts.bulk_delete(own + others, user_id=alpha,
+                                 user_role=UserRoles.COMMERCIAL) == own
+    assert ids_of(Contract, Contract.commercial_id, bravo) == others
+
+    # bravo's clients still have contracts, but are not even selected
+    own = ids_of(Client, Client.commercial_id, alpha)
+    others = ids_of(Client, Client.commercial_id, bravo)
+    assert ClientManager().bulk_delete(
+        own + others, user_id=alpha, user_role=UserRoles.COMMERCIAL
+    ) == own
+    assert ids_of(Client, Client.commercial_id, alpha) == []
+    assert ids_of(Client, Client.commercial_id, bravo) == others
+
+
+@pytest.mark.integration
+def test_bulk_delete_restricted_by_references(commercials):
+    _, bravo = commercials
+    clients = ids_of(Client, Client.commercial_id, bravo)
+
+    with pytest.raises(ValueError, match="still referenced"):
+        ClientManager().bulk_delete(clients, user_id=bravo,
+                                    user_role=UserRoles.COMMERCIAL)
+    assert ids_of(Client, Client.commercial_id, bravo) == clients
+
+
+def new_clients(alpha: int, count: int) -> list[dict]:
+    return [{"full_name": f"New {number}",
+             "email": f"{PREFIX}-{alpha}-new{number}@example.com",
+             "first_contact_date": "21/12/2025"}
+            for number in range(count)]
+
+
+@pytest.mark.integration
+def test_bulk_create_returns_the_server_defaults(commercials):
+    alpha, _ = commercials
+    rows = new_clients(alpha, 3)
+    rows[1]["phone"] = "0612345678"
+
+    created = ClientManager().bulk_create(rows, user_id=alpha,
+                                          user_role=UserRoles.COMMERCIAL)
+
+    assert [row.email for row in created] == [row["email"] for row in rows]
+    assert [row.phone for row in created] == [None, "+33612345678", None]
+    assert {row.commercial_id for row in created} == {alpha}
+    assert all(row.created_at and row.updated_at for row in created)
+    assert not hasattr(created[0], "password_hash")
+
+
+@pytest.mark.integration
+def test_bulk_create_rejects_the_batch_with_invalid_rows(commercials):
+    alpha, _ = commercials
+    rows = new_clients(alpha, 3)
+    rows[1]["email"] = "not-an-email"
+    rows[2]["email"] = rows[0]["email"]
+    before = ids_of(Client, Client.commercial_id, alpha)
+
+    with pytest.raises(ValueError) as error:
+        ClientManager().bulk_create(rows, user_id=alpha,
+                                    user_role=UserRoles.COMMERCIAL)
+
+    assert str(error.value).startswith("Row 2: ")
+    assert "Row 3: " in str(error.value)
+    assert ids_of(Client, Client.commercial_id, alpha) == before
+
+
+@pytest.mark.integration
+def test_bulk_create_runs_in_a_single_transaction(database):
+    name = f"{PREFIX} company"
+    # Two field sets, two INSERT statements: the second one fails
+    rows = [{"name": name},
+            {"name": name, "created_at": datetime.now(timezone.utc)}]
+
+    with pytest.raises(IntegrityError):
+        CompanyManager().bulk_create(rows)
+
+    assert ids_of(Company, Company.name, name) == []
@@ -0,0 +1,77 @@
+from datetime import datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
+
+import pytest
+
+from src.crm.controllers import dates
+from src.crm.controllers.dates import as_aware, database_zone, parse_datetime
+
+PARIS = ZoneInfo("Europe/Paris")
+
+
+@pytest.fixture(autouse=True)
+def paris(monkeypatch):
+    monkeypatch.setattr(dates, "ZONE", PARIS)
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("21/12/2025", datetime(2025, 12, 21)),
+    ("21-12-2025", datetime(2025, 12, 21)),
+    ("2025-12-21", datetime(2025, 12, 21)),
+    ("1/2/2025", datetime(2025, 2, 1)),
+    ("01/2/2025", datetime(2025, 2, 1)),
+    ("1-02-2025", datetime(2025, 2, 1)),
+    ("01-2-2025", datetime(2025, 2, 1)),
+    ("2025-2-1", datetime(2025, 2, 1)),
+    ("21/12/2025 9:05", datetime(2025, 12, 21, 9, 5)),
+    ("21-12-2025T18:30:15", datetime(2025, 12, 21, 18, 30, 15)),
+    ("2025-12-21 18:30", datetime(2025, 12, 21, 18, 30)),
+    ("  2025-12-21T18:30:15  ", datetime(2025, 12, 21, 18, 30, 15)),
+])
+def test_accepted_formats(value, expected):
+    assert parse_datetime(value) == expected.replace(tzinfo=PARIS)
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("2025-12-21T18:30:00+00:00",
+     datetime(2025, 12, 21, 18, 30, tzinfo=timezone.utc)),
+    ("2025-12-21T18:30:00.250+02:00",
+     datetime(2025, 12, 21, 18, 30, 0, 250_000,
+              tzinfo=timezone(timedelta(hours=2)))),
+    ("20251221", datetime(2025, 12, 21, tzinfo=PARIS)),
+])
+def test_other_iso_forms(value, expected):
+    parsed = parse_datetime(value)
+    assert parsed == expected
+    assert parsed.utcoffset() == expected.utcoffset()
+
+
+@pytest.mark.parametrize("value", [
+    "", "2025", "tomorrow", "32/01/2025", "12/31/2025", "2025-13-01",
+    "21/12/2025 25:00", "21.12.2025", "21/12-2025", "2025/12/21",
+])
+def test_invalid_dates(value):
+    assert parse_datetime(value) is None
+
+
+def test_as_aware():
+    assert as_aware(datetime(2025, 1, 1)).tzinfo is PARIS
+    aware = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    assert as_aware(aware) is aware
+    assert as_aware(None) is None
+
+
+def test_local_zone_without_setting(monkeypatch):
+    monkeypatch.setattr(dates, "ZONE", None)
+    parsed = parse_datetime("2025-06-01 12:00")
+    assert parsed.utcoffset() == datetime(2025, 6, 1, 12).astimezone() \
+        .utcoffset()
+
+
+def test_database_zone(monkeypatch):
+    assert database_zone() == "Europe/Paris"
+    monkeypatch.setattr(dates, "ZONE", timezone(timedelta(hours=5,
+                                                          minutes=30)))
+    assert database_zone() == "<+0530>-05:30"
+    monkeypatch.setattr(dates, "ZONE", timezone(-timedelta(hours=3)))
+    assert database_zone() == "<-0300>+03:00"
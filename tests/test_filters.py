@@ -0,0 +1,131 @@
+from zoneinfo import ZoneInfo
+
+import pytest
+from sqlalchemy import column
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.types import NullType
+
+from src.crm.controllers import dates
+from src.crm.controllers.filters import _coerce, compile_filter, compile_sort
+from src.crm.models import Client, Contract, Event, User
+from src.exceptions import InvalidFilterError
+
+
+def sql(clause) -> str:
+    return str(clause.compile(dialect=postgresql.dialect(),
+                              compile_kwargs={"literal_binds": True}))
+
+
+@pytest.mark.parametrize("expression, expected", [
+    ("total_amount>5000",
+     "epic_events.contract.total_amount > 5000"),
+    ("total_amount >= 10.5",
+     "epic_events.contract.total_amount >= 10.5"),
+    ("client_id = 3 and commercial_id != 4",
+     "epic_events.contract.client_id = 3 "
+     "AND epic_events.contract.commercial_id != 4"),
+    ("is_signed", "epic_events.contract.is_signed"),
+    ("not is_signed", "NOT epic_events.contract.is_signed"),
+    ("is_signed = false", "epic_events.contract.is_signed = false"),
+])
+def test_contract_comparisons(expression, expected):
+    assert sql(compile_filter(Contract, expression)) == expected
+
+
+def test_precedence_and_parentheses():
+    assert sql(compile_filter(
+        Contract, "is_signed or total_amount < 10 and client_id = 1"
+    )) == (
+        "epic_events.contract.is_signed "
+        "OR epic_events.contract.total_amount < 10 "
+        "AND epic_events.contract.client_id = 1"
+    )
+    assert sql(compile_filter(
+        Contract, "(is_signed or total_amount < 10) and client_id = 1"
+    )) == (
+        "(epic_events.contract.is_signed "
+        "OR epic_events.contract.total_amount < 10) "
+        "AND epic_events.contract.client_id = 1"
+    )
+
+
+@pytest.mark.parametrize("expression, expected", [
+    ("phone = null", "epic_events.client.phone IS NULL"),
+    ("phone != null", "epic_events.client.phone IS NOT NULL"),
+    ("phone = 'null'", "epic_events.client.phone = 'null'"),
+    ("full_name = \"Jean Dupont\"",
+     "epic_events.client.full_name = 'Jean Dupont'"),
+])
+def test_null_and_strings(expression, expected):
+    assert sql(compile_filter(Client, expression)) == expected
+
+
+@pytest.mark.parametrize("raw", ["2025-12-21", "21/12/2025", "21-12-2025"])
+def test_dates_are_read_in_the_configured_zone(raw, monkeypatch):
+    monkeypatch.setattr(dates, "ZONE", ZoneInfo("Europe/Paris"))
+    assert sql(compile_filter(Event, f"start_date >= {raw}")) == (
+        "epic_events.event.start_date >= '2025-12-21 00:00:00+01:00'"
+    )
+
+
+def test_dates_keep_an_explicit_offset():
+    assert sql(compile_filter(
+        Event, "start_date < '2025-12-21T18:30:00+00:00'"
+    )) == "epic_events.event.start_date < '2025-12-21 18:30:00+00:00'"
+
+
+def test_column_without_python_type():
+    untyped = column("extra", NullType())
+    assert _coerce(untyped, "true", quoted=False) == "true"
+    assert _coerce(untyped, "null", quoted=False) is None
+
+
+def test_contains_is_case_insensitive_and_escaped():
+    assert sql(compile_filter(Client, "full_name ~ 'o_5%'")) == (
+        "epic_events.client.full_name ILIKE '%%' || 'o/_5/%%' || '%%' "
+        "ESCAPE '/'"
+    )
+
+
+@pytest.mark.parametrize("entity, expression", [
+    (Contract, "total_amount ~ 5"),
+    (Event, "start_date ~ 2025"),
+    (Contract, "is_signed ~ t"),
+])
+def test_contains_requires_a_text_field(entity, expression):
+    with pytest.raises(InvalidFilterError, match="text fields"):
+        compile_filter(entity, expression)
+
+
+@pytest.mark.parametrize("entity, expression, message", [
+    (Contract, "amount > 5", "Unknown field 'amount'"),
+    (User, "password_hash = x", "Unknown field 'password_hash'"),
+    (Contract, "total_amount", "is not a boolean"),
+    (Contract, "total_amount > abc", "Invalid value 'abc'"),
+    (Event, "start_date > 31/02/2025", "Invalid value '31/02/2025'"),
+    (Contract, "is_signed > true", "cannot compare"),
+    (Client, "phone < null", "cannot compare"),
+    (Contract, "(is_signed", "Unexpected end"),
+    (Contract, "(is_signed client_id)", "Missing closing parenthesis"),
+    (Contract, "is_signed and", "Unexpected end"),
+    (Contract, "is_signed is_signed", "Unexpected token"),
+    (Contract, "total_amount > 5 ;", "Unexpected character"),
+])
+def test_invalid_filters(entity, expression, message):
+    with pytest.raises(InvalidFilterError, match=message):
+        compile_filter(entity, expression)
+
+
+def test_sort():
+    assert [sql(clause) for clause in compile_sort(
+        Event, "-start_date, id,+title"
+    )] == [
+        "epic_events.event.start_date DESC",
+        "epic_events.event.id ASC",
+        "epic_events.event.title ASC",
+    ]
+
+
+def test_sort_rejects_hidden_columns():
+    with pytest.raises(InvalidFilterError, match="Unknown field"):
+        compile_sort(User, "refresh_token_hash")
@@ -0,0 +1,58 @@
+from datetime import date, datetime, timezone
+
+import pytest
+
+from src.crm.models import Contract
+from src.crm.registry import formatter_plan
+from src.crm.views.formatters import (
+    format_boolean,
+    format_datetime,
+    format_row,
+    format_value,
+)
+
+
+@pytest.mark.parametrize("value, expected", [
+    (datetime(2025, 3, 4, 5, 6), "04/03/2025 - 05:06"),
+    (datetime(2025, 12, 21, 18, 30, tzinfo=timezone.utc),
+     "21/12/2025 - 18:30"),
+    (None, ""),
+    ("2025-12-21", "2025-12-21"),
+    (date(2025, 12, 21), "2025-12-21"),
+])
+def test_format_datetime(value, expected):
+    assert format_datetime(value) == expected
+
+
+def test_format_datetime_matches_strftime():
+    value = datetime(2026, 1, 9, 7, 3)
+    assert format_datetime(value) == value.strftime("%d/%m/%Y - %H:%M")
+
+
+@pytest.mark.parametrize("value, expected", [
+    (True, "Yes"), (False, "No"), (None, "No"),
+])
+def test_format_boolean(value, expected):
+    assert format_boolean(value) == expected
+
+
+@pytest.mark.parametrize("value, expected", [
+    (True, "Yes"),
+    (datetime(2025, 3, 4, 5, 6), "04/03/2025 - 05:06"),
+    (12, "12"),
+    (None, ""),
+])
+def test_format_value(value, expected):
+    assert format_value(value) == expected
+
+
+def test_formatter_plan():
+    contract = Contract(id=3, total_amount=1500, is_signed=False,
+                        created_at=datetime(2025, 3, 4, 5, 6))
+    contract.client_name = "Ana"
+    plan = formatter_plan(Contract, ("id", "total_amount", "is_signed",
+                                     "created_at", "client_name",
+                                     "missing"))
+    assert format_row(plan, contract) == [
+        "3", "1500", "No", "04/03/2025 - 05:06", "Ana", "",
+    ]
@@ -0,0 +1,71 @@
+import os
+import stat
+
+import pytest
+
+from src.cli import help_cache
+from src.cli.help_cache import requested_path, serve_cached_help, store_help
+
+
+@pytest.mark.parametrize("args, expected", [
+    ([], []),
+    (["--plain"], []),
+    (["help"], []),
+    (["help", "client"], ["client"]),
+    (["-h"], []),
+    (["--help"], []),
+    (["client", "-h"], ["client"]),
+    (["--plain", "client", "list", "--help"], ["client", "list"]),
+    (["help", "client", "list"], None),
+    (["client", "list"], None),
+    (["client", "list", "--where", "-h"], None),
+    (["client", "view", "12"], None),
+])
+def test_requested_path(args, expected):
+    assert requested_path(args) == expected
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    directory = tmp_path / "help"
+    monkeypatch.setattr(help_cache, "CACHE_DIR", directory)
+    return directory
+
+
+def test_screens_are_stored_privately_and_served(cache_dir, capsys):
+    store_help(["client"], True, "client help\n")
+    assert stat.S_IMODE(os.stat(cache_dir).st_mode) == 0o700
+    assert [path.suffix for path in cache_dir.iterdir()] == [""]
+
+    assert serve_cached_help(["--plain", "client", "-h"])
+    assert capsys.readouterr().out == "client help\n"
+    assert not serve_cached_help(["--plain", "contract", "-h"])
+    assert not serve_cached_help(["--plain", "client", "list"])
+
+
+def test_shared_directories_are_ignored(cache_dir, capsys):
+    store_help(["client"], True, "client help\n")
+    os.chmod(cache_dir, 0o777)
+    assert not serve_cached_help(["--plain", "client", "-h"])
+
+    store_help(["contract"], True, "planted\n")
+    assert len(list(cache_dir.iterdir())) == 1
+    assert capsys.readouterr().out == ""
+
+
+def test_symlinked_directories_are_ignored(cache_dir, tmp_path):
+    target = tmp_path / "elsewhere"
+    target.mkdir(mode=0o700)
+    cache_dir.symlink_to(target)
+    store_help(["client"], True, "client help\n")
+    assert list(target.iterdir()) == []
+    assert not serve_cached_help(["--plain", "client", "-h"])
+
+
+def test_default_directory(monkeypatch, tmp_path):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    assert help_cache._default_cache_dir() == (
+        tmp_path / "epic_events" / "help"
+    )
+    monkeypatch.setenv("XDG_CACHE_HOME", "relative/cache")
+    assert help_cache._default_cache_dir().parent.parent.name == ".cache"
@@ -0,0 +1,41 @@
+import click
+import pytest
+
+from src.cli.utils import IdRanges
+
+
+def convert(value):
+    return IdRanges().convert(value, None, None)
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("7", [7]),
+    ("1-3,5", [1, 2, 3, 5]),
+    (" 5 , 2-3 ,, ", [2, 3, 5]),
+    ("1-3,2-4,3", [1, 2, 3, 4]),
+    ("9-9", [9]),
+    ([4, 8], [4, 8]),
+])
+def test_ids(value, expected):
+    assert convert(value) == expected
+
+
+@pytest.mark.parametrize("value, message", [
+    ("a", "not an id or an id range"),
+    ("1-b", "not an id or an id range"),
+    ("-5", "not an id or an id range"),
+    ("5-1", "empty range"),
+    ("", "no id given"),
+    (" , ", "no id given"),
+])
+def test_invalid_ids(value, message):
+    with pytest.raises(click.BadParameter, match=message):
+        convert(value)
+
+
+def test_selection_size_is_bounded():
+    assert len(convert(f"1-{IdRanges.max_ids}")) == IdRanges.max_ids
+    with pytest.raises(click.BadParameter, match="more than"):
+        convert(f"1-{IdRanges.max_ids + 1}")
+    with pytest.raises(click.BadParameter, match="more than"):
+        convert(f"1-{IdRanges.max_ids},{IdRanges.max_ids + 5}")
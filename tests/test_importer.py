@@ -0,0 +1,62 @@
+import csv
+
+import pytest
+from sqlalchemy import func, select
+
+from src.auth.permissions import UserRoles
+from src.crm.models import Client, Contract
+from src.data_access.config import Session
+from src.data_access.importer import import_file
+
+
+@pytest.fixture
+def client(database):
+    with Session() as session:
+        client = session.scalars(select(Client).limit(1)).first()
+    if client is None:
+        pytest.skip("No client to import contracts for.")
+    return client
+
+
+def rejects_of(report) -> dict[str, str]:
+    with open(report["reject_path"], newline="") as rejects:
+        return {row["row"]: row["error"] for row in csv.DictReader(rejects)}
+
+
+@pytest.mark.integration
+def test_contract_rules(client, tmp_path):
+    source = tmp_path / "contracts.csv"
+    source.write_text(
+        "client_id,total_amount,remaining_amount\n"
+        f"{client.id},100,150\n"
+        f"{client.id},-1,0\n"
+    )
+    with Session() as session:
+        before = session.scalar(select(func.count(Contract.id)))
+
+    report = import_file("contract", source, client.commercial_id,
+                         UserRoles.COMMERCIAL)
+
+    assert (report["rows"], report["rejected"], report["inserted"]) == \
+        (2, 2, 0)
+    assert rejects_of(report) == {
+        "1": "remaining_amount must not exceed total_amount",
+        "2": "total_amount must not be negative",
+    }
+    with Session() as session:
+        assert session.scalar(select(func.count(Contract.id))) == before
+
+
+@pytest.mark.integration
+def test_commercial_rules_bind_the_user(client, tmp_path):
+    source = tmp_path / "contracts.csv"
+    source.write_text(
+        "client_id,total_amount,remaining_amount\n"
+        f"{client.id},100,50\n"
+    )
+    report = import_file("contract", source, -1, UserRoles.COMMERCIAL)
+
+    assert report["inserted"] == 0
+    assert rejects_of(report) == {
+        "1": "you can only create contracts for your own clients",
+    }
@@ -0,0 +1,37 @@
+import pytest
+
+from src.auth.normalization import cache_stats, canonical_email, canonical_phone
+
+
+@pytest.mark.parametrize("raw, expected", [
+    ("0612345678", "+33612345678"),
+    (" 0756123456 ", "+33756123456"),
+    ("0033612345678", "+33612345678"),
+    ("+33612345678", "+33612345678"),
+    ("447911123456", "+447911123456"),
+    ("12", None),
+    ("", None),
+    ("   ", None),
+])
+def test_canonical_phone(raw, expected):
+    assert canonical_phone(raw) == expected
+
+
+@pytest.mark.parametrize("raw, expected", [
+    (" Jean.Dupont@Example.COM ", "jean.dupont@example.com"),
+    ("not-an-email", None),
+    ("a@b", None),
+])
+def test_canonical_email(raw, expected):
+    assert canonical_email(raw) == expected
+
+
+def test_cache_stats_count_the_lookups():
+    before = {stat["name"]: stat for stat in cache_stats()}
+    canonical_email("stats@example.com")
+    canonical_email("stats@example.com")
+    after = {stat["name"]: stat for stat in cache_stats()}
+    form = "email canonical form"
+    assert after[form]["lookups"] == before[form]["lookups"] + 2
+    assert after[form]["hits"] >= before[form]["hits"] + 1
+    assert 0.0 <= after[form]["hit_rate"] <= 1.0
@@ -0,0 +1,208 @@
+"""
+Query-plan regression checks for the hot manager queries.
+
+A synthetic dataset is seeded inside a transaction that is always rolled
+back, the planner statistics are refreshed, then EXPLAIN (FORMAT JSON)
+is captured for every statement built by the managers. A check fails
+when one of the large tables is read through a sequential scan or when
+the planned total cost goes over its bound.
+"""
+import pytest
+from sqlalchemy import text
+
+from src.auth.permissions import UserRoles
+from src.crm.controllers.managers import (
+    client_manager,
+    company_manager,
+    contract_manager,
+    event_manager,
+)
+from src.data_access.config import Session, metadata
+from src.data_access.query_plans import explain, sequential_scans
+from src.data_access.row_security import unrestricted
+from src.data_access.visibility import rebuild_visibility
+
+pytestmark = [pytest.mark.integration, pytest.mark.slow]
+
+SCHEMA = metadata.schema
+
+# Size of the synthetic dataset. Ratios mirror a production tenant: many
+# clients per commercial, a few events per support, and only a small
+# share of unsigned or unpaid contracts.
+DATASET = {
+    "commercials": 100,
+    "supports": 400,
+    "companies": 1_000,
+    "clients": 20_000,
+    "contracts": 40_000,
+    "events": 20_000,
+}
+
+# The checked manager statements, built from the seeded ids, with their
+# planned cost bound
+HOT_QUERIES = {
+    "client list --only-mine (commercial)": (
+        lambda ids: client_manager.list_query(
+            ids["commercial_id"], filtered=True,
+            user_role=UserRoles.COMMERCIAL),
+        2_500,
+    ),
+    "client list --only-mine (support)": (
+        lambda ids: client_manager.list_query(
+            ids["support_id"], filtered=True, user_role=UserRoles.SUPPORT),
+        2_500,
+    ),
+    "contract list --unpaid": (
+        lambda ids: contract_manager.list_query(
+            ids["commercial_id"], unpaid=True,
+            user_role=UserRoles.MANAGEMENT),
+        5_000,
+    ),
+    "contract list --unsigned": (
+        lambda ids: contract_manager.list_query(
+            ids["commercial_id"], unsigned=True,
+            user_role=UserRoles.MANAGEMENT),
+        5_000,
+    ),
+    "contract list (support)": (
+        lambda ids: contract_manager.list_query(
+            ids["support_id"], user_role=UserRoles.SUPPORT),
+        1_000,
+    ),
+    "event list (support)": (
+        lambda ids: event_manager.list_query(
+            ids["support_id"], user_role=UserRoles.SUPPORT),
+        1_000,
+    ),
+    "company list (support)": (
+        lambda ids: company_manager.list_query(
+            ids["support_id"], user_role=UserRoles.SUPPORT),
+        2_500,
+    ),
+    "contract view (support visibility)": (
+        lambda ids: contract_manager.assigned_contract_query(
+            ids["contract_id"], ids["support_id"]),
+        100,
+    ),
+}
+
+
+def seed_synthetic_dataset(session) -> dict[str, int]:
+    """
+    Insert the synthetic dataset and refresh the planner statistics.
+
+    Rows are generated server side with generate_series, so seeding does
+    not depend on the client. The caller is responsible for rolling the
+    transaction back.
+
+    Returns:
+        The ids of one commercial, one support and one contract to use
+        as parameters of the checked queries.
+    """
+    role_ids = dict(session.execute(text(
+        f"SELECT name, id FROM {SCHEMA}.role"
+    )).all())
+    if not {UserRoles.COMMERCIAL, UserRoles.SUPPORT} <= role_ids.keys():
+        pytest.skip("Roles are missing, run db-create first.")
+
+    def insert(statement: str, **params) -> list[int]:
+        return session.scalars(text(statement), params).all()
+
+    def insert_users(prefix: str, role: str, count: int) -> list[int]:
+        return insert(
+            f"INSERT INTO {SCHEMA}.users "
+            "(username, full_name, email, password_hash, role_id) "
+            f"SELECT 'plan_{prefix}_' || g, 'Plan {prefix} ' || g, "
+            f"'plan-{prefix}-' || g || '@example.invalid', 'x', :role_id "
+            "FROM generate_series(1, :count) AS g RETURNING id",
+            role_id=role_ids[role], count=count,
+        )
+
+    commercials = insert_users("commercial", UserRoles.COMMERCIAL,
+                               DATASET["commercials"])
+    supports = insert_users("support", UserRoles.SUPPORT,
+                            DATASET["supports"])
+
+    companies = insert(
+        f"INSERT INTO {SCHEMA}.company (name) "
+        "SELECT 'Plan company ' || g FROM generate_series(1, :count) g "
+        "RETURNING id",
+        count=DATASET["companies"],
+    )
+    clients = insert(
+        f"INSERT INTO {SCHEMA}.client "
+        "(full_name, email, commercial_id, company_id, first_contact_date) "
+        "SELECT 'Plan client ' || g, "
+        "'plan-client-' || g || '@example.invalid', "
+        "(:commercials)[1 + g % cardinality(:commercials)], "
+        "(:companies)[1 + g % cardinality(:companies)], now() "
+        "FROM generate_series(1, :count) g RETURNING id",
+        commercials=commercials, companies=companies,
+        count=DATASET["clients"],
+    )
+    # 2% of the contracts are unsigned and 2% are not fully paid
+    contracts = insert(
+        f"INSERT INTO {SCHEMA}.contract "
+        "(client_id, commercial_id, total_amount, remaining_amount, "
+        "is_signed) "
+        "SELECT c.id, c.commercial_id, 1000, "
+        "CASE WHEN g % 50 = 0 THEN 500 ELSE 0 END, g % 50 <> 1 "
+        "FROM generate_series(1, :count) g "
+        f"JOIN {SCHEMA}.client c "
+        "ON c.id = (:clients)[1 + g % cardinality(:clients)] "
+        "RETURNING id",
+        clients=clients, count=DATASET["contracts"],
+    )
+    insert(
+        f"INSERT INTO {SCHEMA}.event "
+        "(title, contract_id, full_address, support_contact_id, "
+        "start_date, end_date, participant_count) "
+        "SELECT 'Plan event ' || g, "
+        "(:contracts)[1 + g % cardinality(:contracts)], '1 plan street', "
+        "(:supports)[1 + g % cardinality(:supports)], "
+        "now() + g * interval '1 hour', now() + g * interval '2 hours', 10 "
+        "FROM generate_series(1, :count) g RETURNING id",
+        contracts=contracts, supports=supports, count=DATASET["events"],
+    )
+
+    rebuild_visibility(session)
+
+    for table in ("users", "company", "client", "contract", "event",
+                  "entity_visibility"):
+        session.execute(text(f"ANALYZE {SCHEMA}.{table}"))
+
+    contract_id = session.scalar(text(
+        f"SELECT contract_id FROM {SCHEMA}.event "
+        "WHERE support_contact_id = :support_id LIMIT 1"
+    ), {"support_id": supports[0]})
+    return {
+        "commercial_id": commercials[0],
+        "support_id": supports[0],
+        "contract_id": contract_id,
+    }
+
+
+@pytest.fixture(scope="module")
+def seeded(database):
+    """
+    A session over the seeded dataset, with the ids of the checked
+    queries. The row-level security policies are lifted: the seeding
+    writes rows no role may own, and the statements already carry their
+    own role scoping.
+    """
+    with Session() as session:
+        try:
+            with unrestricted(session):
+                ids = seed_synthetic_dataset(session)
+                yield session, ids
+        finally:
+            session.rollback()
+
+
+@pytest.mark.parametrize("name", HOT_QUERIES)
+def test_hot_query_plan(seeded, name):
+    session, ids = seeded
+    build, max_cost = HOT_QUERIES[name]
+    plan = explain(session, build(ids))
+    assert sequential_scans(plan) == []
+    assert plan["Total Cost"] <= max_cost
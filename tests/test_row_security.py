@@ -0,0 +1,84 @@
+import pytest
+from sqlalchemy import select, text
+from sqlalchemy.exc import DBAPIError
+
+from src.crm.models import Client
+from src.data_access.config import metadata
+from src.data_access.row_security import (
+    _SET_CONTEXT,
+    enforce_statements,
+    is_enforced,
+)
+
+ROLE = "epic_events_rls_test"
+
+_UPDATE_CLIENT = text(
+    f"UPDATE {metadata.schema}.client SET full_name = full_name "
+    "WHERE id = :id RETURNING id"
+)
+
+
+@pytest.fixture
+def restricted(database):
+    """
+    A transaction enforcing the policies, under a role that neither is
+    a superuser nor bypasses them. Everything is rolled back.
+    """
+    with database.connect() as connection:
+        transaction = connection.begin()
+        try:
+            if not connection.scalar(text(
+                "SELECT rolsuper OR rolcreaterole FROM pg_roles "
+                "WHERE rolname = current_user"
+            )):
+                pytest.skip("The database user cannot create a test role.")
+            connection.exec_driver_sql(
+                f"CREATE ROLE {ROLE} NOLOGIN NOSUPERUSER NOBYPASSRLS"
+            )
+            connection.exec_driver_sql(
+                f"GRANT USAGE ON SCHEMA {metadata.schema} TO {ROLE}"
+            )
+            connection.exec_driver_sql(
+                f"GRANT SELECT, UPDATE ON ALL TABLES IN SCHEMA "
+                f"{metadata.schema} TO {ROLE}"
+            )
+            for statement in enforce_statements(True):
+                connection.exec_driver_sql(statement)
+            yield connection
+        finally:
+            transaction.rollback()
+
+
+@pytest.mark.integration
+def test_enforcement_needs_a_role_without_bypass(restricted):
+    assert not is_enforced(restricted)
+    restricted.exec_driver_sql(f"SET LOCAL ROLE {ROLE}")
+    assert is_enforced(restricted)
+
+
+@pytest.mark.integration
+def test_commercial_cannot_update_another_commercials_client(restricted):
+    client = restricted.execute(
+        select(Client.id, Client.commercial_id).limit(1)
+    ).first()
+    if client is None:
+        pytest.skip("No client to update.")
+    restricted.exec_driver_sql(f"SET LOCAL ROLE {ROLE}")
+
+    def update_as(commercial_id: int) -> list[int]:
+        restricted.execute(_SET_CONTEXT, {"user_id": str(commercial_id),
+                                          "role": "commercial"})
+        return restricted.execute(_UPDATE_CLIENT,
+                                  {"id": client.id}).scalars().all()
+
+    assert update_as(client.commercial_id + 1) == []
+    assert update_as(client.commercial_id) == [client.id]
+
+    # Nor can the owner hand the client over to another commercial
+    with pytest.raises(DBAPIError) as error, restricted.begin_nested():
+        restricted.execute(
+            text(f"UPDATE {metadata.schema}.client "
+                 "SET commercial_id = :other WHERE id = :id"),
+            {"other": client.commercial_id + 1, "id": client.id},
+        )
+    assert error.value.orig.sqlstate == "42501"
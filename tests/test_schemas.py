@@ -0,0 +1,277 @@
+from datetime import datetime
+
+import pytest
+
+from src.crm.controllers import schemas
+from src.crm.controllers.dates import as_aware
+from src.crm.controllers.schemas import COMPILED_SCHEMAS, free_text
+
+
+@pytest.fixture
+def taken(monkeypatch):
+    """
+    Values the uniqueness probes report as already used, by field,
+    with the keyword arguments find_duplicates() was called with.
+    """
+    state = {"values": {}, "calls": []}
+
+    def find_duplicates(values, **excluded):
+        state["calls"].append(excluded)
+        return {field for field, value in values.items()
+                if value in state["values"].get(field, ())}
+
+    def find_taken_values(values, session=None):
+        return {field: {value for value in field_values
+                        if value in state["values"].get(field, ())}
+                for field, field_values in values.items()}
+
+    monkeypatch.setattr(schemas, "find_duplicates", find_duplicates)
+    monkeypatch.setattr(schemas, "find_taken_values", find_taken_values)
+    return state
+
+
+def validate(entity, data, exclude_id=None):
+    return COMPILED_SCHEMAS[entity].validate(data, exclude_id)
+
+
+def validate_batch(entity, rows):
+    return COMPILED_SCHEMAS[entity].validate_batch(rows)
+
+
+#########################################################
+#                   Converters
+#########################################################
+
+@pytest.mark.parametrize("raw, expected", [
+    ("Jean Dupont", "Jean Dupont"),
+    ("O'Neil", "O''Neil"),
+    ("a/b\\c|d$e\"f`g^h", "abcdefgh"),
+    ("$$", ""),
+    ("", None),
+    (None, None),
+])
+def test_free_text(raw, expected):
+    assert free_text(raw) == expected
+
+
+def test_free_text_doubles_each_quote_once():
+    assert free_text("l'a'b''") == "l''a''b''''"
+
+
+@pytest.mark.parametrize("raw", ["21/12/2025", "21-12-2025", "2025-12-21"])
+def test_date_formats(raw):
+    assert schemas.date(raw) == as_aware(datetime(2025, 12, 21))
+
+
+def test_date_makes_datetimes_aware():
+    assert schemas.date(datetime(2025, 1, 2)).tzinfo is not None
+
+
+#########################################################
+#                   Row validation
+#########################################################
+
+def test_user(taken):
+    data, errors = validate("user", {
+        "username": " JDupont ", "email": "J.Dupont@Example.com",
+        "full_name": "Jean D'Upont", "role_id": "2", "is_active": True,
+    })
+    assert errors == []
+    assert data == {
+        "username": "jdupont", "email": "j.dupont@example.com",
+        "full_name": "Jean D''Upont", "role_id": 2, "is_active": True,
+    }
+
+
+def test_user_invalid_fields_are_all_reported(taken):
+    _, errors = validate("user", {
+        "username": "abc", "email": "not-an-email", "full_name": "",
+        "role_id": "42",
+    })
+    assert errors == [
+        "Invalid or duplicate username", "Invalid or duplicate email",
+        "Invalid full name", "Invalid role ID",
+    ]
+
+
+def test_user_taken_values(taken):
+    taken["values"] = {"username": {"jdupont"}, "email": {"j@example.com"}}
+    _, errors = validate("user", {"username": "jdupont",
+                                  "email": "j@example.com"}, exclude_id=7)
+    assert errors == ["Invalid or duplicate username",
+                      "Invalid or duplicate email"]
+    assert taken["calls"] == [{"exclude_user_id": 7}]
+
+
+def test_client(taken):
+    data, errors = validate("client", {
+        "email": "X@Example.com", "phone": "0612345678",
+        "full_name": "Ana", "first_contact_date": "21/12/2025 10:30",
+        "last_contact_date": None, "company_id": 3,
+    })
+    assert errors == []
+    assert data == {
+        "email": "x@example.com", "phone": "+33612345678",
+        "full_name": "Ana",
+        "first_contact_date": as_aware(datetime(2025, 12, 21, 10, 30)),
+        "last_contact_date": None, "company_id": 3,
+    }
+
+
+@pytest.mark.parametrize("field", ["phone", "last_contact_date"])
+@pytest.mark.parametrize("blank", [None, "", "  "])
+def test_client_nullable_fields_accept_blanks(taken, field, blank):
+    data, errors = validate("client", {field: blank})
+    assert errors == []
+    assert data == {field: None}
+
+
+def test_client_invalid_fields(taken):
+    _, errors = validate("client", {
+        "phone": "12", "first_contact_date": "12/31/2025",
+        "last_contact_date": "yesterday",
+    })
+    assert errors == [
+        "Invalid or duplicate phone number",
+        "Invalid first contact date format",
+        "Invalid last contact date format",
+    ]
+
+
+def test_client_taken_phone(taken):
+    taken["values"] = {"phone": {"+33612345678"}}
+    _, errors = validate("client", {"phone": "0612345678"}, exclude_id=5)
+    assert errors == ["Invalid or duplicate phone number"]
+    assert taken["calls"] == [{"exclude_client_id": 5}]
+
+
+def test_uniqueness_is_not_checked_after_field_errors(taken):
+    _, errors = validate("client", {"email": "a@example.com",
+                                    "full_name": ""})
+    assert errors == ["Invalid full name"]
+    assert taken["calls"] == []
+
+
+def test_absent_fields_are_not_validated():
+    assert validate("event", {"contract_id": 1}) == ({"contract_id": 1}, [])
+
+
+def test_company():
+    assert validate("company", {"name": "O'Hara & Co"}) == (
+        {"name": "O''Hara & Co"}, []
+    )
+    assert validate("company", {"name": "$$"})[1] == ["Invalid company name"]
+
+
+@pytest.mark.parametrize("data, error", [
+    ({"total_amount": "abc"}, "Invalid total amount format"),
+    ({"total_amount": "0"}, "Total amount must be positive"),
+    ({"remaining_amount": "-1"}, "Remaining amount cannot be negative"),
+    ({"remaining_amount": None}, "Invalid remaining amount format"),
+])
+def test_contract_errors(data, error):
+    assert validate("contract", data)[1] == [error]
+
+
+def test_contract():
+    assert validate("contract", {"total_amount": "1500.5",
+                                 "remaining_amount": 0}) == (
+        {"total_amount": 1500.5, "remaining_amount": 0.0}, []
+    )
+
+
+EVENT = {
+    "title": "Gala", "full_address": "1 rue de l'Église",
+    "start_date": "2025-12-21 18:00", "end_date": "21/12/2025 23:30",
+    "participant_count": "80",
+}
+
+
+def test_event():
+    data, errors = validate("event", EVENT)
+    assert errors == []
+    assert data["full_address"] == "1 rue de l''Église"
+    assert data["participant_count"] == 80
+    assert data["end_date"] == as_aware(datetime(2025, 12, 21, 23, 30))
+
+
+def test_event_end_date_rule():
+    _, errors = validate("event", {**EVENT, "end_date": "2025-12-21 17:00"})
+    assert errors == ["End date must be after start date"]
+
+
+def test_event_rules_wait_for_valid_fields():
+    _, errors = validate("event", {**EVENT, "end_date": "21/12/2025 17:00",
+                                   "participant_count": "-1"})
+    assert errors == ["Participant count cannot be negative"]
+
+
+@pytest.mark.parametrize("notes, expected", [
+    ("$$", ""),
+    ("", None),
+    (None, None),
+    ("Badges at 5 o'clock", "Badges at 5 o''clock"),
+])
+def test_event_notes(notes, expected):
+    data, errors = validate("event", {"notes": notes})
+    assert errors == []
+    assert data["notes"] == expected
+
+
+#########################################################
+#                   Batch validation
+#########################################################
+
+def test_batch_matches_row_validation(taken):
+    rows = [
+        {"email": "A@example.com", "phone": "0612345678",
+         "full_name": "A", "first_contact_date": "2025-01-02",
+         "last_contact_date": None},
+        {"email": "bad", "full_name": "", "first_contact_date": "x"},
+    ]
+    results, errors = validate_batch("client", rows)
+    assert [validate("client", row)[0] for row in rows[:1]] == results[:1]
+    assert errors == {2: ["Invalid or duplicate email", "Invalid full name",
+                          "Invalid first contact date format"]}
+
+
+def test_batch_duplicates_within_the_batch(taken):
+    rows = [{"email": "a@example.com"}, {"email": "A@example.com"},
+            {"email": "b@example.com"}, {"email": "a@example.com"}]
+    _, errors = validate_batch("client", rows)
+    assert errors == {
+        2: ["Invalid or duplicate email (see row 1)"],
+        4: ["Invalid or duplicate email (see row 1)"],
+    }
+
+
+def test_batch_taken_values(taken):
+    taken["values"] = {"username": {"taken"}}
+    rows = [{"username": "taken"}, {"username": "fresh1"}]
+    assert validate_batch("user", rows)[1] == {
+        1: ["Invalid or duplicate username"]
+    }
+
+
+def test_batch_invalid_rows_are_left_out_of_uniqueness(taken):
+    rows = [{"email": "a@example.com", "full_name": ""},
+            {"email": "a@example.com", "full_name": "B"}]
+    assert validate_batch("client", rows)[1] == {1: ["Invalid full name"]}
+
+
+def test_batch_rules():
+    rows = [EVENT, {**EVENT, "end_date": "2025-12-21 12:00"}]
+    assert validate_batch("event", rows)[1] == {
+        2: ["End date must be after start date"]
+    }
+
+
+def test_batch_company_and_contract():
+    assert validate_batch("company", [{"name": "A"}, {"name": ""}])[1] == {
+        2: ["Invalid company name"]
+    }
+    assert validate_batch("contract", [
+        {"total_amount": 10, "remaining_amount": 20},
+        {"total_amount": -1, "remaining_amount": "x"},
+    ])[1] == {2: ["Total amount must be positive",
+                  "Invalid remaining amount format"]}
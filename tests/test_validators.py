@@ -0,0 +1,71 @@
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import select
+
+from src.auth.validators import find_batch_duplicates, find_taken_values
+from src.crm.models import Client, Role, User
+from src.data_access.config import Session
+
+
+def test_batch_duplicates():
+    rows = [
+        {"email": "a@example.com", "phone": "+33612345678"},
+        {"email": "b@example.com", "phone": None},
+        {"email": "a@example.com", "phone": ""},
+        {"email": "c@example.com", "phone": "+33612345678"},
+        {"email": "a@example.com"},
+    ]
+    assert find_batch_duplicates(rows, ("email", "phone")) == {
+        "email": {"a@example.com": [1, 3, 5]},
+        "phone": {"+33612345678": [1, 4]},
+    }
+
+
+def test_batch_without_duplicates():
+    rows = [{"username": "alpha"}, {"username": "bravo"}, {}]
+    assert find_batch_duplicates(rows, ("username",)) == {"username": {}}
+
+
+def test_batch_duplicates_default_to_every_unique_field():
+    assert set(find_batch_duplicates([])) == {"username", "email", "phone"}
+
+
+@pytest.mark.integration
+def test_taken_values(database):
+    with Session() as session:
+        try:
+            role_id = session.scalar(select(Role.id).limit(1))
+            if role_id is None:
+                pytest.skip("Roles are missing, run db-create first.")
+            user = User(username="taken_test", full_name="Taken",
+                        email="taken-user@example.invalid",
+                        password_hash="x", role_id=role_id)
+            session.add(user)
+            session.flush()
+            session.add(Client(
+                full_name="Taken", email="taken-client@example.invalid",
+                phone="+33699999999", commercial_id=user.id,
+                first_contact_date=datetime.now(timezone.utc),
+            ))
+            session.flush()
+            assert find_taken_values({
+                "username": ["taken_test", "free_test"],
+                "email": ["taken-user@example.invalid",
+                          "taken-client@example.invalid",
+                          "free-test@example.invalid", None],
+                "phone": ["+33699999999", ""],
+            }, session) == {
+                "username": {"taken_test"},
+                "email": {"taken-user@example.invalid",
+                          "taken-client@example.invalid"},
+                "phone": {"+33699999999"},
+            }
+        finally:
+            session.rollback()
+
+
+def test_taken_values_without_values():
+    assert find_taken_values({"email": [None, ""], "phone": []}) == {
+        "email": set(), "phone": set(),
+    }
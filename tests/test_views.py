@@ -0,0 +1,34 @@
+import pytest
+
+from src.auth import decorators
+from src.cli import utils
+from src.crm.views import views
+from src.crm.views.views import MainView
+
+
+@pytest.fixture
+def shared_view(monkeypatch):
+    """The shared view, its output modes restored after the test."""
+    monkeypatch.setattr(MainView, "records", None)
+    monkeypatch.setattr(MainView, "plain", MainView.plain)
+    return views.view
+
+
+def test_records_mode_reaches_every_view(shared_view, capsys):
+    shared_view.use_records("json")
+    assert utils.view is not shared_view
+    assert utils.view.records is shared_view.records
+    assert decorators.view.plain
+
+    utils.show_error("boom", "Export")
+    captured = capsys.readouterr()
+    assert captured.out == ""
+    assert captured.err == "Export: boom\n"
+
+
+def test_plain_mode_reaches_every_view(shared_view, monkeypatch):
+    monkeypatch.setattr(MainView, "plain", False)
+    shared_view.use_plain()
+    assert MainView().plain
+    assert utils.view.plain
+    assert decorators.view.plain